@@ -0,0 +1,57 @@
+# backtest/history.py
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from signals.parser.channel_profile import PARSERS
+from signals.parser.models import Signal
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class HistoricalSignal:
+    """Сигнал из истории канала с временем публикации"""
+
+    message_id: int
+    timestamp_ms: int
+    signal: Signal
+
+    @property
+    def symbol(self) -> str:
+        return self.signal.ticker.replace("/", "")
+
+
+def _message_text(text: str | list) -> str:
+    """Текст сообщения экспорта: строка или список фрагментов с разметкой"""
+    if isinstance(text, str):
+        return text
+    return "".join(part if isinstance(part, str) else part.get("text", "") for part in text)
+
+
+def _message_timestamp_ms(message: dict) -> int:
+    if "date_unixtime" in message:
+        return int(message["date_unixtime"]) * 1000
+    return int(datetime.fromisoformat(message["date"]).timestamp() * 1000)
+
+
+def load_channel_export(path: str, parser: str = "pulse") -> list[HistoricalSignal]:
+    """Сигналы из JSON-экспорта истории канала (Telegram Desktop), по возрастанию времени"""
+    with open(path, encoding="utf-8") as f:
+        export = json.load(f)
+
+    parse = PARSERS[parser]
+    messages = export.get("messages", []) if isinstance(export, dict) else export
+    signals = []
+
+    for message in messages:
+        if message.get("type", "message") != "message":
+            continue
+
+        signal = parse(_message_text(message.get("text", "")))
+        if signal:
+            signals.append(HistoricalSignal(int(message["id"]), _message_timestamp_ms(message), signal))
+
+    signals.sort(key=lambda item: (item.timestamp_ms, item.message_id))
+    logger.info(f"Сигналов в истории {path}: {len(signals)} из {len(messages)} сообщений")
+    return signals
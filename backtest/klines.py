@@ -0,0 +1,43 @@
+# backtest/klines.py
+import os
+import numpy as np
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+START, OPEN, HIGH, LOW, CLOSE = range(5)
+
+
+class KlineStore:
+    """Локальные свечи по символам: <directory>/<SYMBOL>.csv или .npy.
+
+    CSV в порядке колонок Bybit /v5/market/kline: startTime, open, high, low, close[, ...],
+    строка заголовка допускается. Свечи сортируются по времени начала.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._cache: dict[str, np.ndarray | None] = {}
+
+    def get(self, symbol: str) -> np.ndarray | None:
+        """Массив [N, 5] (start_ms, open, high, low, close) или None, если файла нет"""
+        if symbol not in self._cache:
+            self._cache[symbol] = self._load(symbol)
+        return self._cache[symbol]
+
+    def _load(self, symbol: str) -> np.ndarray | None:
+        npy_path = os.path.join(self.directory, f"{symbol}.npy")
+        csv_path = os.path.join(self.directory, f"{symbol}.csv")
+
+        if os.path.isfile(npy_path):
+            klines = np.load(npy_path)
+        elif os.path.isfile(csv_path):
+            with open(csv_path, encoding="utf-8") as f:
+                has_header = not f.readline()[:1].isdigit()
+            klines = np.loadtxt(csv_path, delimiter=",", skiprows=int(has_header), usecols=range(5), ndmin=2)
+        else:
+            logger.warning(f"Нет свечей для {symbol} в {self.directory}")
+            return None
+
+        klines = klines[np.argsort(klines[:, START], kind="stable")]
+        return np.ascontiguousarray(klines[:, :5], dtype=np.float64)
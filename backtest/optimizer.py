@@ -0,0 +1,55 @@
+# backtest/optimizer.py
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from backtest.simulator import LEVELS, CostModel, ExitModel, SignalPaths, exit_model, simulate
+
+_paths: SignalPaths | None = None
+_costs: CostModel | None = None
+_models: dict[int, ExitModel] = {}
+
+
+def tp_splits(step: int = 10, levels: int = LEVELS, total: int = 100, descending: bool = False) -> np.ndarray:
+    """Все разбиения total на levels долей с шагом step; descending — только невозрастающие лестницы"""
+    units = total // step
+    splits = []
+
+    for bars in itertools.combinations(range(units + levels - 1), levels - 1):
+        bounds = (-1, *bars, units + levels - 1)
+        split = [(bounds[i + 1] - bounds[i] - 1) * step for i in range(levels)]
+        if not descending or all(a >= b for a, b in zip(split, split[1:])):
+            splits.append(split)
+
+    return np.array(splits, dtype=np.float64)
+
+
+def _init_worker(paths: SignalPaths, costs: CostModel) -> None:
+    global _paths, _costs
+    _paths, _costs = paths, costs
+    _models.clear()
+
+
+def _run_chunk(max_leverage: int, splits: np.ndarray) -> tuple[int, np.ndarray, dict[str, np.ndarray]]:
+    model = _models.get(max_leverage)
+    if model is None:
+        model = _models[max_leverage] = exit_model(_paths, max_leverage, _costs)
+    return max_leverage, splits, simulate(model, splits, _costs)
+
+
+def optimize(paths: SignalPaths, splits: np.ndarray, caps: list[int], costs: CostModel,
+             workers: int | None = None, chunk_size: int = 512) -> list[dict]:
+    """Сетка (лестница TP × ограничение плеча) в пуле процессов; строки по убыванию PnL"""
+    tasks = [(cap, splits[i:i + chunk_size]) for cap in caps for i in range(0, len(splits), chunk_size)]
+    rows = []
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                             initargs=(paths, costs)) as pool:
+        for cap, chunk, metrics in pool.map(_run_chunk, *zip(*tasks)):
+            for index, split in enumerate(chunk):
+                row = {"tp": "/".join(f"{value:g}" for value in split), "max_leverage": cap}
+                row.update({name: float(values[index]) for name, values in metrics.items()})
+                rows.append(row)
+
+    rows.sort(key=lambda row: row["total_pnl"], reverse=True)
+    return rows
@@ -0,0 +1,81 @@
+# backtest/run.py
+import argparse
+import csv
+import logging
+import os
+import sys
+import time
+import numpy as np
+from backtest.history import load_channel_export
+from backtest.klines import KlineStore
+from backtest.optimizer import optimize, tp_splits
+from backtest.simulator import LEVELS, CostModel, build_paths
+
+COLUMNS = ["tp", "max_leverage", "total_pnl", "return_pct", "max_drawdown", "max_drawdown_pct", "win_rate",
+           "profit_factor", "sl_rate", "liquidation_rate"] + [f"tp{level}_hit" for level in range(1, LEVELS + 1)]
+
+
+def env_split() -> list[float] | None:
+    """Текущая лестница TP1..TP8 из окружения, если задана полностью"""
+    values = [os.getenv(f"TP{level}") for level in range(1, LEVELS + 1)]
+    return [float(value) for value in values] if all(values) else None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Бэктест лестницы TP и ограничения плеча по истории канала")
+    parser.add_argument("--history", required=True, help="JSON-экспорт истории канала")
+    parser.add_argument("--klines", required=True, help="Каталог свечей <SYMBOL>.csv|.npy")
+    parser.add_argument("--parser", default="pulse")
+    parser.add_argument("--horizon", type=int, default=1440, help="Горизонт удержания в свечах")
+    parser.add_argument("--step", type=int, default=10, help="Шаг долей TP в процентах")
+    parser.add_argument("--descending", action="store_true", help="Только невозрастающие лестницы")
+    parser.add_argument("--caps", default="0", help="Ограничения плеча через запятую, 0 — плечо сигнала")
+    parser.add_argument("--balance", type=float, default=float(os.getenv("BALANCE", "1000")))
+    parser.add_argument("--amount", type=float, default=float(os.getenv("AMOUNT", "10")))
+    parser.add_argument("--taker-fee", type=float, default=0.00055)
+    parser.add_argument("--maker-fee", type=float, default=0.0002)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--output", help="Сохранить все конфигурации в CSV")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    signals = load_channel_export(args.history, args.parser)
+    paths = build_paths(signals, KlineStore(args.klines), args.horizon)
+
+    splits = tp_splits(args.step, descending=args.descending)
+    baseline = env_split()
+    if baseline:
+        splits = np.unique(np.vstack([splits, baseline]), axis=0)
+
+    caps = [int(cap) for cap in args.caps.split(",")]
+    costs = CostModel(args.balance, args.amount, args.taker_fee, args.maker_fee)
+    rows = optimize(paths, splits, caps, costs, args.workers)
+    elapsed = time.perf_counter() - started
+
+    print(f"Сигналов: {len(paths)}, конфигураций: {len(rows)}, время: {elapsed:.1f} с")
+    print(" ".join(f"{column:>14s}" for column in COLUMNS[:10]))
+    for row in rows[:args.top]:
+        print(" ".join(f"{row[column]:>14.4g}" if isinstance(row[column], float) else f"{row[column]!s:>14s}"
+                       for column in COLUMNS[:10]))
+
+    if baseline:
+        current = "/".join(f"{value:g}" for value in baseline)
+        for rank, row in enumerate(rows, start=1):
+            if row["tp"] == current:
+                print(f"Текущая лестница {current} (плечо {row['max_leverage']}): место {rank}, "
+                      f"PnL {row['total_pnl']:.2f}, просадка {row['max_drawdown_pct']:.1f}%")
+                break
+
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    return 0
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,203 @@
+# backtest/simulator.py
+from dataclasses import dataclass
+import numpy as np
+from backtest.history import HistoricalSignal
+from backtest.klines import CLOSE, HIGH, LOW, OPEN, START, KlineStore
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+LEVELS = 8
+
+
+@dataclass(frozen=True)
+class CostModel:
+    """Размер позиции и комиссии симуляции"""
+
+    balance: float
+    amount: float
+    taker_fee: float = 0.00055
+    maker_fee: float = 0.0002
+    maintenance_margin: float = 0.005
+
+    @property
+    def margin(self) -> float:
+        return self.balance * self.amount / 100
+
+
+@dataclass
+class SignalPaths:
+    """Не зависящие от параметров исходы сигналов на горизонте свечей.
+
+    Бар срабатывания равен horizon, если уровень не достигнут. Доходности — доли цены входа
+    в сторону позиции.
+    """
+
+    leverage: np.ndarray
+    tp_bar: np.ndarray
+    tp_return: np.ndarray
+    sl_bar: np.ndarray
+    sl_return: np.ndarray
+    end_return: np.ndarray
+    adverse: np.ndarray
+    horizon: int
+
+    def __len__(self) -> int:
+        return len(self.leverage)
+
+
+def _first_true(mask: np.ndarray, horizon: int) -> np.ndarray:
+    """Индекс первого True по последней оси или horizon"""
+    return np.where(mask.any(axis=-1), mask.argmax(axis=-1), horizon)
+
+
+def build_paths(signals: list[HistoricalSignal], klines: KlineStore, horizon: int = 1440) -> SignalPaths:
+    """Вход по открытию первой свечи после сообщения и поиск касаний TP/SL на horizon свечей"""
+    rows: list[dict[str, np.ndarray]] = []
+    by_symbol: dict[str, list[HistoricalSignal]] = {}
+    for item in signals:
+        by_symbol.setdefault(item.symbol, []).append(item)
+
+    for symbol, items in by_symbol.items():
+        candles = klines.get(symbol)
+        if candles is None:
+            continue
+        rows.append(_symbol_paths(items, candles, horizon))
+
+    total = sum(len(row["leverage"]) for row in rows)
+    if len(signals) != total:
+        logger.warning(f"Пропущено сигналов без свечей или с неверным SL: {len(signals) - total}")
+
+    if not rows:
+        raise ValueError("Нет сигналов со свечами для симуляции")
+
+    merged = {key: np.concatenate([row[key] for row in rows]) for key in rows[0]}
+    order = np.argsort(merged.pop("timestamp_ms"), kind="stable")
+    return SignalPaths(horizon=horizon, **{key: value[order] for key, value in merged.items()})
+
+
+def _symbol_paths(items: list[HistoricalSignal], candles: np.ndarray, horizon: int) -> dict[str, np.ndarray]:
+    timestamps = np.array([item.timestamp_ms for item in items], dtype=np.int64)
+    direction = np.array([1.0 if item.signal.direction == "Long" else -1.0 for item in items])
+    stop_loss = np.array([item.signal.stop_loss for item in items])
+    take_profits = np.full((len(items), LEVELS), np.nan)
+    for row, item in enumerate(items):
+        levels = item.signal.take_profits[:LEVELS]
+        take_profits[row, :len(levels)] = levels
+
+    start = np.searchsorted(candles[:, START], timestamps, side="right")
+    entry = candles[np.minimum(start, len(candles) - 1), OPEN]
+    # SL по другую сторону от входа биржа не примет, такой сигнал не исполнился бы
+    valid = (start < len(candles)) & (direction * (entry - stop_loss) > 0)
+
+    start, entry, direction = start[valid], entry[valid], direction[valid]
+    stop_loss, take_profits, timestamps = stop_loss[valid], take_profits[valid], timestamps[valid]
+    leverage = np.array([item.signal.leverage for item, ok in zip(items, valid) if ok], dtype=np.float64)
+
+    window = np.minimum(start[:, None] + np.arange(horizon), len(candles) - 1)
+    opens, highs, lows = candles[window, OPEN], candles[window, HIGH], candles[window, LOW]
+    is_long = direction[:, None] > 0
+    favorable = np.where(is_long, highs, lows)
+    unfavorable = np.where(is_long, lows, highs)
+    del highs, lows
+
+    sl_bar = _first_true(direction[:, None] * (unfavorable - stop_loss[:, None]) <= 0, horizon)
+    # Рыночный SL при гэпе за уровень исполняется по открытию свечи
+    sl_open = np.take_along_axis(opens, np.minimum(sl_bar, horizon - 1)[:, None], axis=1)[:, 0]
+    sl_fill = np.where(direction * (sl_open - stop_loss) < 0, sl_open, stop_loss)
+    sl_return = direction * (sl_fill - entry) / entry
+
+    tp_bar = np.full((len(entry), LEVELS), horizon)
+    for level in range(LEVELS):
+        price = take_profits[:, level]
+        hit = direction[:, None] * (favorable - price[:, None]) >= 0
+        tp_bar[:, level] = np.where(np.isnan(price), horizon, _first_true(hit, horizon))
+
+    # Лимитный TP хуже цены входа исполняется сразу по рынку
+    tp_return = np.nan_to_num(np.maximum(direction[:, None] * (take_profits - entry[:, None]) / entry[:, None], 0))
+    end_return = direction * (candles[window[:, -1], CLOSE] - entry) / entry
+    adverse = np.maximum.accumulate(
+        (direction[:, None] * (entry[:, None] - unfavorable) / entry[:, None]).astype(np.float32), axis=1
+    )
+
+    return {
+        "timestamp_ms": timestamps,
+        "leverage": leverage,
+        "tp_bar": tp_bar,
+        "tp_return": tp_return,
+        "sl_bar": sl_bar,
+        "sl_return": sl_return,
+        "end_return": end_return,
+        "adverse": adverse,
+    }
+
+
+@dataclass
+class ExitModel:
+    """Исходы сигналов при заданном ограничении плеча"""
+
+    leverage: np.ndarray
+    level_return: np.ndarray
+    rest_return: np.ndarray
+    tp_hit_rate: np.ndarray
+    sl_rate: float
+    liquidation_rate: float
+
+
+def exit_model(paths: SignalPaths, max_leverage: int, costs: CostModel) -> ExitModel:
+    """Выход остатка по SL, ликвидации или концу горизонта; доходности уровней за вычетом комиссий"""
+    horizon = paths.horizon
+    leverage = np.minimum(paths.leverage, max_leverage) if max_leverage else paths.leverage
+    liquidation = 1 / leverage - costs.maintenance_margin
+
+    liq_bar = _first_true(paths.adverse >= liquidation[:, None], horizon)
+    # В одной свече с SL ликвидация первой, только если её цена ближе стопа
+    liquidated = (liq_bar < paths.sl_bar) | (
+        (liq_bar == paths.sl_bar) & (liq_bar < horizon) & (liquidation < -paths.sl_return)
+    )
+    stopped = ~liquidated & (paths.sl_bar < horizon)
+
+    exit_bar = np.where(liquidated, liq_bar, paths.sl_bar)
+    exit_return = np.where(liquidated, -liquidation, np.where(stopped, paths.sl_return, paths.end_return))
+    exit_return = exit_return - costs.taker_fee
+
+    # TP в одной свече со стопом считается неисполненным: порядок внутри свечи неизвестен
+    filled = paths.tp_bar < exit_bar[:, None]
+    level_return = np.where(filled, paths.tp_return - costs.maker_fee, exit_return[:, None])
+
+    return ExitModel(
+        leverage=leverage,
+        level_return=level_return,
+        rest_return=exit_return,
+        tp_hit_rate=filled.mean(axis=0),
+        sl_rate=float(stopped.mean()),
+        liquidation_rate=float(liquidated.mean())
+    )
+
+
+def simulate(model: ExitModel, splits: np.ndarray, costs: CostModel) -> dict[str, np.ndarray]:
+    """Метрики для набора лестниц TP splits [P, 8] в процентах от объёма"""
+    weights = splits / 100
+    rest = 1 - weights.sum(axis=1)
+
+    # [S, P]: доходность позиции на единицу номинала для каждой лестницы
+    returns = model.level_return @ weights.T + model.rest_return[:, None] * rest[None, :] - costs.taker_fee
+    pnl = returns * (costs.margin * model.leverage)[:, None]
+
+    equity = costs.balance + np.cumsum(pnl, axis=0)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=0), costs.balance)
+    drawdown = peak - equity
+    gains = np.where(pnl > 0, pnl, 0).sum(axis=0)
+    losses = -np.where(pnl < 0, pnl, 0).sum(axis=0)
+
+    return {
+        "total_pnl": pnl.sum(axis=0),
+        "return_pct": pnl.sum(axis=0) / costs.balance * 100,
+        "max_drawdown": drawdown.max(axis=0),
+        "max_drawdown_pct": (drawdown / peak).max(axis=0) * 100,
+        "win_rate": (pnl > 0).mean(axis=0),
+        "profit_factor": np.divide(gains, losses, out=np.full_like(gains, np.inf), where=losses > 0),
+        "sl_rate": np.full(len(splits), model.sl_rate),
+        "liquidation_rate": np.full(len(splits), model.liquidation_rate),
+        **{f"tp{level + 1}_hit": np.full(len(splits), model.tp_hit_rate[level]) for level in range(LEVELS)},
+    }
@@ -0,0 +1,99 @@
+# benchmarks/backtest.py
+import benchmarks.env  # noqa: F401
+import json
+import os
+import tempfile
+import time
+import numpy as np
+from backtest.history import load_channel_export
+from backtest.klines import KlineStore
+from backtest.optimizer import optimize, tp_splits
+from backtest.simulator import CostModel, build_paths
+from benchmarks.corpus import BASES, SIGNAL_TEMPLATE
+
+MINUTE_MS = 60_000
+
+
+def synthetic_klines(rng: np.random.Generator, minutes: int, start_ms: int) -> np.ndarray:
+    """Минутные свечи случайного блуждания около 100"""
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.0015, minutes)))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.001, (2, minutes))) * close
+    return np.column_stack([
+        start_ms + np.arange(minutes) * MINUTE_MS,
+        open_,
+        np.maximum(open_, close) + spread[0],
+        np.minimum(open_, close) - spread[1],
+        close
+    ])
+
+
+def synthetic_history(directory: str, signals: int, days: int, seed: int) -> str:
+    """Свечи по всем BASES и экспорт канала с сигналами от текущей цены"""
+    rng = np.random.default_rng(seed)
+    minutes = days * 1440
+    start_ms = 1_700_000_000_000
+    messages = []
+
+    for base in BASES:
+        np.save(os.path.join(directory, f"{base}USDT.npy"), synthetic_klines(rng, minutes, start_ms))
+
+    store = KlineStore(directory)
+    for message_id in range(1, signals + 1):
+        base = BASES[rng.integers(len(BASES))]
+        bar = int(rng.integers(0, minutes - 1440))
+        price = store.get(f"{base}USDT")[bar, 4]
+        direction = "Long" if rng.random() < 0.5 else "Short"
+        sign = 1 if direction == "Long" else -1
+        step = price * rng.uniform(0.002, 0.006)
+
+        text = SIGNAL_TEMPLATE.format(
+            base=base,
+            marker="🟩" if direction == "Long" else "🟥",
+            direction=direction,
+            leverage=int(rng.choice([10, 20, 25, 50])),
+            entry=f"{price:.4f}",
+            entry2=f"{price - sign * step:.4f}",
+            take_profits="\n".join(f"{i}) {price + sign * step * i:.4f}" for i in range(1, 9)),
+            stop_loss=f"{price * (1 - sign * rng.uniform(0.01, 0.03)):.4f}"
+        )
+        messages.append({"id": message_id, "type": "message", "date_unixtime": str((start_ms // 1000) + bar * 60),
+                         "text": text})
+
+    path = os.path.join(directory, "export.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"messages": messages}, f, ensure_ascii=False)
+    return path
+
+
+def run(signals: int = 2000, days: int = 30, step: int = 10, caps: tuple[int, ...] = (0, 10, 25),
+        seed: int = 5) -> dict[str, float]:
+    """Время полного прогона: разбор истории, исходы сигналов и сетка лестниц TP × плечо"""
+    with tempfile.TemporaryDirectory() as directory:
+        export = synthetic_history(directory, signals, days, seed)
+
+        started = time.perf_counter()
+        history = load_channel_export(export)
+        parsed = time.perf_counter()
+        paths = build_paths(history, KlineStore(directory))
+        built = time.perf_counter()
+
+        splits = tp_splits(step)
+        rows = optimize(paths, splits, list(caps), CostModel(balance=1000, amount=10))
+        finished = time.perf_counter()
+
+    return {
+        "signals": len(paths),
+        "configs": len(rows),
+        "parse_s": parsed - started,
+        "paths_s": built - parsed,
+        "grid_s": finished - built,
+        "configs_per_s": len(rows) / (finished - built),
+        "signal_configs_per_s": len(rows) * len(paths) / (finished - built),
+        "best_tp": rows[0]["tp"],
+        "best_pnl": rows[0]["total_pnl"],
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,108 @@
+# benchmarks/corpus.py
+import random
+
+SIGNAL_TEMPLATE = """⚡️⚡️ #{base}/USDT ⚡️⚡️
+{marker} {base}/USDT ({direction})
+Signal Type: Regular ({direction})
+Leverage: Cross ({leverage}X)
+
+Entry Targets:
+1) {entry}
+2) {entry2}
+
+Take-Profit Targets:
+{take_profits}
+
+Stop Targets:
+{stop_loss}
+
+Published By: @pulse_signals"""
+
+SAMPLE_SIGNALS = [
+    """⚡️⚡️ #BTC/USDT ⚡️⚡️
+🟩 BTC/USDT (Long)
+Signal Type: Regular (Long)
+Leverage: Cross (20X)
+
+Entry Targets:
+1) 64250.5
+
+Take-Profit Targets:
+1) 64571.7
+2) 64893.0
+3) 65214.2
+4) 65535.5
+5) 65856.7
+6) 66178.0
+7) 66499.2
+8) 66820.5
+
+Stop Targets:
+62965.4""",
+    """⚡️⚡️ #1000PEPE/USDT ⚡️⚡️
+🟥 1000PEPE/USDT (Short)
+Signal Type: Regular (Short)
+Leverage: Cross (50X)
+
+Entry Targets:
+1) 0.012345
+
+Take-Profit Targets:
+1) 0.012283
+2) 0.012221
+3) 0.012160
+4) 0.012098
+
+Stop Targets:
+0.012592""",
+]
+
+NOISE_MESSAGES = [
+    "BTC/USDT Take-Profit target 1 ✅\nProfit: 25.0% 📈\nPeriod: 12 Minutes ⏰",
+    "Всем привет! Рынок сегодня спокойный, ждём сигналов.",
+    "ETH/USDT (Long) Entry Targets: all entry targets achieved",
+    "⚡️ Stop Targets: hit for SOL/USDT, loss -40%",
+    "Take-Profit Targets: 1) 2) 3) — без значений",
+    "",
+]
+
+BASES = ["BTC", "ETH", "SOL", "XRP", "DOGE", "ADA", "AVAX", "LINK", "1000PEPE", "SUI", "OP", "ARB", "WLD", "TIA"]
+
+
+def synthetic_signal(rng: random.Random) -> str:
+    """Случайный сигнал в формате канала"""
+    base = rng.choice(BASES)
+    direction = rng.choice(["Long", "Short"])
+    entry = round(rng.uniform(0.001, 70000), rng.choice([1, 3, 6]))
+    step = entry * rng.uniform(0.002, 0.01)
+    sign = 1 if direction == "Long" else -1
+    tp_count = rng.randint(1, 8)
+
+    take_profits = "\n".join(
+        f"{i}) {round(entry + sign * step * i, 6)}" for i in range(1, tp_count + 1)
+    )
+
+    return SIGNAL_TEMPLATE.format(
+        base=base,
+        marker="🟩" if direction == "Long" else "🟥",
+        direction=direction,
+        leverage=rng.choice([5, 10, 20, 25, 50, 75]),
+        entry=entry,
+        entry2=round(entry - sign * step, 6),
+        take_profits=take_profits,
+        stop_loss=round(entry - sign * step * 3, 6)
+    )
+
+
+def build_corpus(size: int = 1000, signal_share: float = 0.3, seed: int = 42) -> list[str]:
+    """Смесь образцов, синтетических сигналов и шума"""
+    rng = random.Random(seed)
+    corpus = list(SAMPLE_SIGNALS) + list(NOISE_MESSAGES)
+
+    while len(corpus) < size:
+        if rng.random() < signal_share:
+            corpus.append(synthetic_signal(rng))
+        else:
+            corpus.append(rng.choice(NOISE_MESSAGES) + f"\n#{rng.randint(0, 10 ** 6)}")
+
+    return corpus[:size]
@@ -0,0 +1,99 @@
+# benchmarks/differential.py
+import benchmarks.env  # noqa: F401
+import logging
+import random
+import sys
+from types import SimpleNamespace
+from benchmarks.corpus import build_corpus
+from signals.parser.message_filter import MessageFilter
+from signals.parser.signal_parser import SignalParser
+from signals.parser.signal_scanner import SignalScanner
+from trading.bybit_api import BybitAPI
+from trading.sizing import SizingScale
+
+
+def reference(text: str):
+    """Эталон: MessageFilter + SignalParser"""
+    if not MessageFilter.is_signal_message(SimpleNamespace(text=text)):
+        return None
+    return SignalParser.parse(text)
+
+
+def comparable(signal) -> tuple | None:
+    if signal is None:
+        return None
+    return signal.ticker, signal.direction, signal.leverage, signal.take_profits, signal.stop_loss, signal.raw_message
+
+
+def mutate(text: str, rng: random.Random) -> str:
+    """Порча сообщения для проверки граничных случаев"""
+    operations = [
+        lambda t: t.replace("Leverage:", "Lev:", 1),
+        lambda t: t.replace("X)", ")", 1),
+        lambda t: t.replace("Stop Targets:\n", "Stop Targets:\n1) ", 1),
+        lambda t: t.replace("(Long)", "(long)").replace("(Short)", "(short)"),
+        lambda t: t.replace("🟩", "").replace("🟥", ""),
+        lambda t: t.replace("1) ", "1)", 1),
+        lambda t: t.replace(".", "..", 1),
+        lambda t: t + "\nStop Targets: 42.5\nLeverage: Isolated (3X)",
+        lambda t: "Leverage: BTC/USDT (Long) (7X)\n" + t,
+        lambda t: t.replace("Take-Profit Targets:\n", "Take-Profit Targets:\nsoon\n", 1),
+        lambda t: t.replace("/USDT", "/USDC"),
+        lambda t: t[:rng.randint(0, len(t))],
+        lambda t: t.replace("(50X)", "(0X)").replace("(20X)", "(0X)"),
+    ]
+    for _ in range(rng.randint(1, 3)):
+        text = rng.choice(operations)(text)
+    return text
+
+
+def check(size: int = 5000, seed: int = 1) -> list[str]:
+    """Тексты, на которых SignalScanner расходится с эталоном"""
+    rng = random.Random(seed)
+    corpus = build_corpus(size, signal_share=0.5, seed=seed)
+    corpus += [mutate(text, rng) for text in corpus]
+
+    return [text for text in corpus if comparable(reference(text)) != comparable(SignalScanner.scan(text))]
+
+
+def check_sizing(size: int = 20000, seed: int = 1) -> list[tuple[float, str]]:
+    """Значения, на которых целочисленное округление расходится с Decimal-путём BybitAPI.
+
+    Значения вида 0.06845899999999999 (артефакт float у границы шага) Decimal
+    округляет на шаг вниз, а SizingScale намеренно относит к границе: такие
+    случаи расхождением не считаются.
+    """
+    rng = random.Random(seed)
+    steps = ["0.001", "0.01", "0.1", "1", "10", "0.5", "5", "0.0001", "0.000001", "0.00005"]
+    mismatches = []
+
+    for _ in range(size):
+        step = rng.choice(steps)
+        scale = SizingScale.from_filters(step, step, step)
+        value = round(rng.uniform(0, 100000), rng.randint(0, 8)) * rng.choice([1, 0.001, 0.000001])
+
+        results = (
+            (float(scale.format_qty(scale.qty_steps(value))), BybitAPI.round_quantity(value, step)),
+            (float(scale.format_price(scale.price_ticks(value))), BybitAPI.round_price(value, step)),
+        )
+        for fixed_point, reference_value in results:
+            on_boundary = abs(value - fixed_point) <= value * 1e-12
+            if fixed_point != reference_value and not on_boundary:
+                mismatches.append((value, step))
+
+    return mismatches
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    mismatches = check()
+    for text in mismatches[:5]:
+        print("---\n" + text)
+    print(f"Расхождений разбора: {len(mismatches)}")
+
+    sizing_mismatches = check_sizing()
+    for value, step in sizing_mismatches[:5]:
+        print(f"--- {value} / {step}")
+    print(f"Расхождений округления: {len(sizing_mismatches)}")
+
+    sys.exit(1 if mismatches or sizing_mismatches else 0)
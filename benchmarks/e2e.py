@@ -0,0 +1,96 @@
+# benchmarks/e2e.py
+import benchmarks.env  # noqa: F401
+import asyncio
+import random
+import time
+from benchmarks.corpus import BASES, synthetic_signal
+from benchmarks.fakes import FakeTelegramClient, StubBybitServer
+from signals.parser.channel_listener import ChannelListener
+
+
+def summarize(latencies_ms: list[float]) -> dict[str, float]:
+    """Перцентили задержек в миллисекундах"""
+    if not latencies_ms:
+        return {}
+
+    ordered = sorted(latencies_ms)
+
+    def percentile(quantile: float) -> float:
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+    return {
+        "mean_ms": sum(ordered) / len(ordered),
+        "p50_ms": percentile(0.5),
+        "p90_ms": percentile(0.9),
+        "p99_ms": percentile(0.99),
+        "max_ms": ordered[-1],
+    }
+
+
+async def wait_for(condition, timeout: float) -> bool:
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        await asyncio.sleep(0.001)
+    return True
+
+
+async def run_mode(mode: str, signals: int = 10, latency_ms: float = 5.0, jitter_ms: float = 0.0,
+                   polling_interval: float = 2.0, seed: int = 7) -> dict[str, float]:
+    """Задержка от публикации сообщения до получения рыночного ордера заглушкой"""
+    rng = random.Random(seed)
+    stub = StubBybitServer(latency_ms, jitter_ms, symbols=[f"{base}USDT" for base in BASES]).start()
+    client = FakeTelegramClient()
+
+    listener = ChannelListener(
+        client=client,
+        channel_name=client.channel_name,
+        polling_interval=polling_interval,
+        push_updates=mode == "push",
+        gap_fill_interval=30
+    )
+    listener.trade_engine.api.client.endpoint = stub.url
+
+    listen_task = asyncio.create_task(listener.start())
+    latencies: list[float] = []
+    order_latencies: list[float] = []
+
+    try:
+        await wait_for(lambda: listener.is_running, timeout=10)
+
+        for _ in range(signals):
+            await asyncio.sleep(rng.uniform(0, polling_interval))
+
+            orders_before = len(stub.orders)
+            message = await client.publish(synthetic_signal(rng))
+            published_at = client.published_at[message.id]
+
+            if not await wait_for(lambda: len(stub.orders) > orders_before, timeout=polling_interval + 10):
+                continue
+
+            order_received_at = stub.orders[-1][0]
+            latencies.append((order_received_at - published_at) * 1000)
+            await wait_for(lambda: len(stub.batches) >= len(stub.orders), timeout=5)
+            order_latencies.append((time.perf_counter() - published_at) * 1000)
+
+    finally:
+        await listener.stop()
+        listen_task.cancel()
+        stub.stop()
+
+    result = summarize(latencies)
+    result["to_tp_ack_p50_ms"] = summarize(order_latencies).get("p50_ms", 0.0)
+    result["signals"] = len(latencies)
+    result["history_calls"] = client.history_calls
+    result["history_bytes"] = client.history_bytes
+    return result
+
+
+def run(signals: int = 10, latency_ms: float = 5.0, jitter_ms: float = 0.0,
+        polling_interval: float = 2.0) -> dict[str, dict[str, float]]:
+    """Сквозной бенчмарк в режимах push и polling"""
+    return {
+        mode: asyncio.run(run_mode(mode, signals, latency_ms, jitter_ms, polling_interval))
+        for mode in ("push", "polling")
+    }
@@ -0,0 +1,28 @@
+# benchmarks/env.py
+import os
+
+# Фиктивные параметры: бенчмарки никогда не должны ходить на реальную биржу или в Telegram
+BENCH_ENV = {
+    "API_ID": "1",
+    "API_HASH": "bench",
+    "PHONE_NUMBER": "+10000000000",
+    "SESSION_NAME": "bench",
+    "DEVICE_MODEL": "bench",
+    "SYSTEM_VERSION": "bench",
+    "APP_VERSION": "bench",
+    "LANG_CODE": "en",
+    "CHANNEL_NAME": "bench_channel",
+    "METRICS_PORT": "0",
+    "BYBIT_API_KEY": "bench-key",
+    "BYBIT_API_SECRET": "bench-secret",
+    "AMOUNT": "10",
+    "BALANCE": "1000",
+    "TP1": "20", "TP2": "20", "TP3": "15", "TP4": "15",
+    "TP5": "10", "TP6": "10", "TP7": "5", "TP8": "5",
+    "PRICE_STREAM": "false",
+    "FILL_DRIVEN_TP": "false",
+    "POSITION_STREAM": "false",
+    "ORDER_TRANSPORT": "rest",
+}
+
+os.environ.update(BENCH_ENV)
@@ -0,0 +1,510 @@
+# benchmarks/fakes.py
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import socket
+import socketserver
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+from pyrogram import raw
+
+
+class FakeTelegramClient:
+    """Минимальная замена pyrogram.Client для ChannelListener.
+
+    История отдаётся как настоящие TL-объекты messages.ChannelMessages, поэтому
+    разбор идёт через pyrogram, а history_bytes — размер ответов в формате TL.
+    """
+
+    CHANNEL_ID = 123
+    PAGE_LIMIT = 100
+
+    def __init__(self, channel_name: str = "bench_channel"):
+        self.channel_name = channel_name
+        self.messages: list[SimpleNamespace] = []
+        self.published_at: dict[int, float] = {}
+        self.history_calls = 0
+        self.history_bytes = 0
+        self.message_cache: dict = {}
+        self.parse_mode = None
+        self.me = None
+        self._handlers: list[Any] = []
+        self._next_id = 1
+
+    async def get_chat(self, channel_name: str) -> SimpleNamespace:
+        return SimpleNamespace(id=-100123, title=channel_name)
+
+    async def resolve_peer(self, chat_id: int | str) -> raw.types.InputPeerChannel:
+        return raw.types.InputPeerChannel(channel_id=self.CHANNEL_ID, access_hash=0)
+
+    async def invoke(self, query: Any, **kwargs: Any) -> Any:
+        """messages.GetHistory с семантикой offset_id/add_offset/limit/min_id/max_id Telegram"""
+        if not isinstance(query, raw.functions.messages.GetHistory):
+            raise NotImplementedError(type(query).__name__)
+
+        newest_first = self.messages[::-1]
+        start = 0
+        if query.offset_id:
+            start = next((i for i, m in enumerate(newest_first) if m.id < query.offset_id), len(newest_first))
+        start += query.add_offset
+
+        window = newest_first[max(0, start):max(0, start + query.limit)]
+        window = [m for m in window if m.id > query.min_id and (not query.max_id or m.id < query.max_id)]
+
+        self.history_calls += 1
+        return self._page(window)
+
+    async def get_chat_history(self, channel_name: str, limit: int = 0):
+        """Как pyrogram: страницы по 100 от новых к старым, каждая загружается целиком"""
+        newest_first = self.messages[::-1][:limit] if limit else self.messages[::-1]
+        page_limit = min(self.PAGE_LIMIT, limit or self.PAGE_LIMIT)
+
+        for start in range(0, len(newest_first), page_limit):
+            chunk = newest_first[start:start + page_limit]
+            self.history_calls += 1
+            self._page(chunk)
+            for message in chunk:
+                yield message
+
+    def _page(self, messages: list[SimpleNamespace]) -> raw.types.messages.ChannelMessages:
+        """Ответ GetHistory с учётом размера в байтах"""
+        page = raw.types.messages.ChannelMessages(
+            pts=0,
+            count=len(self.messages),
+            messages=[
+                raw.types.Message(
+                    id=message.id,
+                    peer_id=raw.types.PeerChannel(channel_id=self.CHANNEL_ID),
+                    date=int(message.date.timestamp()),
+                    message=message.text,
+                    post=True,
+                    entities=[]
+                )
+                for message in messages
+            ],
+            chats=[
+                raw.types.Channel(
+                    id=self.CHANNEL_ID,
+                    title=self.channel_name,
+                    photo=raw.types.ChatPhotoEmpty(),
+                    date=0,
+                    access_hash=0,
+                    broadcast=True,
+                    restriction_reason=[],
+                    usernames=[]
+                )
+            ],
+            users=[],
+            topics=[]
+        )
+        self.history_bytes += len(page.write())
+        return page
+
+    def add_handler(self, handler: Any) -> None:
+        self._handlers.append(handler)
+
+    def remove_handler(self, handler: Any) -> None:
+        self._handlers.remove(handler)
+
+    async def publish(self, text: str) -> SimpleNamespace:
+        """Публикация сообщения: в историю и push-обработчикам"""
+        message = SimpleNamespace(id=self._next_id, text=text, date=datetime.now())
+        self._next_id += 1
+        self.messages.append(message)
+        self.published_at[message.id] = time.perf_counter()
+
+        for handler in list(self._handlers):
+            asyncio.create_task(handler.callback(self, message))
+
+        return message
+
+
+class StubBybitServer:
+    """Локальная заглушка REST API Bybit v5 с искусственной задержкой"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, price: float = 100.0,
+                 symbols: list[str] | None = None, rate_limits: dict[str, int] | None = None,
+                 ip_limit: int = 0):
+        self.symbols = symbols or ["BTCUSDT"]
+        self.rate_limits = rate_limits or {}
+        self.ip_limit = ip_limit
+        self.rejected = 0
+        self.ip_rejected = 0
+        self._windows: dict[str, tuple[int, int]] = {}
+        self._windows_lock = threading.Lock()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.price = price
+        self.orders: list[tuple[float, dict[str, Any]]] = []
+        self.batches: list[tuple[float, dict[str, Any]]] = []
+        self.requests = 0
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubBybitServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                stub._reply(self, parsed.path, {k: v[0] for k, v in parse_qs(parsed.query).items()})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                stub._reply(self, urlparse(self.path).path, body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def _reply(self, handler: BaseHTTPRequestHandler, path: str, params: dict[str, Any]) -> None:
+        received_at = time.perf_counter()
+        self.requests += 1
+
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+
+        if self.ip_limit and self._count("ip", self.ip_limit)[0] < 0:
+            self.ip_rejected += 1
+            handler.send_response(403)
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+
+        headers = {}
+        response = {"retCode": 0, "retMsg": "OK", "result": {}, "retExtInfo": {}, "time": 0}
+
+        if path in self.rate_limits:
+            limit = self.rate_limits[path]
+            remaining, reset_ms = self._count(path, limit)
+            headers = {"X-Bapi-Limit": limit, "X-Bapi-Limit-Status": max(remaining, 0),
+                       "X-Bapi-Limit-Reset-Timestamp": reset_ms}
+            if remaining < 0:
+                self.rejected += 1
+                response.update(retCode=10006, retMsg="Too many visits!")
+
+        if response["retCode"] == 0:
+            response["result"] = self._handle(path, params, received_at)
+        body = json.dumps(response).encode()
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            handler.send_header(name, str(value))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _count(self, key: str, limit: int) -> tuple[int, int]:
+        """Остаток лимита в секундном окне и время его сброса в мс"""
+        window = int(time.time())
+        with self._windows_lock:
+            current, used = self._windows.get(key, (window, 0))
+            used = used + 1 if current == window else 1
+            self._windows[key] = (window, used)
+        return limit - used, (window + 1) * 1000
+
+    def _handle(self, path: str, params: dict[str, Any], received_at: float) -> dict[str, Any]:
+        if path == "/v5/market/instruments-info":
+            symbols = [params["symbol"]] if params.get("symbol") else self.symbols
+            return {"list": [self._instrument(symbol) for symbol in symbols], "nextPageCursor": ""}
+
+        if path == "/v5/market/tickers":
+            return {"list": [{"symbol": params.get("symbol"), "lastPrice": str(self.price)}]}
+
+        if path == "/v5/position/list":
+            return {"list": [], "nextPageCursor": ""}
+
+        if path == "/v5/order/create":
+            self.orders.append((received_at, params))
+            return {"orderId": f"stub-{len(self.orders)}", "orderLinkId": params.get("orderLinkId", "")}
+
+        if path == "/v5/order/create-batch":
+            self.batches.append((received_at, params))
+            return {"list": [{"orderId": f"stub-tp-{i}"} for i, _ in enumerate(params.get("request", []))]}
+
+        return {}
+
+    @staticmethod
+    def _instrument(symbol: str) -> dict[str, Any]:
+        return {
+            "symbol": symbol,
+            "status": "Trading",
+            "lotSizeFilter": {"qtyStep": "0.001", "minOrderQty": "0.001", "maxOrderQty": "1000"},
+            "priceFilter": {"tickSize": "0.01"}
+        }
+
+
+# Кадры публичного потока tickers Bybit v5 в формате записи: снапшот на подписку, затем дельты
+# только с изменившимися полями — часть без lastPrice или markPrice
+TICKER_FRAMES = [
+    {"topic": "tickers.BTCUSDT", "type": "snapshot", "cs": 24987956059, "ts": 1673272861686, "data": {
+        "symbol": "BTCUSDT", "tickDirection": "PlusTick", "price24hPcnt": "0.017103", "lastPrice": "17216.00",
+        "prevPrice24h": "16926.50", "highPrice24h": "17281.50", "lowPrice24h": "16915.00",
+        "markPrice": "17217.33", "indexPrice": "17227.36", "openInterest": "68744.761",
+        "fundingRate": "-0.000212", "bid1Price": "17215.50", "bid1Size": "84.489", "ask1Price": "17216.00",
+        "ask1Size": "83.020"}},
+    {"topic": "tickers.ETHUSDT", "type": "snapshot", "cs": 19815839734, "ts": 1673272861702, "data": {
+        "symbol": "ETHUSDT", "tickDirection": "ZeroPlusTick", "price24hPcnt": "0.021445", "lastPrice": "1321.44",
+        "prevPrice24h": "1293.70", "highPrice24h": "1326.12", "lowPrice24h": "1290.03",
+        "markPrice": "1321.51", "indexPrice": "1322.02", "openInterest": "401256.97",
+        "fundingRate": "0.0001", "bid1Price": "1321.43", "bid1Size": "12.70", "ask1Price": "1321.44",
+        "ask1Size": "35.10"}},
+    {"topic": "tickers.BTCUSDT", "type": "delta", "cs": 24987956060, "ts": 1673272861786, "data": {
+        "symbol": "BTCUSDT", "bid1Price": "17215.50", "bid1Size": "82.114", "ask1Price": "17216.00",
+        "ask1Size": "80.337"}},
+    {"topic": "tickers.BTCUSDT", "type": "delta", "cs": 24987956071, "ts": 1673272861886, "data": {
+        "symbol": "BTCUSDT", "markPrice": "17218.02", "indexPrice": "17227.90"}},
+    {"topic": "tickers.ETHUSDT", "type": "delta", "cs": 19815839790, "ts": 1673272861902, "data": {
+        "symbol": "ETHUSDT", "tickDirection": "PlusTick", "lastPrice": "1321.60", "bid1Price": "1321.59",
+        "ask1Price": "1321.60"}},
+    {"topic": "tickers.BTCUSDT", "type": "delta", "cs": 24987956102, "ts": 1673272861986, "data": {
+        "symbol": "BTCUSDT", "tickDirection": "MinusTick", "lastPrice": "17214.50", "bid1Price": "17214.00",
+        "ask1Price": "17214.50"}},
+    {"topic": "tickers.ETHUSDT", "type": "delta", "cs": 19815839811, "ts": 1673272862002, "data": {
+        "symbol": "ETHUSDT", "markPrice": "1321.57", "openInterest": "401260.12"}},
+    {"topic": "tickers.BTCUSDT", "type": "delta", "cs": 24987956140, "ts": 1673272862086, "data": {
+        "symbol": "BTCUSDT", "price24hPcnt": "0.017015", "bid1Size": "91.250"}},
+]
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def _ws_frame(opcode: int, payload: bytes) -> bytes:
+    """Кадр сервера без маски"""
+    length = len(payload)
+    if length < 126:
+        header = bytes([0x80 | opcode, length])
+    elif length < 1 << 16:
+        header = bytes([0x80 | opcode, 126]) + length.to_bytes(2, "big")
+    else:
+        header = bytes([0x80 | opcode, 127]) + length.to_bytes(8, "big")
+    return header + payload
+
+
+class _WebSocketConnection:
+    """Соединение клиента с фейковым сервером; muted — полуоткрытый сокет, который молчит"""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.topics: set[str] = set()
+        self.muted = False
+        self._lock = threading.Lock()
+
+    def send(self, message: dict[str, Any]) -> None:
+        self.write(0x1, json.dumps(message).encode())
+
+    def write(self, opcode: int, payload: bytes) -> None:
+        if self.muted:
+            return
+        with self._lock:
+            self.sock.sendall(_ws_frame(opcode, payload))
+
+    def drop(self) -> None:
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class FakeBybitWebSocket:
+    """Локальный публичный WebSocket Bybit v5, воспроизводящий записанные кадры tickers.
+
+    На подписку сервер, как биржа, отвечает снапшотом текущего состояния топика, а replay()
+    рассылает записанные дельты подписчикам с исходными интервалами. drop() обрывает соединения,
+    mute() делает их полуоткрытыми: сокет жив, но ни данных, ни pong больше нет.
+    """
+
+    def __init__(self, frames: list[dict[str, Any]] | None = None, speed: float = 1.0):
+        self.frames = frames if frames is not None else TICKER_FRAMES
+        self.speed = speed
+        self.connections = 0
+        self.subscriptions = 0
+        self.pings = 0
+        self._state: dict[str, dict[str, Any]] = {}
+        self._clients: list[_WebSocketConnection] = []
+        self._lock = threading.Lock()
+        self._server: socketserver.ThreadingTCPServer | None = None
+
+        for frame in self.frames:
+            if frame["type"] == "snapshot":
+                self._state[frame["topic"]] = dict(frame["data"])
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"ws://{host}:{port}/v5/public/linear"
+
+    def start(self) -> "FakeBybitWebSocket":
+        fake = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                fake._serve(self.connection, self.rfile)
+
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.drop()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def expected(self) -> dict[str, dict[str, Any]]:
+        """Состояние топиков после всех разосланных кадров"""
+        with self._lock:
+            return {topic: dict(data) for topic, data in self._state.items()}
+
+    def replay(self) -> int:
+        """Рассылка записанных дельт подписчикам с исходными интервалами, ускоренными в speed раз"""
+        deltas = [frame for frame in self.frames if frame["type"] == "delta"]
+        previous_ts = deltas[0]["ts"] if deltas else 0
+
+        for frame in deltas:
+            time.sleep(max(0, frame["ts"] - previous_ts) / 1000 / self.speed)
+            previous_ts = frame["ts"]
+            self.push(frame)
+
+        return len(deltas)
+
+    def push(self, frame: dict[str, Any]) -> None:
+        """Кадр подписчикам топика с обновлением состояния для следующих снапшотов"""
+        with self._lock:
+            self._state.setdefault(frame["topic"], {}).update(frame["data"])
+            clients = [client for client in self._clients if frame["topic"] in client.topics]
+
+        for client in clients:
+            try:
+                client.send(frame)
+            except OSError:
+                pass
+
+    def drop(self) -> None:
+        """Обрыв всех соединений"""
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            client.drop()
+
+    def mute(self) -> None:
+        """Текущие соединения перестают отвечать, новые работают как обычно"""
+        with self._lock:
+            for client in self._clients:
+                client.muted = True
+
+    def _serve(self, sock: socket.socket, rfile) -> None:
+        if not self._handshake(sock, rfile):
+            return
+
+        client = _WebSocketConnection(sock)
+        with self._lock:
+            self.connections += 1
+            self._clients.append(client)
+
+        try:
+            while True:
+                opcode, payload = self._read_frame(rfile)
+                if opcode is None or opcode == 0x8:
+                    return
+                if opcode == 0x9:
+                    client.write(0xA, payload)
+                elif opcode == 0x1:
+                    self._on_request(client, json.loads(payload))
+        except (OSError, ValueError):
+            pass
+        finally:
+            with self._lock:
+                if client in self._clients:
+                    self._clients.remove(client)
+
+    def _on_request(self, client: _WebSocketConnection, request: dict[str, Any]) -> None:
+        op = request.get("op")
+
+        if op == "ping":
+            self.pings += 1
+            client.send({"success": True, "ret_msg": "pong", "conn_id": "fake", "op": "ping"})
+        elif op == "subscribe":
+            self.subscriptions += 1
+            topics = request.get("args", [])
+            client.send({"success": True, "ret_msg": "", "conn_id": "fake", "req_id": "", "op": "subscribe"})
+
+            with self._lock:
+                client.topics.update(topics)
+                now_ms = int(time.time() * 1000)
+                snapshots = [
+                    {"topic": topic, "type": "snapshot", "ts": now_ms, "data": dict(self._state[topic])}
+                    for topic in topics if topic in self._state
+                ]
+            for snapshot in snapshots:
+                client.send(snapshot)
+
+    @staticmethod
+    def _handshake(sock: socket.socket, rfile) -> bool:
+        headers = {}
+        if not rfile.readline():
+            return False
+
+        while True:
+            line = rfile.readline().decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        key = headers.get("sec-websocket-key")
+        if not key:
+            return False
+
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        sock.sendall((
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+        ).encode())
+        return True
+
+    @staticmethod
+    def _read_frame(rfile) -> tuple[int | None, bytes]:
+        """Кадр клиента: клиент всегда маскирует данные"""
+        header = rfile.read(2)
+        if len(header) < 2:
+            return None, b""
+
+        opcode, length = header[0] & 0x0F, header[1] & 0x7F
+        if length == 126:
+            length = int.from_bytes(rfile.read(2), "big")
+        elif length == 127:
+            length = int.from_bytes(rfile.read(8), "big")
+
+        mask = rfile.read(4) if header[1] & 0x80 else b""
+        payload = rfile.read(length)
+        if mask:
+            payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+        return opcode, payload
@@ -0,0 +1,117 @@
+# benchmarks/hedging.py
+import benchmarks.env  # noqa: F401
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from trading.bybit_api import BybitAPI
+from trading.config import TradingConfig
+from trading.paper import PaperExchange, PaperExchangeServer, load_instruments
+from utils.tracing import LatencyHistogram
+
+
+def submit_orders(hedge: bool, orders: int, concurrency: int, latency_ms: float, jitter_ms: float,
+                  slow_rate: float, slow_ms: float, seed: int) -> dict[str, float]:
+    """Рыночные ордера с уникальными orderLinkId через BybitAPI к симулятору с хвостом задержек"""
+    exchange = PaperExchange(load_instruments(), volatility=0, balance=10_000_000, seed=seed)
+    server = PaperExchangeServer(exchange, latency_ms=latency_ms, jitter_ms=jitter_ms, slow_rate=slow_rate,
+                                 slow_ms=slow_ms, seed=seed)
+    server.start_in_thread()
+
+    configured = TradingConfig.ORDER_HEDGE, TradingConfig.RATE_LIMIT
+    TradingConfig.ORDER_HEDGE, TradingConfig.RATE_LIMIT = hedge, False
+    try:
+        api = BybitAPI(account=f"bench-{'hedged' if hedge else 'single'}")
+    finally:
+        TradingConfig.ORDER_HEDGE, TradingConfig.RATE_LIMIT = configured
+    api.client.endpoint = server.url
+
+    histogram = LatencyHistogram()
+
+    def place(index: int) -> bool:
+        started = time.perf_counter()
+        order_id = api.place_market_order("BTCUSDT", "Buy" if index % 2 else "Sell", "0.001", "",
+                                          f"bench-{seed}-{index}")
+        histogram.record((time.perf_counter() - started) * 1000)
+        return bool(order_id)
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            started = time.perf_counter()
+            placed = sum(pool.map(place, range(orders)))
+            elapsed = time.perf_counter() - started
+    finally:
+        api.orders.stop()
+        server.stop()
+
+    account = next(iter(exchange.accounts.values()))
+    transport = api.orders
+    return {
+        "orders": orders,
+        "placed": placed,
+        # Каждый orderLinkId принят биржей ровно один раз, дубли отклонены с 110072
+        "accepted_by_exchange": len(account.link_ids),
+        "elapsed_s": elapsed,
+        "p50_ms": histogram.percentile(0.5),
+        "p99_ms": histogram.percentile(0.99),
+        "p999_ms": histogram.percentile(0.999),
+        "max_ms": histogram.max_ms,
+        "requests": server.requests,
+        "hedged": getattr(transport, "hedged", 0),
+        "hedge_wins": getattr(transport, "hedge_wins", 0),
+        "reconciled": getattr(transport, "reconciled", 0),
+    }
+
+
+def check_filled_reconcile(seed: int = 17) -> list[str]:
+    """Дубль рыночного входа, уже исполненного биржей: ордер находится в истории, а не среди активных"""
+    exchange = PaperExchange(load_instruments(), volatility=0, balance=10_000_000, seed=seed)
+    server = PaperExchangeServer(exchange, seed=seed)
+    server.start_in_thread()
+
+    configured = TradingConfig.ORDER_HEDGE, TradingConfig.RATE_LIMIT
+    TradingConfig.ORDER_HEDGE, TradingConfig.RATE_LIMIT = True, False
+    try:
+        api = BybitAPI(account="bench-reconcile")
+    finally:
+        TradingConfig.ORDER_HEDGE, TradingConfig.RATE_LIMIT = configured
+    api.client.endpoint = server.url
+
+    link_id = f"bench-filled-{seed}"
+    params = {"category": "linear", "symbol": "BTCUSDT", "side": "Buy", "orderType": "Market", "qty": "0.001",
+              "orderLinkId": link_id}
+    failures = []
+    try:
+        # Первая попытка дошла до биржи и исполнилась, но её ответ потерян
+        landed = exchange.create_order(TradingConfig.BYBIT_API_KEY, dict(params))
+        realtime = exchange.orders(TradingConfig.BYBIT_API_KEY, "BTCUSDT", link_id)["list"]
+        if realtime:
+            failures.append(f"исполненный ордер среди активных: {realtime}")
+
+        order_id = api.place_market_order("BTCUSDT", "Buy", "0.001", "", link_id)
+        if order_id != landed["orderId"]:
+            failures.append(f"orderId после дубля {order_id!r}, ожидался {landed['orderId']!r}")
+        if api.orders.reconciled != 1:
+            failures.append(f"reconciled={api.orders.reconciled}, ожидался 1")
+    finally:
+        api.orders.stop()
+        server.stop()
+
+    return failures
+
+
+def run(orders: int = 2000, concurrency: int = 4, latency_ms: float = 3.0, jitter_ms: float = 2.0,
+        slow_rate: float = 0.02, slow_ms: float = 300.0, seed: int = 17) -> dict:
+    """Задержка подтверждения ордера с дублем по перцентилю и без него при slow_rate медленных ответов"""
+    params = (orders, concurrency, latency_ms, jitter_ms, slow_rate, slow_ms, seed)
+    return {
+        "single": submit_orders(False, *params),
+        "hedged": submit_orders(True, *params),
+    }
+
+
+if __name__ == "__main__":
+    failures = check_filled_reconcile()
+    print(f"Сверка исполненного ордера: {', '.join(failures) or 'ок'}")
+    print(json.dumps(run(), indent=2))
+    sys.exit(1 if failures else 0)
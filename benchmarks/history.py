@@ -0,0 +1,75 @@
+# benchmarks/history.py
+import benchmarks.env  # noqa: F401
+import asyncio
+import random
+from benchmarks.corpus import NOISE_MESSAGES, synthetic_signal
+from benchmarks.fakes import FakeTelegramClient
+from signals.parser.history_fetcher import HistoryFetcher
+
+
+async def legacy_poll(client: FakeTelegramClient, last_id: int) -> list[int]:
+    """Прежний опрос: 20 последних сообщений до last_id"""
+    ids = []
+    async for message in client.get_chat_history(client.channel_name, limit=20):
+        if message.id <= last_id:
+            break
+        ids.append(message.id)
+    return ids
+
+
+async def fetcher_poll(client: FakeTelegramClient, last_id: int) -> list[int]:
+    fetcher = HistoryFetcher(client, client.channel_name)
+    return [message.id for message in await fetcher.fetch_after(last_id)]
+
+
+async def run_strategy(poll, bursts: list[int], history: int, seed: int) -> dict[str, float]:
+    """Прогон опросов по одинаковой последовательности всплесков сообщений"""
+    rng = random.Random(seed)
+    client = FakeTelegramClient()
+
+    for _ in range(history):
+        await client.publish(rng.choice(NOISE_MESSAGES) or "-")
+
+    last_id = client.messages[-1].id
+    received: set[int] = set()
+    published: set[int] = set()
+    idle_bytes: list[int] = []
+
+    for burst in bursts:
+        for _ in range(burst):
+            text = synthetic_signal(rng) if rng.random() < 0.3 else rng.choice(NOISE_MESSAGES) or "-"
+            published.add((await client.publish(text)).id)
+
+        bytes_before = client.history_bytes
+        ids = await poll(client, last_id)
+        received.update(ids)
+        last_id = max([last_id, *ids])
+
+        if not burst:
+            idle_bytes.append(client.history_bytes - bytes_before)
+
+    return {
+        "cycles": len(bursts),
+        "published": len(published),
+        "missed": len(published - received),
+        "requests": client.history_calls,
+        "bytes_per_cycle": client.history_bytes / len(bursts),
+        "idle_bytes_per_cycle": sum(idle_bytes) / max(1, len(idle_bytes)),
+        "bytes_per_received_message": client.history_bytes / max(1, len(received)),
+    }
+
+
+def run(cycles: int = 200, history: int = 200, seed: int = 3) -> dict[str, dict[str, float]]:
+    """Пропуски и трафик прежнего опроса limit=20 и HistoryFetcher по min_id"""
+    rng = random.Random(seed)
+    bursts = [rng.choice([0, 0, 0, 0, 1, 1, 2, 3, 5, 25, 150]) for _ in range(cycles)]
+
+    return {
+        "legacy_limit_20": asyncio.run(run_strategy(legacy_poll, bursts, history, seed)),
+        "history_fetcher": asyncio.run(run_strategy(fetcher_poll, bursts, history, seed)),
+    }
+
+
+if __name__ == "__main__":
+    import json
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,104 @@
+# benchmarks/micro.py
+import benchmarks.env  # noqa: F401
+import logging
+import time
+from types import SimpleNamespace
+from typing import Callable
+from benchmarks.corpus import build_corpus
+from signals.parser.message_filter import MessageFilter
+from signals.parser.signal_parser import SignalParser
+from signals.parser.signal_scanner import SignalScanner
+from trading.bybit_api import BybitAPI
+from trading.config import TradingConfig
+from trading.sizing import SizingScale
+from trading.tp_ladder import TakeProfitLadder
+
+
+def measure(func: Callable[[], None], operations: int, repeat: int = 5) -> dict[str, float]:
+    """Лучшее из repeat прогонов, в наносекундах на операцию"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter_ns()
+        func()
+        timings.append((time.perf_counter_ns() - started) / operations)
+
+    timings.sort()
+    return {"best_ns": timings[0], "median_ns": timings[len(timings) // 2]}
+
+
+def run(corpus_size: int = 2000, repeat: int = 5) -> dict[str, dict[str, float]]:
+    """Микробенчмарки горячего пути разбора и округления"""
+    corpus = build_corpus(corpus_size)
+    messages = [SimpleNamespace(text=text) for text in corpus]
+    signal_texts = [message.text for message in messages if MessageFilter.is_signal_message(message)]
+
+    quantities = [(i * 0.0137 + 0.001, step) for i, step in enumerate(["0.001", "0.01", "1", "0.1"] * 500)]
+    prices = [(i * 1.37 + 0.5, tick) for i, tick in enumerate(["0.01", "0.0001", "0.5", "0.000001"] * 500)]
+
+    filters = {"qty_step": "0.001", "min_qty": "0.001", "tick_size": "0.1"}
+    scale = SizingScale.from_filters(filters["qty_step"], filters["min_qty"], filters["tick_size"])
+    signals = [SignalParser.parse(text) for text in signal_texts]
+    notional = TradingConfig.BALANCE * TradingConfig.AMOUNT / 100 * 20
+    tp_percentages = TradingConfig.get_tp_percentages()
+
+    def filter_corpus():
+        for message in messages:
+            MessageFilter.is_signal_message(message)
+
+    def parse_signals():
+        for text in signal_texts:
+            SignalParser.parse(text)
+
+    def filter_and_parse_corpus():
+        for message in messages:
+            if MessageFilter.is_signal_message(message):
+                SignalParser.parse(message.text)
+
+    def scan_corpus():
+        for message in messages:
+            SignalScanner.scan(message.text)
+
+    def round_quantities():
+        for qty, step in quantities:
+            BybitAPI.round_quantity(qty, step)
+
+    def round_prices():
+        for price, tick in prices:
+            BybitAPI.round_price(price, tick)
+
+    def decimal_sizing():
+        """Прежний путь: Decimal из str(float) на каждое значение"""
+        for signal in signals:
+            qty = BybitAPI.round_quantity(notional / signal.take_profits[0], filters["qty_step"])
+            if qty < float(filters["min_qty"]):
+                continue
+            orders = [str(qty), str(BybitAPI.round_price(signal.stop_loss, filters["tick_size"]))]
+            for tp_price, tp_percent in zip(signal.take_profits, tp_percentages):
+                tp_qty = BybitAPI.round_quantity(qty * tp_percent / 100, filters["qty_step"])
+                if tp_qty >= float(filters["min_qty"]):
+                    orders.append((str(BybitAPI.round_price(tp_price, filters["tick_size"])), str(tp_qty)))
+
+    def fixed_point_sizing():
+        for signal in signals:
+            qty_steps = scale.qty_steps(notional / signal.take_profits[0])
+            if qty_steps < scale.min_qty_steps:
+                continue
+            orders = [scale.format_qty(qty_steps), scale.format_price(scale.price_ticks(signal.stop_loss))]
+            ladder = TakeProfitLadder.build(signal, "BTCUSDT", qty_steps, scale)
+            orders.extend(ladder.top_up(ladder.total_qty, final=True))
+
+    previous_disable = logging.root.manager.disable
+    logging.disable(logging.WARNING)
+    try:
+        return {
+            "message_filter.is_signal_message": measure(filter_corpus, len(messages), repeat),
+            "signal_parser.parse": measure(parse_signals, len(signal_texts), repeat),
+            "reference.filter_and_parse": measure(filter_and_parse_corpus, len(messages), repeat),
+            "signal_scanner.scan": measure(scan_corpus, len(messages), repeat),
+            "bybit_api.round_quantity": measure(round_quantities, len(quantities), repeat),
+            "bybit_api.round_price": measure(round_prices, len(prices), repeat),
+            "decimal.sizing": measure(decimal_sizing, len(signals), repeat),
+            "fixed_point.sizing": measure(fixed_point_sizing, len(signals), repeat),
+        }
+    finally:
+        logging.disable(previous_disable)
@@ -0,0 +1,145 @@
+# benchmarks/multiprocess.py
+import benchmarks.env  # noqa: F401
+import asyncio
+import gc
+import json
+import logging
+import os
+import random
+import statistics
+import time
+from benchmarks.paper import signal_text, spawn_server
+from signals.parser.signal_scanner import SignalScanner
+from trading.config import TradingConfig
+from trading.ipc.supervisor import Supervisor
+from trading.paper import load_instruments
+from trading.signal_dispatcher import SignalDispatcher
+from trading.trade_engine import TradeEngine
+from utils.tracing import Trace
+
+# Живые объекты listener-процесса: полная сборка мусора обходит их все, как кэши клиента Telegram
+HEAP_OBJECTS = 300_000
+
+
+async def _noise(rng: random.Random, stop: asyncio.Event) -> dict[str, int]:
+    """Помехи listener-процесса: разбор сообщений, полные сборки мусора и блокирующая запись логов"""
+    heap = [{"id": i, "text": f"message {i}"} for i in range(HEAP_OBJECTS)]
+    counts = {"cpu": 0, "gc": 0, "io": 0}
+
+    while not stop.is_set():
+        await asyncio.sleep(rng.uniform(0.005, 0.015))
+        kind = rng.choices(("cpu", "gc", "io"), weights=(6, 1, 3))[0]
+        counts[kind] += 1
+
+        if kind == "cpu":
+            deadline = time.perf_counter() + rng.uniform(0.001, 0.006)
+            while time.perf_counter() < deadline:
+                json.loads(json.dumps(heap[rng.randrange(len(heap))]))
+        elif kind == "gc":
+            gc.collect()
+        else:
+            time.sleep(rng.uniform(0.002, 0.008))
+
+    return counts
+
+
+async def _drive(dispatcher, signals: int, interval: float, seed: int) -> list[float]:
+    """Сигналы с постоянным интервалом на фоне помех; результат — e2e.order_ack каждого исполненного"""
+    rng = random.Random(seed)
+    instruments = load_instruments()
+    batch = [
+        SignalScanner.scan(signal_text(rng, instrument.symbol, instrument.price))
+        for instrument in (rng.choice(instruments) for _ in range(signals))
+    ]
+
+    stop = asyncio.Event()
+    noise = asyncio.create_task(_noise(random.Random(seed), stop))
+    traces = []
+    tasks = []
+
+    for signal in batch:
+        await asyncio.sleep(interval)
+        trace = Trace(name=f"{signal.ticker} {signal.direction}")
+        traces.append(trace)
+        tasks.append(dispatcher.submit(signal, trace))
+
+    await asyncio.gather(*tasks, return_exceptions=True)
+    stop.set()
+    await noise
+
+    return [trace.spans["e2e.order_ack"] for trace in traces if "e2e.order_ack" in trace.spans]
+
+
+def _summary(acks: list[float], signals: int, elapsed: float) -> dict[str, float]:
+    ordered = sorted(acks)
+    return {
+        "signals": signals,
+        "acked": len(acks),
+        "elapsed_s": elapsed,
+        "p50_ms": ordered[len(ordered) // 2],
+        "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+        "max_ms": ordered[-1],
+        "stdev_ms": statistics.pstdev(acks),
+    }
+
+
+async def single(url: str, signals: int, interval: float, seed: int) -> dict[str, float]:
+    """Один процесс: помехи и TradeEngine в одном цикле событий"""
+    engine = TradeEngine()
+    for account in engine.accounts:
+        account.api.client.endpoint = url
+    dispatcher = SignalDispatcher(engine)
+
+    try:
+        await engine.start()
+        started = time.perf_counter()
+        acks = await _drive(dispatcher, signals, interval, seed)
+        elapsed = time.perf_counter() - started
+    finally:
+        await dispatcher.close()
+        engine.close()
+
+    return _summary(acks, signals, elapsed)
+
+
+async def multiprocess(url: str, signals: int, interval: float, seed: int, transport: str) -> dict[str, float]:
+    """Listener с помехами отдельно от процесса исполнения, сигналы через канал IPC"""
+    configured = os.environ.copy()
+    # Процессы исполнения читают настройки из окружения при импорте TradingConfig
+    os.environ.update({"TRADING_MODE": "paper", "PAPER_URL": url, "RATE_LIMIT": "false"})
+    supervisor = Supervisor(transport=transport, log_level=logging.root.manager.disable or None)
+
+    try:
+        await supervisor.start()
+        started = time.perf_counter()
+        acks = await _drive(supervisor.dispatcher, signals, interval, seed)
+        elapsed = time.perf_counter() - started
+    finally:
+        await supervisor.stop()
+        os.environ.clear()
+        os.environ.update(configured)
+
+    return _summary(acks, signals, elapsed)
+
+
+def run(signals: int = 200, interval_ms: float = 20.0, latency_ms: float = 2.0, seed: int = 23) -> dict:
+    """Разброс задержки подтверждения ордера от приёма сигнала: один процесс против listener + исполнитель"""
+    server, url = spawn_server(latency_ms, seed)
+
+    configured, TradingConfig.RATE_LIMIT = TradingConfig.RATE_LIMIT, False
+    params = (url, signals, interval_ms / 1000, seed)
+    try:
+        return {
+            "single": asyncio.run(single(*params)),
+            "multiprocess_shm": asyncio.run(multiprocess(*params, "shm")),
+            "multiprocess_socket": asyncio.run(multiprocess(*params, "socket")),
+        }
+    finally:
+        TradingConfig.RATE_LIMIT = configured
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    print(json.dumps(run(), indent=2))
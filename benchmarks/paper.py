@@ -0,0 +1,147 @@
+# benchmarks/paper.py
+import benchmarks.env  # noqa: F401
+import asyncio
+import json
+import logging
+import multiprocessing
+import random
+import time
+from benchmarks.corpus import SIGNAL_TEMPLATE
+from signals.parser.signal_scanner import SignalScanner
+from trading.config import TradingConfig
+from trading.paper import PaperExchange, PaperExchangeServer, load_instruments
+from trading.signal_dispatcher import SignalDispatcher
+from trading.trade_engine import TradeEngine
+
+REQUEST = (
+    "GET /v5/market/tickers?category=linear&symbol=BTCUSDT HTTP/1.1\r\n"
+    "Host: bench\r\nX-BAPI-API-KEY: bench-key\r\n\r\n"
+).encode()
+
+
+async def _client(host: str, port: int, requests: int) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(requests):
+            writer.write(REQUEST)
+            await writer.drain()
+            length = 0
+            while (line := await reader.readline()) != b"\r\n":
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+    finally:
+        writer.close()
+
+
+def throughput(connections: int = 50, requests: int = 200, latency_ms: float = 1.0) -> dict[str, float]:
+    """Запросов в секунду через keep-alive соединения к симулятору в отдельном потоке"""
+    server = PaperExchangeServer(PaperExchange(load_instruments(), seed=1), latency_ms=latency_ms)
+    server.start_in_thread()
+
+    async def load() -> float:
+        started = time.perf_counter()
+        await asyncio.gather(*(_client(server.host, server.port, requests) for _ in range(connections)))
+        return time.perf_counter() - started
+
+    try:
+        elapsed = asyncio.run(load())
+    finally:
+        server.stop()
+
+    return {"requests": server.requests, "elapsed_s": elapsed, "requests_per_s": server.requests / elapsed}
+
+
+def _serve(urls: multiprocessing.Queue, latency_ms: float, seed: int) -> None:
+    logging.disable(logging.INFO)
+    exchange = PaperExchange(load_instruments(), volatility=0, balance=10_000_000, seed=seed)
+    server = PaperExchangeServer(exchange, latency_ms=latency_ms, seed=seed)
+
+    async def serve() -> None:
+        await server.start()
+        urls.put(server.url)
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def spawn_server(latency_ms: float = 0.0, seed: int = 1) -> tuple[multiprocessing.Process, str]:
+    """Симулятор в своём процессе: нагрузка клиента бенчмарка не задерживает ответы биржи"""
+    context = multiprocessing.get_context("spawn")
+    urls = context.Queue()
+    server = context.Process(target=_serve, args=(urls, latency_ms, seed), daemon=True)
+    server.start()
+    return server, urls.get(timeout=30)
+
+
+def signal_text(rng: random.Random, symbol: str, price: float) -> str:
+    direction = rng.choice(["Long", "Short"])
+    sign = 1 if direction == "Long" else -1
+    return SIGNAL_TEMPLATE.format(
+        base=symbol.removesuffix("USDT"), marker="🟩" if sign > 0 else "🟥", direction=direction,
+        leverage=rng.choice([10, 20]), entry=price, entry2=price,
+        take_profits="\n".join(f"{i}) {price * (1 + sign * 0.003 * i):.8g}" for i in range(1, 9)),
+        stop_loss=f"{price * (1 - sign * 0.02):.8g}"
+    )
+
+
+async def engine_stress(signals: int, latency_ms: float, error_rate: float, seed: int,
+                        rate_limit: bool = True) -> dict[str, float]:
+    """Пачка сигналов по всем символам симулятора через SignalDispatcher и TradeEngine"""
+    rng = random.Random(seed)
+    exchange = PaperExchange(load_instruments(), volatility=0, balance=10_000_000, seed=seed)
+    server = PaperExchangeServer(exchange, latency_ms=latency_ms, error_rate=error_rate, seed=seed)
+    server.start_in_thread()
+
+    configured, TradingConfig.RATE_LIMIT = TradingConfig.RATE_LIMIT, rate_limit
+    try:
+        engine = TradeEngine()
+    finally:
+        TradingConfig.RATE_LIMIT = configured
+
+    for account in engine.accounts:
+        account.api.client.endpoint = server.url
+    dispatcher = SignalDispatcher(engine)
+
+    try:
+        await engine.start()
+        instruments = list(exchange.instruments.values())
+        batch = []
+        for _ in range(signals):
+            instrument = rng.choice(instruments)
+            batch.append(SignalScanner.scan(signal_text(rng, instrument.symbol, instrument.price)))
+
+        requests_before = server.requests
+        started = time.perf_counter()
+        results = await asyncio.gather(*(dispatcher.submit(signal) for signal in batch))
+        elapsed = time.perf_counter() - started
+    finally:
+        await dispatcher.close()
+        engine.close()
+        server.stop()
+
+    return {
+        "signals": signals,
+        "executed": sum(bool(result) for result in results),
+        "elapsed_s": elapsed,
+        "signals_per_s": signals / elapsed,
+        "requests_per_s": (server.requests - requests_before) / elapsed,
+        "injected_errors": server.injected_errors,
+    }
+
+
+def run(signals: int = 300, latency_ms: float = 2.0, error_rate: float = 0.01, seed: int = 11) -> dict:
+    """Пропускная способность симулятора и нагрузка TradeEngine сигналами по нескольким символам.
+
+    С планировщиком лимитов поток сигналов упирается в лимит /v5/order/create (10 в секунду на аккаунт),
+    без него — в конкурентность движка.
+    """
+    return {
+        "server": throughput(latency_ms=latency_ms / 2),
+        "engine_rate_limited": asyncio.run(engine_stress(signals // 10, latency_ms, error_rate, seed)),
+        "engine_unlimited": asyncio.run(engine_stress(signals, latency_ms, error_rate, seed, rate_limit=False)),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,100 @@
+# benchmarks/price_stream.py
+import benchmarks.env  # noqa: F401
+import json
+import logging
+import sys
+import time
+from typing import Callable
+from benchmarks.fakes import FakeBybitWebSocket
+from trading.price_cache import PriceCache
+
+
+def _wait(condition: Callable[[], bool], timeout: float) -> float | None:
+    """Время до выполнения условия в мс или None по таймауту"""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if condition():
+            return (time.perf_counter() - started) * 1000
+        time.sleep(0.002)
+    return None
+
+
+def _matches(cache: PriceCache, expected: dict[str, dict]) -> bool:
+    """Цены кэша совпадают с состоянием топиков сервера"""
+    return all(
+        cache.get_last_price(data["symbol"]) == float(data["lastPrice"])
+        and cache.get_mark_price(data["symbol"]) == float(data["markPrice"])
+        for data in expected.values()
+    )
+
+
+def scenario(max_age: float = 0.5, ping_interval: float = 0.2,
+             timeout: float = 5) -> tuple[dict[str, float], list[str]]:
+    """PriceCache против фейкового потока: снапшот, дельты, обрыв, устаревание и полуоткрытый сокет"""
+    server = FakeBybitWebSocket().start()
+    cache = PriceCache(server.url, max_age=max_age, ping_interval=ping_interval)
+    symbols = sorted({frame["data"]["symbol"] for frame in server.frames})
+    metrics: dict[str, float] = {}
+    failures: list[str] = []
+
+    def step(name: str, condition: Callable[[], bool]) -> float | None:
+        elapsed = _wait(condition, timeout)
+        if elapsed is None:
+            failures.append(name)
+        return elapsed
+
+    try:
+        cache.start(symbols)
+        metrics["snapshot_ms"] = step("snapshot", lambda: _matches(cache, server.expected()))
+
+        metrics["deltas"] = server.replay()
+        step("deltas", lambda: _matches(cache, server.expected()))
+
+        # Обрыв: соединение переоткрывается, подписки восстанавливаются, снапшот приходит заново
+        connections = server.connections
+        server.drop()
+        step("disconnect", lambda: not cache.is_connected)
+        metrics["reconnect_ms"] = step("reconnect", lambda: cache.is_connected and server.connections > connections
+                                       and _matches(cache, server.expected()))
+
+        symbol = symbols[0]
+        server.push({"topic": f"tickers.{symbol}", "type": "delta", "data": {"symbol": symbol, "lastPrice": "1.5"}})
+        step("resubscribe", lambda: cache.get_last_price(symbol) == 1.5)
+
+        # Без кадров цены старше max_age не отдаются, хотя соединение живо и отвечает на пинги
+        metrics["stale_ms"] = step("staleness", lambda: all(cache.get_last_price(s) is None for s in symbols))
+        if not cache.is_connected:
+            failures.append("connected while stale")
+
+        # Полуоткрытый сокет: ни данных, ни pong — сторожевой таймер пинга закрывает соединение
+        connections = server.connections
+        server.mute()
+        metrics["half_open_detect_ms"] = step("watchdog", lambda: not cache.is_connected)
+        metrics["half_open_recover_ms"] = step("watchdog reconnect", lambda: cache.is_connected
+                                               and server.connections > connections
+                                               and _matches(cache, server.expected()))
+    finally:
+        cache.stop()
+        server.stop()
+
+    metrics["pings"] = server.pings
+    return metrics, failures
+
+
+def check() -> list[str]:
+    """Шаги сценария, которые не выполнились"""
+    return scenario()[1]
+
+
+def run() -> dict:
+    """Задержки восстановления потока цен на фейковом сервере"""
+    metrics, failures = scenario()
+    return {**{name: value for name, value in metrics.items() if value is not None}, "failures": len(failures)}
+
+
+if __name__ == "__main__":
+    logging.disable(logging.WARNING)
+    metrics, failures = scenario()
+    print(json.dumps(metrics, indent=2))
+    print(f"Невыполненные шаги: {', '.join(failures) or 'нет'}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,89 @@
+# benchmarks/rate_limit.py
+import benchmarks.env  # noqa: F401
+import threading
+import time
+from pybit.unified_trading import HTTP
+from benchmarks.fakes import StubBybitServer
+from trading.rate_limiter import RateLimitedClient, RateLimitScheduler, TokenBucket
+from utils.tracing import LatencyHistogram
+
+ORDER_PATH = "/v5/order/create"
+
+
+def burst(client, duration: float, flooders: int, orders: int) -> dict[str, float]:
+    """Ордера на фоне потока запросов тикеров из нескольких потоков"""
+    stop = threading.Event()
+    latencies = LatencyHistogram()
+    counts = {"market_ok": 0, "market_failed": 0, "orders_ok": 0, "orders_failed": 0}
+    counts_lock = threading.Lock()
+
+    def count(key: str) -> None:
+        with counts_lock:
+            counts[key] += 1
+
+    def flood() -> None:
+        while not stop.is_set():
+            try:
+                client.get_tickers(category="linear", symbol="BTCUSDT")
+                count("market_ok")
+            except Exception:
+                count("market_failed")
+                time.sleep(0.01)
+
+    threads = [threading.Thread(target=flood, daemon=True) for _ in range(flooders)]
+    for thread in threads:
+        thread.start()
+
+    for _ in range(orders):
+        time.sleep(duration / orders)
+        started = time.perf_counter()
+        try:
+            resp = client.place_order(category="linear", symbol="BTCUSDT", side="Buy", orderType="Market", qty="1")
+            if isinstance(resp, tuple):
+                resp = resp[0]
+            count("orders_ok" if resp.get("retCode") == 0 else "orders_failed")
+            latencies.record((time.perf_counter() - started) * 1000)
+        except Exception:
+            count("orders_failed")
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        **counts,
+        "order_p50_ms": latencies.percentile(0.5),
+        "order_p99_ms": latencies.percentile(0.99),
+    }
+
+
+def run_mode(scheduled: bool, duration: float, flooders: int, orders: int, ip_limit: int,
+             order_limit: int) -> dict[str, float]:
+    stub = StubBybitServer(latency_ms=1, rate_limits={ORDER_PATH: order_limit}, ip_limit=ip_limit).start()
+    client = HTTP(api_key="bench-key", api_secret="bench-secret", max_retries=1, retry_delay=0)
+    client.endpoint = stub.url
+
+    if scheduled:
+        # Полное ведро плюс секунда пополнения дают 2 × rate в окне заглушки, поэтому rate — половина лимита
+        client = RateLimitedClient(client, RateLimitScheduler("bench", TokenBucket("ip", ip_limit / 2)))
+
+    try:
+        result = burst(client, duration, flooders, orders)
+    finally:
+        stub.stop()
+
+    return {**result, "stub_ip_rejected": stub.ip_rejected, "stub_rejected_10006": stub.rejected}
+
+
+def run(duration: float = 3.0, flooders: int = 4, orders: int = 20, ip_limit: int = 60,
+        order_limit: int = 10) -> dict[str, dict[str, float]]:
+    """Исполнение ордеров при всплеске информационных запросов: без планировщика и с ним"""
+    return {
+        "direct": run_mode(False, duration, flooders, orders, ip_limit, order_limit),
+        "scheduled": run_mode(True, duration, flooders, orders, ip_limit, order_limit),
+    }
+
+
+if __name__ == "__main__":
+    import json
+    print(json.dumps(run(), indent=2))
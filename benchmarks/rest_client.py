@@ -0,0 +1,144 @@
+# benchmarks/rest_client.py
+import benchmarks.env  # noqa: F401
+import itertools
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+import requests
+from pybit.unified_trading import HTTP
+from benchmarks.paper import spawn_server
+from trading.bybit_rest import ROUTES, BybitRestClient
+from utils.tracing import LatencyHistogram
+
+KEY, SECRET = "bench-key", "bench-secret"
+
+
+def create_client(kind: str, url: str) -> HTTP | BybitRestClient:
+    if kind == "pybit":
+        client = HTTP(api_key=KEY, api_secret=SECRET, timeout=10)
+    else:
+        client = BybitRestClient(KEY, SECRET, timeout=10, keepalive_interval=0)
+    client.endpoint = url
+    if kind == "lean":
+        client.start()
+    return client
+
+
+def measure(call: Callable[[int], object], operations: int, concurrency: int = 1) -> dict[str, float]:
+    """Задержка вызова и процессорное время клиента на вызов; биржа в другом процессе"""
+    histogram = LatencyHistogram()
+
+    def timed(index: int) -> None:
+        started = time.perf_counter()
+        call(index)
+        histogram.record((time.perf_counter() - started) * 1000)
+
+    cpu_started, started = time.process_time(), time.perf_counter()
+    if concurrency == 1:
+        for index in range(operations):
+            timed(index)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(timed, range(operations)))
+    elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+
+    return {
+        "p50_ms": histogram.percentile(0.5),
+        "p99_ms": histogram.percentile(0.99),
+        "cpu_per_call_us": cpu / operations * 1e6,
+        "calls_per_s": operations / elapsed,
+    }
+
+
+def endpoints(kind: str, url: str, operations: int) -> dict[str, dict[str, float]]:
+    client = create_client(kind, url)
+    ids = itertools.count()
+
+    def ticker(_: int) -> None:
+        client.get_tickers(category="linear", symbol="BTCUSDT")
+
+    def market_order(_: int) -> None:
+        client.place_order(category="linear", symbol="BTCUSDT", side="Buy", orderType="Market", qty="0.001",
+                           stopLoss="60000", slTriggerBy="MarkPrice", tpslMode="Full", slOrderType="Market",
+                           orderLinkId=f"bench-{kind}-{next(ids)}")
+
+    def batch(_: int) -> None:
+        client.place_batch_order(category="linear", request=[
+            {"category": "linear", "symbol": "BTCUSDT", "side": "Buy", "orderType": "Limit", "price": f"{30000 + step}",
+             "qty": "0.001", "timeInForce": "GTC", "orderLinkId": f"bench-{kind}-{next(ids)}"}
+            for step in range(5)
+        ])
+
+    try:
+        return {
+            "tickers": measure(ticker, operations),
+            "market_order": measure(market_order, operations // 2),
+            "batch_5": measure(batch, operations // 10),
+            "tickers_concurrent_8": measure(ticker, operations, concurrency=8),
+        }
+    finally:
+        if isinstance(client, BybitRestClient):
+            client.stop()
+
+
+def first_request(kind: str, url: str, repeat: int) -> dict[str, float]:
+    """Первый ордер нового клиента: у lean соединение открыто в start(), у pybit — в самом запросе"""
+    latencies = []
+    for index in range(repeat):
+        client = create_client(kind, url)
+        started = time.perf_counter()
+        client.place_order(category="linear", symbol="BTCUSDT", side="Buy", orderType="Market", qty="0.001",
+                           orderLinkId=f"bench-first-{kind}-{index}")
+        latencies.append((time.perf_counter() - started) * 1000)
+        if isinstance(client, BybitRestClient):
+            client.stop()
+    return {"p50_ms": statistics.median(latencies), "max_ms": max(latencies)}
+
+
+def request_building(operations: int = 50_000) -> dict[str, float]:
+    """Сборка подписанного запроса без сети: JSON, подпись и заголовки"""
+    params = {"category": "linear", "symbol": "BTCUSDT", "side": "Buy", "orderType": "Market", "qty": "0.001",
+              "stopLoss": "60000", "orderLinkId": "bench-link"}
+    pybit = HTTP(api_key=KEY, api_secret=SECRET)
+    lean = BybitRestClient(KEY, SECRET)
+    route = ROUTES["place_order"]
+
+    def pybit_build() -> None:
+        payload = pybit.prepare_payload("POST", dict(params))
+        timestamp = int(time.time() * 1000)
+        signature = pybit._auth(payload, 5000, timestamp)
+        pybit.client.prepare_request(requests.Request("POST", f"{pybit.endpoint}{route.path}", data=payload, headers={
+            "Content-Type": "application/json", "X-BAPI-API-KEY": KEY, "X-BAPI-SIGN": signature,
+            "X-BAPI-SIGN-TYPE": "2", "X-BAPI-TIMESTAMP": str(timestamp), "X-BAPI-RECV-WINDOW": "5000",
+        }))
+
+    def lean_build() -> None:
+        lean._build("place_order", route, json.dumps(params, separators=(",", ":")), 5000)
+
+    results = {}
+    for name, build in (("pybit_ns", pybit_build), ("lean_ns", lean_build)):
+        started = time.perf_counter()
+        for _ in range(operations):
+            build()
+        results[name] = (time.perf_counter() - started) / operations * 1e9
+    return results
+
+
+def run(operations: int = 2000, repeat: int = 30) -> dict:
+    """pybit HTTP против BybitRestClient на локальном симуляторе без искусственной задержки"""
+    server, url = spawn_server()
+    try:
+        return {
+            "pybit": {**endpoints("pybit", url, operations), "first_order": first_request("pybit", url, repeat)},
+            "lean": {**endpoints("lean", url, operations), "first_order": first_request("lean", url, repeat)},
+            "request_building": request_building(),
+        }
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
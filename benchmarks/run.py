@@ -0,0 +1,124 @@
+# benchmarks/run.py
+import argparse
+import json
+import logging
+import platform
+import sys
+from datetime import datetime
+
+
+def flatten(results: dict, prefix: str = "") -> dict[str, float]:
+    """Плоский словарь метрик вида suite.case.metric"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Метрики задержки, ухудшившиеся больше чем на threshold"""
+    current_flat = flatten(current)
+    baseline_flat = flatten(baseline)
+    regressions = []
+
+    for name, value in sorted(current_flat.items()):
+        if not name.endswith(("_ns", "_ms")) or name not in baseline_flat:
+            continue
+
+        base = baseline_flat[name]
+        change = (value - base) / base if base else 0.0
+        marker = "REGRESSION" if change > threshold else ""
+        print(f"{name:70s} {base:14.3f} -> {value:14.3f} {change:+8.1%} {marker}")
+
+        if change > threshold:
+            regressions.append(name)
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки горячего пути сигнала")
+    parser.add_argument("--suite", default="all", choices=[
+        "micro", "e2e", "history", "rate_limit", "backtest", "paper", "hedging", "multiprocess",
+        "rest_client", "price_stream", "all"
+    ])
+    parser.add_argument("--output", help="Сохранить результаты в JSON")
+    parser.add_argument("--compare", help="Сравнить с сохранённым JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Допустимое ухудшение (доля)")
+    parser.add_argument("--signals", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Задержка заглушки Bybit")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--polling-interval", type=float, default=2.0)
+    parser.add_argument("--with-logs", action="store_true", help="Не отключать логирование INFO")
+    args = parser.parse_args()
+
+    if not args.with_logs:
+        logging.disable(logging.INFO)
+
+    from benchmarks import (backtest, e2e, hedging, history, micro, multiprocess, paper, price_stream, rate_limit,
+                            rest_client)
+
+    results: dict = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        }
+    }
+
+    if args.suite in ("micro", "all"):
+        results["micro"] = micro.run()
+
+    if args.suite in ("e2e", "all"):
+        results["e2e"] = e2e.run(args.signals, args.latency_ms, args.jitter_ms, args.polling_interval)
+
+    if args.suite in ("history", "all"):
+        results["history"] = history.run()
+
+    if args.suite in ("rate_limit", "all"):
+        results["rate_limit"] = rate_limit.run()
+
+    if args.suite in ("backtest", "all"):
+        results["backtest"] = backtest.run()
+
+    if args.suite in ("paper", "all"):
+        results["paper"] = paper.run()
+
+    if args.suite in ("hedging", "all"):
+        results["hedging"] = hedging.run()
+
+    if args.suite in ("multiprocess", "all"):
+        results["multiprocess"] = multiprocess.run()
+
+    if args.suite in ("rest_client", "all"):
+        results["rest_client"] = rest_client.run()
+
+    if args.suite in ("price_stream", "all"):
+        results["price_stream"] = price_stream.run()
+
+    print(json.dumps({k: v for k, v in results.items() if k != "meta"}, indent=2, ensure_ascii=False))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        baseline.pop("meta", None)
+        results.pop("meta", None)
+
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Ухудшение метрик: {', '.join(regressions)}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
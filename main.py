@@ -1,9 +1,16 @@
 # main.py
 import asyncio
 from signals.auth.telegram_auth import TelegramAuth
-from signals.parser.channel_listener import ChannelListener
+from signals.journal.message_journal import MessageJournal
+from signals.parser.channel_profile import load_channel_profiles
+from signals.parser.multi_channel_listener import MultiChannelListener
 from signals.config import SignalsConfig
-from utils.logger import get_logger
+from trading.config import TradingConfig
+from trading.hedged_transport import export_metrics as export_order_metrics
+from trading.ipc.supervisor import Supervisor
+from trading.rate_limiter import export_metrics as export_rate_limit_metrics
+from utils.logger import export_metrics, get_logger, shutdown_logging
+from utils.tracing import tracer
 
 logger = get_logger(__name__)
 
@@ -12,17 +19,42 @@ async def main():
     """Точка входа приложения"""
     auth = None
     listener = None
+    journal = None
+    supervisor = None
 
     try:
         logger.info("Запуск торгового бота")
+        # Ошибки в файле каналов обнаруживаются до запуска исполнителей и подключения к Telegram
+        profiles = load_channel_profiles(SignalsConfig.CHANNELS_FILE, SignalsConfig.CHANNEL_NAME)
+
+        if SignalsConfig.METRICS_PORT:
+            tracer.add_collector(export_metrics)
+            tracer.add_collector(export_rate_limit_metrics)
+            tracer.add_collector(export_order_metrics)
+            tracer.start_server(SignalsConfig.METRICS_PORT)
+
+        if TradingConfig.EXECUTION_MODE == "multiprocess":
+            supervisor = Supervisor.from_config()
+            await supervisor.start()
 
         auth = TelegramAuth.from_config()
         client = await auth.connect()
 
-        listener = ChannelListener(
+        if SignalsConfig.JOURNAL_PATH:
+            journal = MessageJournal(SignalsConfig.JOURNAL_PATH)
+
+        listener = MultiChannelListener(
             client=client,
-            channel_name=SignalsConfig.CHANNEL_NAME,
-            polling_interval=2
+            profiles=profiles,
+            dispatcher=supervisor.dispatcher if supervisor else None,
+            polling_interval=SignalsConfig.POLLING_INTERVAL,
+            push_updates=SignalsConfig.UPDATES_MODE == "push",
+            gap_fill_interval=SignalsConfig.GAP_FILL_INTERVAL,
+            journal=journal,
+            max_signal_age=SignalsConfig.SIGNAL_MAX_AGE,
+            replay_limit=SignalsConfig.REPLAY_LIMIT,
+            polling_interval_fast=SignalsConfig.POLLING_INTERVAL_FAST,
+            polling_interval_idle=SignalsConfig.POLLING_INTERVAL_IDLE
         )
 
         await listener.start()
@@ -34,9 +66,15 @@ async def main():
     finally:
         if listener:
             await listener.stop()
+        if supervisor:
+            await supervisor.stop()
+        if journal:
+            journal.close()
         if auth:
             await auth.disconnect()
+        tracer.stop_server()
         logger.info("Бот остановлен")
+        shutdown_logging()
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 # signals/auth/telegram_auth.py
 from pathlib import Path
-from pyrogram import Client
+from pyrogram import Client, raw
 from pyrogram.errors import SessionPasswordNeeded, PhoneNumberInvalid, BadRequest, Unauthorized
 from utils.logger import get_logger
 from signals.config import SignalsConfig
@@ -10,7 +10,8 @@ logger = get_logger(__name__)
 
 class TelegramAuth:
     def __init__(self, api_id: str, api_hash: str, phone_number: str, session_name: str,
-                 device_model: str, system_version: str, app_version: str, lang_code: str):
+                 device_model: str, system_version: str, app_version: str, lang_code: str,
+                 receive_updates: bool = False):
         self.api_id = api_id
         self.api_hash = api_hash
         self.phone_number = phone_number
@@ -19,6 +20,7 @@ class TelegramAuth:
         self.system_version = system_version
         self.app_version = app_version
         self.lang_code = lang_code
+        self.receive_updates = receive_updates
 
         self.sessions_dir = Path(__file__).parent / "sessions"
         self.sessions_dir.mkdir(exist_ok=True)
@@ -37,7 +39,8 @@ class TelegramAuth:
             device_model=SignalsConfig.DEVICE_MODEL,
             system_version=SignalsConfig.SYSTEM_VERSION,
             app_version=SignalsConfig.APP_VERSION,
-            lang_code=SignalsConfig.LANG_CODE
+            lang_code=SignalsConfig.LANG_CODE,
+            receive_updates=SignalsConfig.UPDATES_MODE == "push"
         )
 
     async def connect(self) -> Client:
@@ -52,7 +55,7 @@ class TelegramAuth:
             system_version=self.system_version,
             app_version=self.app_version,
             lang_code=self.lang_code,
-            no_updates=True
+            no_updates=not self.receive_updates
         )
 
         await self.client.connect()
@@ -66,8 +69,17 @@ class TelegramAuth:
             user = await self.client.get_me()
             logger.info(f"Успешное подключение как {user.first_name} (ID: {user.id})")
 
+        if self.receive_updates:
+            await self._start_updates()
+
         return self.client
 
+    async def _start_updates(self) -> None:
+        """Запуск диспетчера входящих обновлений"""
+        await self.client.invoke(raw.functions.updates.GetState())
+        await self.client.initialize()
+        logger.info("Получение обновлений в реальном времени включено")
+
     async def _authorize(self) -> None:
         """Авторизация пользователя"""
         try:
@@ -87,4 +99,6 @@ class TelegramAuth:
     async def disconnect(self) -> None:
         """Отключение от Telegram"""
         if self.client:
+            if self.client.is_initialized:
+                await self.client.terminate()
             await self.client.disconnect()
\ No newline at end of file
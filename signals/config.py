@@ -18,6 +18,18 @@ class SignalsConfig:
     APP_VERSION: str = os.getenv("APP_VERSION", "")
     LANG_CODE: str = os.getenv("LANG_CODE", "")
     CHANNEL_NAME: str = os.getenv("CHANNEL_NAME", "")
+    CHANNELS_FILE: str = os.getenv("CHANNELS_FILE", "")
+
+    UPDATES_MODE: str = os.getenv("UPDATES_MODE", "push")
+    POLLING_INTERVAL: float = float(os.getenv("POLLING_INTERVAL", "2"))
+    POLLING_INTERVAL_FAST: float = float(os.getenv("POLLING_INTERVAL_FAST", "0.5"))
+    POLLING_INTERVAL_IDLE: float = float(os.getenv("POLLING_INTERVAL_IDLE", "10"))
+    GAP_FILL_INTERVAL: float = float(os.getenv("GAP_FILL_INTERVAL", "30"))
+    METRICS_PORT: int = int(os.getenv("METRICS_PORT", "9464"))
+
+    JOURNAL_PATH: str = os.getenv("JOURNAL_PATH", "data/journal.sqlite3")
+    SIGNAL_MAX_AGE: float = float(os.getenv("SIGNAL_MAX_AGE", "300"))
+    REPLAY_LIMIT: int = int(os.getenv("REPLAY_LIMIT", "500"))
 
     @classmethod
     def validate(cls) -> None:
@@ -31,7 +43,7 @@ class SignalsConfig:
             "SYSTEM_VERSION": cls.SYSTEM_VERSION,
             "APP_VERSION": cls.APP_VERSION,
             "LANG_CODE": cls.LANG_CODE,
-            "CHANNEL_NAME": cls.CHANNEL_NAME
+            "CHANNEL_NAME или CHANNELS_FILE": cls.CHANNEL_NAME or cls.CHANNELS_FILE
         }
 
         missing_fields = [field for field, value in required_fields.items() if not value]
@@ -40,5 +52,23 @@ class SignalsConfig:
             logger.error(f"Отсутствуют обязательные параметры: {', '.join(missing_fields)}")
             raise ValueError(f"Отсутствуют обязательные параметры в .env: {', '.join(missing_fields)}")
 
+        if cls.CHANNELS_FILE and not os.path.isfile(cls.CHANNELS_FILE):
+            logger.error(f"Файл каналов не найден: {cls.CHANNELS_FILE}")
+            raise ValueError(f"CHANNELS_FILE не найден: {cls.CHANNELS_FILE}")
+
+        if cls.UPDATES_MODE not in ("push", "polling"):
+            logger.error(f"Неверный UPDATES_MODE: {cls.UPDATES_MODE}")
+            raise ValueError("UPDATES_MODE должен быть 'push' или 'polling'")
+
+        intervals = (cls.POLLING_INTERVAL, cls.POLLING_INTERVAL_FAST, cls.POLLING_INTERVAL_IDLE, cls.GAP_FILL_INTERVAL)
+        if min(intervals) <= 0:
+            logger.error("POLLING_INTERVAL, POLLING_INTERVAL_FAST, POLLING_INTERVAL_IDLE и GAP_FILL_INTERVAL "
+                         "должны быть больше 0")
+            raise ValueError("Интервалы опроса должны быть положительными числами")
+
+        if cls.SIGNAL_MAX_AGE <= 0 or cls.REPLAY_LIMIT <= 0:
+            logger.error("SIGNAL_MAX_AGE и REPLAY_LIMIT должны быть больше 0")
+            raise ValueError("SIGNAL_MAX_AGE и REPLAY_LIMIT должны быть положительными числами")
+
 
 SignalsConfig.validate()
\ No newline at end of file
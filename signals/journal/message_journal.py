@@ -0,0 +1,103 @@
+# signals/journal/message_journal.py
+import json
+import os
+import sqlite3
+import time
+from signals.parser.models import Signal
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class MessageJournal:
+    """Журнал обработанных сообщений, сигналов и результатов исполнения в SQLite (WAL)"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS messages (
+            channel TEXT NOT NULL,
+            message_id INTEGER NOT NULL,
+            message_date REAL,
+            is_signal INTEGER NOT NULL,
+            processed_at REAL NOT NULL,
+            PRIMARY KEY (channel, message_id)
+        );
+        CREATE TABLE IF NOT EXISTS signals (
+            channel TEXT NOT NULL,
+            message_id INTEGER NOT NULL,
+            ticker TEXT NOT NULL,
+            direction TEXT NOT NULL,
+            leverage INTEGER NOT NULL,
+            take_profits TEXT NOT NULL,
+            stop_loss REAL NOT NULL,
+            PRIMARY KEY (channel, message_id)
+        );
+        CREATE TABLE IF NOT EXISTS outcomes (
+            channel TEXT NOT NULL,
+            message_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            recorded_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(self.SCHEMA)
+
+    def checkpoint(self, channel: str) -> int:
+        """Последний обработанный id сообщения канала, 0 если журнал пуст"""
+        row = self._db.execute("SELECT MAX(message_id) FROM messages WHERE channel = ?", (channel,)).fetchone()
+        return row[0] or 0
+
+    def recent_ids(self, channel: str, limit: int) -> list[int]:
+        """Последние обработанные id сообщений канала для дедупликации в памяти"""
+        rows = self._db.execute(
+            "SELECT message_id FROM messages WHERE channel = ? ORDER BY message_id DESC LIMIT ?",
+            (channel, limit)
+        )
+        return [row[0] for row in rows]
+
+    def unfinished_signals(self, channel: str) -> list[int]:
+        """Сигналы, принятые в исполнение, но без записанного результата"""
+        rows = self._db.execute(
+            "SELECT s.message_id FROM signals s WHERE s.channel = ? AND NOT EXISTS "
+            "(SELECT 1 FROM outcomes o WHERE o.channel = s.channel AND o.message_id = s.message_id) "
+            "ORDER BY s.message_id",
+            (channel,)
+        )
+        return [row[0] for row in rows]
+
+    def record_message(self, channel: str, message_id: int, message_date: float | None,
+                       signal: Signal | None = None) -> None:
+        """Отметка сообщения обработанным; для сигнала сохраняются его параметры"""
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.execute(
+                "INSERT OR IGNORE INTO messages VALUES (?, ?, ?, ?, ?)",
+                (channel, message_id, message_date, signal is not None, time.time())
+            )
+            if signal is not None:
+                self._db.execute(
+                    "INSERT OR IGNORE INTO signals VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (channel, message_id, signal.ticker, signal.direction, signal.leverage,
+                     json.dumps(signal.take_profits), signal.stop_loss)
+                )
+
+    def record_outcome(self, channel: str, message_id: int, status: str) -> None:
+        """Результат исполнения сигнала"""
+        self._db.execute(
+            "INSERT INTO outcomes VALUES (?, ?, ?, ?)",
+            (channel, message_id, status, time.time())
+        )
+
+    def close(self) -> None:
+        try:
+            self._db.close()
+        except Exception as e:
+            logger.error(f"Ошибка закрытия журнала {self.path}: {e}")
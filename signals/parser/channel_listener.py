@@ -1,23 +1,53 @@
 # signals/parser/channel_listener.py
 import asyncio
-from pyrogram import Client
+from collections import deque
+from functools import partial
+from pyrogram import Client, filters
+from pyrogram.handlers import MessageHandler
 from pyrogram.types import Message
-from signals.parser.message_filter import MessageFilter
-from signals.parser.signal_parser import SignalParser
+from signals.journal.message_journal import MessageJournal
+from signals.parser.channel_profile import ChannelProfile
+from signals.parser.history_fetcher import AdaptivePollInterval, HistoryFetcher
+from trading.signal_dispatcher import SignalDispatcher
 from trading.trade_engine import TradeEngine
 from utils.logger import get_logger
+from utils.tracing import Trace
 
 logger = get_logger(__name__)
 
 
 class ChannelListener:
-    def __init__(self, client: Client, channel_name: str, polling_interval: int = 2):
+    SEEN_IDS_LIMIT = 1000
+
+    def __init__(self, client: Client, channel_name: str, polling_interval: float = 2,
+                 push_updates: bool = False, gap_fill_interval: float = 30,
+                 journal: MessageJournal | None = None, max_signal_age: float = 300, replay_limit: int = 500,
+                 polling_interval_fast: float = 0.5, polling_interval_idle: float = 10,
+                 profile: ChannelProfile | None = None, dispatcher: SignalDispatcher | None = None):
         self.client = client
         self.channel_name = channel_name
+        self.profile = profile or ChannelProfile(channel_name)
         self.polling_interval = polling_interval
+        self.push_updates = push_updates
+        self.gap_fill_interval = gap_fill_interval
+        self.journal = journal
+        self.max_signal_age = max_signal_age
+        self.replay_limit = replay_limit
+        self.history = HistoryFetcher(client, channel_name)
+        self.poll_interval = AdaptivePollInterval(polling_interval, polling_interval_fast, polling_interval_idle)
         self.last_message_id: int = 0
         self.is_running: bool = False
-        self.trade_engine = TradeEngine()
+        self.dispatcher = dispatcher or SignalDispatcher(TradeEngine())
+        self.trade_engine = self.dispatcher.trade_engine
+
+        self._owns_dispatcher = dispatcher is None
+
+        self._start_message_id: int = 0
+        self._fetched_id: int = 0
+        self._seen_ids: set[int] = set()
+        self._seen_order: deque[int] = deque()
+        self._dispatch_lock = asyncio.Lock()
+        self._handler: MessageHandler | None = None
 
     async def start(self) -> None:
         """Запуск прослушивания канала"""
@@ -28,61 +58,178 @@ class ChannelListener:
             logger.error(f"Не удалось подключиться к каналу {self.channel_name}: {e}")
             raise
 
+        if self._owns_dispatcher:
+            await self.trade_engine.start()
         await self._initialize_last_message_id()
 
+        if self.push_updates:
+            self._handler = MessageHandler(self._on_new_message, filters.chat(chat.id))
+            self.client.add_handler(self._handler)
+            interval = self.gap_fill_interval
+            logger.info(f"Режим push, опрос истории для заполнения пропусков каждые {interval} с")
+        else:
+            interval = self.polling_interval
+            logger.info(
+                f"Режим polling, интервал опроса {interval} с "
+                f"({self.poll_interval.fast} с после сигнала, до {self.poll_interval.idle_max} с в тишине)"
+            )
+
         self.is_running = True
 
         while self.is_running:
             try:
-                await self._poll_new_messages()
-                await asyncio.sleep(self.polling_interval)
+                messages, signals, backlog = await self._poll_new_messages()
+                if not self.push_updates:
+                    interval = self.poll_interval.observe(messages, signals, backlog)
+                elif backlog:
+                    interval = 0
+                else:
+                    interval = self.gap_fill_interval
+                await asyncio.sleep(interval)
             except asyncio.CancelledError:
                 logger.info("Получен сигнал завершения")
                 break
             except Exception as e:
                 logger.error(f"Ошибка в цикле polling: {e}", exc_info=True)
-                await asyncio.sleep(self.polling_interval)
+                await asyncio.sleep(interval)
 
     async def stop(self) -> None:
         """Остановка прослушивания канала"""
         self.is_running = False
 
+        if self._handler:
+            self.client.remove_handler(self._handler)
+            self._handler = None
+
+        if self._owns_dispatcher:
+            await self.dispatcher.close()
+            self.trade_engine.close()
+
     async def _initialize_last_message_id(self) -> None:
-        """Инициализация last_message_id последним сообщением из канала"""
+        """Инициализация last_message_id: checkpoint журнала или последнее сообщение канала"""
+        newest_id = 0
         try:
             async for message in self.client.get_chat_history(self.channel_name, limit=1):
-                self.last_message_id = message.id
+                newest_id = message.id
                 break
         except Exception as e:
             logger.error(f"Ошибка инициализации last_message_id: {e}")
-            self.last_message_id = 0
 
-    async def _poll_new_messages(self) -> None:
-        """Получение новых сообщений из канала"""
-        try:
-            messages: list[Message] = []
+        checkpoint = self.journal.checkpoint(self.channel_name) if self.journal else 0
 
-            async for message in self.client.get_chat_history(self.channel_name, limit=20):
-                if message.id <= self.last_message_id:
-                    break
-                messages.append(message)
+        if checkpoint:
+            for message_id in reversed(self.journal.recent_ids(self.channel_name, self.SEEN_IDS_LIMIT)):
+                self._remember(message_id)
 
-            messages.reverse()
+            unfinished = self.journal.unfinished_signals(self.channel_name)
+            if unfinished:
+                logger.warning(f"Сигналы без результата исполнения с прошлого запуска: {unfinished}, "
+                               f"повторно не исполняются")
+                for message_id in unfinished:
+                    self.journal.record_outcome(self.channel_name, message_id, "interrupted")
 
-            for message in messages:
-                self._process_message(message)
-                self.last_message_id = message.id
+            logger.info(f"Возобновление с сообщения {checkpoint}, последнее в канале: {newest_id}")
+            self.last_message_id = checkpoint
+        else:
+            self.last_message_id = newest_id
+
+        self._start_message_id = self.last_message_id
+        self._fetched_id = self.last_message_id
+
+    async def _on_new_message(self, _client: Client, message: Message) -> None:
+        """Обработчик нового сообщения, пришедшего через обновления"""
+        await self._dispatch([message])
+
+    async def _poll_new_messages(self) -> tuple[int, int, bool]:
+        """Догрузка сообщений новее последнего полученного из истории id.
+
+        Возвращает число новых сообщений, число сигналов и признак, что догружены не все.
+        """
+        try:
+            messages = await self.history.fetch_after(self._fetched_id, self.replay_limit)
+            if not messages:
+                return 0, 0, False
+
+            self._fetched_id = messages[-1].id
+            signals = await self._dispatch(messages)
+            return len(messages), signals, len(messages) >= self.replay_limit
 
         except Exception as e:
             logger.error(f"Ошибка получения новых сообщений: {e}", exc_info=True)
+            return 0, 0, False
+
+    async def _dispatch(self, messages: list[Message]) -> int:
+        """Передача сообщений в обработку без повторов; возвращает число сигналов"""
+        signals = 0
+
+        async with self._dispatch_lock:
+            for message in messages:
+                if message.id <= self._start_message_id or message.id in self._seen_ids:
+                    continue
+
+                self._remember(message.id)
+                signals += self._process_message(message)
+                self.last_message_id = max(self.last_message_id, message.id)
+
+        return signals
+
+    def _remember(self, message_id: int) -> None:
+        """Запоминание id обработанного сообщения"""
+        self._seen_ids.add(message_id)
+        self._seen_order.append(message_id)
+
+        if len(self._seen_order) > self.SEEN_IDS_LIMIT:
+            self._seen_ids.discard(self._seen_order.popleft())
+
+    def _process_message(self, message: Message) -> bool:
+        """Обработка одного сообщения; True, если сигнал отправлен в исполнение"""
+        trace = Trace(message.date)
+
+        with trace.span("scan"):
+            signal = self.profile.parse(message.text)
+
+        if self.journal:
+            with trace.span("journal"):
+                message_date = message.date.timestamp() if message.date else None
+                self.journal.record_message(self.channel_name, message.id, message_date, signal)
 
-    def _process_message(self, message: Message) -> None:
-        """Обработка одного сообщения"""
-        if not MessageFilter.is_signal_message(message):
-            return
+        if not signal:
+            return False
 
-        signal = SignalParser.parse(message.text)
+        signal.channel, signal.message_id = self.channel_name, message.id
+        trace.name = f"{signal.ticker} {signal.direction} msg={self.channel_name}/{message.id}"
+        delay_ms = trace.spans.get("telegram.delivery", 0)
 
-        if signal:
-            logger.info(f"Получен новый сигнал: {signal}")
-            self.trade_engine.execute_signal(signal)
\ No newline at end of file
+        if not self.profile.enabled:
+            logger.info(f"Канал {self.channel_name} отключён, сигнал {signal} не исполняется")
+            if self.journal:
+                self.journal.record_outcome(self.channel_name, message.id, "disabled")
+            return False
+
+        if delay_ms > self.max_signal_age * 1000:
+            logger.warning(f"Сигнал {signal} устарел ({delay_ms / 1000:.0f} с), пропускаем")
+            if self.journal:
+                self.journal.record_outcome(self.channel_name, message.id, "stale")
+            return False
+
+        logger.info(f"Получен новый сигнал из {self.channel_name}: {signal} (задержка доставки {delay_ms:.0f} мс)")
+        task = self.dispatcher.submit(signal, trace, self.profile.sizing)
+
+        if self.journal:
+            task.add_done_callback(partial(self._record_outcome, message.id))
+
+        return True
+
+    def _record_outcome(self, message_id: int, task: asyncio.Task) -> None:
+        """Запись результата исполнения сигнала в журнал"""
+        if task.cancelled():
+            status = "cancelled"
+        elif task.exception():
+            status = "error"
+        else:
+            status = "executed" if task.result() else "rejected"
+
+        try:
+            self.journal.record_outcome(self.channel_name, message_id, status)
+        except Exception as e:
+            logger.error(f"Ошибка записи результата сигнала {message_id} в журнал: {e}")
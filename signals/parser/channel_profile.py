@@ -0,0 +1,94 @@
+# signals/parser/channel_profile.py
+import json
+from dataclasses import dataclass, field
+from typing import Callable
+from signals.parser.models import Signal
+from signals.parser.signal_scanner import SignalScanner
+from trading.sizing import SizingProfile
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PARSERS: dict[str, Callable[[str | None], Signal | None]] = {
+    "pulse": SignalScanner.scan,
+}
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+@dataclass
+class ChannelProfile:
+    """Источник сигналов: канал, формат сообщений и размер позиции"""
+
+    name: str
+    enabled: bool = True
+    parser: str = "pulse"
+    sizing: SizingProfile = field(default_factory=SizingProfile)
+
+    def __post_init__(self):
+        if not self.name:
+            raise ValueError("Не указано имя канала")
+
+        if self.parser not in PARSERS:
+            raise ValueError(f"Неизвестный парсер {self.parser} для канала {self.name}, доступны: {list(PARSERS)}")
+
+        # Те же проверки, что TradingConfig.validate делает для глобальных значений
+        sizing = self.sizing
+        if sizing.amount is not None and not (_is_number(sizing.amount) and sizing.amount > 0):
+            raise ValueError(f"amount канала {self.name} должен быть положительным числом, получено: {sizing.amount}")
+
+        if sizing.max_leverage is not None and not (_is_number(sizing.max_leverage) and sizing.max_leverage >= 1
+                                                    and sizing.max_leverage == int(sizing.max_leverage)):
+            raise ValueError(f"max_leverage канала {self.name} должен быть целым числом больше 0, "
+                             f"получено: {sizing.max_leverage}")
+
+        if sizing.tp_percentages is not None:
+            if not all(_is_number(tp) and tp >= 0 for tp in sizing.tp_percentages):
+                raise ValueError(f"tp_percentages канала {self.name} должны быть неотрицательными числами, "
+                                 f"получено: {list(sizing.tp_percentages)}")
+
+            total_tp = sum(sizing.tp_percentages)
+            if total_tp > 100:
+                raise ValueError(f"Сумма tp_percentages канала {self.name} не может превышать 100%, "
+                                 f"текущая: {total_tp}%")
+
+            if total_tp == 0:
+                raise ValueError(f"Хотя бы один из tp_percentages канала {self.name} должен быть больше 0")
+
+    @property
+    def parse(self) -> Callable[[str | None], Signal | None]:
+        return PARSERS[self.parser]
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ChannelProfile":
+        """Профиль из записи JSON-файла каналов"""
+        tp_percentages = data.get("tp_percentages")
+
+        return cls(
+            name=data.get("name", ""),
+            enabled=data.get("enabled", True),
+            parser=data.get("parser", "pulse"),
+            sizing=SizingProfile(
+                amount=data.get("amount"),
+                max_leverage=data.get("max_leverage"),
+                tp_percentages=tuple(tp_percentages) if tp_percentages else None
+            )
+        )
+
+
+def load_channel_profiles(channels_file: str, channel_names: str) -> list[ChannelProfile]:
+    """Профили из JSON-файла или из списка имён через запятую с настройками по умолчанию"""
+    if channels_file:
+        with open(channels_file, encoding="utf-8") as f:
+            profiles = [ChannelProfile.from_dict(item) for item in json.load(f)]
+    else:
+        profiles = [ChannelProfile(name.strip()) for name in channel_names.split(",") if name.strip()]
+
+    names = [profile.name for profile in profiles]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Каналы указаны несколько раз: {', '.join(sorted(duplicates))}")
+
+    return profiles
@@ -0,0 +1,89 @@
+# signals/parser/history_fetcher.py
+import time
+from pyrogram import Client, raw, utils
+from pyrogram.types import Message
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class HistoryFetcher:
+    """Загрузка только сообщений новее известного id, страницами от старых к новым"""
+
+    PAGE_LIMIT = 100
+
+    def __init__(self, client: Client, channel_name: str, page_limit: int = PAGE_LIMIT):
+        self.client = client
+        self.channel_name = channel_name
+        self.page_limit = page_limit
+        self._peer = None
+
+    async def fetch_after(self, last_id: int, max_messages: int = 0) -> list[Message]:
+        """Сообщения с id больше last_id по возрастанию id, не больше max_messages (0 — без ограничения)"""
+        if self._peer is None:
+            self._peer = await self.client.resolve_peer(self.channel_name)
+
+        messages: list[Message] = []
+
+        while True:
+            # offset_id=last_id+1 с add_offset=-limit даёт окно из limit сообщений сразу после last_id,
+            # min_id отсекает всё, что не новее last_id
+            result = await self.client.invoke(
+                raw.functions.messages.GetHistory(
+                    peer=self._peer,
+                    offset_id=last_id + 1,
+                    offset_date=0,
+                    add_offset=-self.page_limit,
+                    limit=self.page_limit,
+                    max_id=0,
+                    min_id=last_id,
+                    hash=0
+                ),
+                sleep_threshold=60
+            )
+
+            page = await utils.parse_messages(self.client, result, replies=0)
+            page = sorted((message for message in page if message.id > last_id and not message.empty),
+                          key=lambda message: message.id)
+
+            if not page:
+                break
+
+            messages.extend(page)
+            last_id = page[-1].id
+
+            if len(page) < self.page_limit or (max_messages and len(messages) >= max_messages):
+                break
+
+        return messages[:max_messages] if max_messages else messages
+
+
+class AdaptivePollInterval:
+    """Интервал опроса по активности канала: быстро после сигнала, медленнее в тишине"""
+
+    def __init__(self, base: float, fast: float, idle_max: float, hot_period: float = 60, backoff: float = 1.5):
+        self.base = base
+        self.fast = min(fast, base)
+        self.idle_max = max(idle_max, base)
+        self.hot_period = hot_period
+        self.backoff = backoff
+        self.current = base
+        self._hot_until = 0.0
+
+    def observe(self, messages: int, signals: int, backlog: bool = False) -> float:
+        """Интервал до следующего опроса по итогам цикла"""
+        now = time.monotonic()
+
+        if signals:
+            self._hot_until = now + self.hot_period
+
+        if backlog:
+            self.current = 0
+        elif now < self._hot_until:
+            self.current = self.fast
+        elif messages:
+            self.current = self.base
+        else:
+            self.current = min(max(self.current, self.base) * self.backoff, self.idle_max)
+
+        return self.current
@@ -12,6 +12,8 @@ class Signal:
     stop_loss: float
     timestamp: datetime
     raw_message: str
+    channel: str = ""
+    message_id: int = 0
 
     def __post_init__(self):
         if self.direction not in ["Long", "Short"]:
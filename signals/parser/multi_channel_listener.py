@@ -0,0 +1,70 @@
+# signals/parser/multi_channel_listener.py
+import asyncio
+from pyrogram import Client
+from signals.parser.channel_listener import ChannelListener
+from signals.parser.channel_profile import ChannelProfile
+from trading.signal_dispatcher import SignalDispatcher
+from trading.trade_engine import TradeEngine
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class MultiChannelListener:
+    """Прослушивание нескольких каналов одним клиентом Telegram с общим исполнением сигналов"""
+
+    def __init__(self, client: Client, profiles: list[ChannelProfile], dispatcher: SignalDispatcher | None = None,
+                 **listener_options):
+        self.client = client
+        # Внешний диспетчер (RemoteDispatcher) исполняет сигналы в других процессах и своего TradeEngine не имеет
+        self.dispatcher = dispatcher or SignalDispatcher(TradeEngine())
+        self.trade_engine = self.dispatcher.trade_engine
+        self._owns_dispatcher = dispatcher is None
+        self.listeners: dict[str, ChannelListener] = {
+            profile.name: ChannelListener(
+                client=client,
+                channel_name=profile.name,
+                profile=profile,
+                dispatcher=self.dispatcher,
+                **listener_options
+            )
+            for profile in profiles
+        }
+
+    async def start(self) -> None:
+        """Общий старт исполнения и параллельное прослушивание всех каналов"""
+        if not self.listeners:
+            raise ValueError("Не задано ни одного канала")
+
+        enabled = [name for name, listener in self.listeners.items() if listener.profile.enabled]
+        logger.info(f"Каналов: {len(self.listeners)}, включены: {', '.join(enabled) or 'нет'}")
+
+        if self._owns_dispatcher:
+            await self.trade_engine.start()
+
+        results = await asyncio.gather(
+            *(listener.start() for listener in self.listeners.values()),
+            return_exceptions=True
+        )
+
+        for name, result in zip(self.listeners, results):
+            if isinstance(result, Exception):
+                logger.error(f"Прослушивание канала {name} завершилось ошибкой: {result}")
+
+    def set_enabled(self, channel_name: str, enabled: bool) -> None:
+        """Включение или отключение исполнения сигналов канала без остановки прослушивания"""
+        listener = self.listeners.get(channel_name)
+        if listener is None:
+            raise KeyError(f"Канал {channel_name} не найден")
+
+        listener.profile.enabled = enabled
+        logger.info(f"Канал {channel_name} {'включён' if enabled else 'отключён'}")
+
+    async def stop(self) -> None:
+        """Остановка всех каналов и общего исполнения"""
+        for listener in self.listeners.values():
+            await listener.stop()
+
+        if self._owns_dispatcher:
+            await self.dispatcher.close()
+            self.trade_engine.close()
@@ -0,0 +1,97 @@
+# signals/parser/signal_scanner.py
+import re
+from datetime import datetime
+from signals.parser.models import Signal
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SignalScanner:
+    """Классификация и разбор сигнала за один проход: замена MessageFilter + SignalParser.
+
+    Позиции ключевых слов, найденные при классификации, служат стартом для
+    скомпилированных шаблонов полей, поэтому текст не сканируется заново с начала.
+    Результат совпадает с эталонной парой MessageFilter/SignalParser.
+    """
+
+    ENTRY_KEYWORD = "Entry Targets:"
+    TAKE_PROFIT_KEYWORD = "Take-Profit Targets:"
+    STOP_LOSS_KEYWORD = "Stop Targets:"
+    LEVERAGE_KEYWORD = "Leverage:"
+    SIGNAL_INDICATORS = ("🟩", "🟥", "(Long)", "(Short)")
+
+    TICKER_PATTERN = re.compile(r'([A-Z0-9]+/USDT)\s+\((Long|Short)\)')
+    LEVERAGE_PATTERN = re.compile(r'Leverage:.*?\((\d+)X\)')
+    TAKE_PROFIT_PATTERN = re.compile(r'Take-Profit Targets:\s*((?:\d+\)\s*[\d.]+\s*)+)', re.DOTALL)
+    TAKE_PROFIT_VALUE_PATTERN = re.compile(r'\d+\)\s*([\d.]+)')
+    STOP_LOSS_PATTERN = re.compile(r'Stop Targets:\s*([\d.]+)')
+
+    @staticmethod
+    def scan(message_text: str | None) -> Signal | None:
+        """Сигнал из текста сообщения или None, если это не сигнал"""
+        if not message_text:
+            return None
+
+        stop_at = message_text.find(SignalScanner.STOP_LOSS_KEYWORD)
+        if stop_at < 0:
+            return None
+
+        take_profit_at = message_text.find(SignalScanner.TAKE_PROFIT_KEYWORD)
+        if take_profit_at < 0 or SignalScanner.ENTRY_KEYWORD not in message_text:
+            return None
+
+        if not any(indicator in message_text for indicator in SignalScanner.SIGNAL_INDICATORS):
+            return None
+
+        return SignalScanner._extract(message_text, take_profit_at, stop_at)
+
+    @staticmethod
+    def _extract(message_text: str, take_profit_at: int, stop_at: int) -> Signal | None:
+        """Извлечение полей с теми же проверками и предупреждениями, что в SignalParser.parse"""
+        try:
+            ticker_match = SignalScanner.TICKER_PATTERN.search(message_text)
+            if not ticker_match:
+                logger.warning("Не удалось извлечь тикер и направление")
+                return None
+
+            ticker = ticker_match.group(1)
+            direction = ticker_match.group(2)
+
+            leverage_at = message_text.find(SignalScanner.LEVERAGE_KEYWORD)
+            leverage_match = SignalScanner.LEVERAGE_PATTERN.search(message_text, leverage_at) if leverage_at >= 0 else None
+            if not leverage_match:
+                logger.warning(f"Не удалось извлечь плечо для {ticker}")
+                return None
+            leverage = int(leverage_match.group(1))
+
+            tp_match = SignalScanner.TAKE_PROFIT_PATTERN.search(message_text, take_profit_at)
+            if not tp_match:
+                logger.warning(f"Не удалось извлечь take-profit для {ticker}")
+                return None
+
+            take_profits = [float(tp) for tp in SignalScanner.TAKE_PROFIT_VALUE_PATTERN.findall(tp_match.group(1)) if tp]
+
+            if not take_profits:
+                logger.warning(f"Список take-profit пуст для {ticker}")
+                return None
+
+            sl_match = SignalScanner.STOP_LOSS_PATTERN.search(message_text, stop_at)
+            if not sl_match:
+                logger.warning(f"Не удалось извлечь stop-loss для {ticker}")
+                return None
+            stop_loss = float(sl_match.group(1))
+
+            return Signal(
+                ticker=ticker,
+                direction=direction,
+                leverage=leverage,
+                take_profits=take_profits,
+                stop_loss=stop_loss,
+                timestamp=datetime.now(),
+                raw_message=message_text
+            )
+
+        except Exception as e:
+            logger.error(f"Ошибка парсинга сигнала: {e}", exc_info=True)
+            return None
@@ -0,0 +1,156 @@
+# trading/accounts.py
+import json
+import os
+from dataclasses import dataclass
+from trading.bybit_api import BybitAPI
+from trading.config import TradingConfig
+from trading.fill_tracker import FillTracker
+from trading.price_cache import PriceCache
+from trading.position_store import PositionStore
+from trading.private_stream import PrivateStream
+from trading.wallet_state import WalletState
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class AccountConfig:
+    """Ключи и размер позиции одного аккаунта (суб-аккаунта) Bybit"""
+
+    name: str
+    api_key: str
+    api_secret: str
+    balance: float
+    amount: float
+    max_leverage: int | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AccountConfig":
+        """Аккаунт из записи JSON; ключи можно передать через переменные окружения *_env"""
+        api_key = data.get("api_key") or os.getenv(data.get("api_key_env", ""), "")
+        api_secret = data.get("api_secret") or os.getenv(data.get("api_secret_env", ""), "")
+        name = data.get("name", "")
+
+        if not name or not api_key or not api_secret:
+            raise ValueError(f"У аккаунта {name or '<без имени>'} не заданы name, api_key или api_secret")
+
+        return cls(
+            name=name,
+            api_key=api_key,
+            api_secret=api_secret,
+            balance=float(data.get("balance", TradingConfig.BALANCE)),
+            amount=float(data.get("amount", TradingConfig.AMOUNT)),
+            max_leverage=data.get("max_leverage")
+        )
+
+
+def load_accounts(accounts_file: str = "") -> list[AccountConfig]:
+    """Аккаунты из JSON-файла или единственный аккаунт из TradingConfig"""
+    if not accounts_file:
+        return [AccountConfig(
+            name="main",
+            api_key=TradingConfig.BYBIT_API_KEY,
+            api_secret=TradingConfig.BYBIT_API_SECRET,
+            balance=TradingConfig.BALANCE,
+            amount=TradingConfig.AMOUNT
+        )]
+
+    with open(accounts_file, encoding="utf-8") as f:
+        accounts = [AccountConfig.from_dict(item) for item in json.load(f)]
+
+    names = [account.name for account in accounts]
+    if not accounts or len(set(names)) != len(names):
+        raise ValueError(f"Список аккаунтов пуст или содержит повторы: {names}")
+
+    return accounts
+
+
+class Account:
+    """Аккаунт с собственным HTTP-пулом, кэшем плеча, балансом, позициями и приватным потоком"""
+
+    def __init__(self, config: AccountConfig, api: BybitAPI):
+        self.config = config
+        self.name = config.name
+        self.api = api
+        self.private_stream = PrivateStream(
+            TradingConfig.BYBIT_WS_PRIVATE_URL,
+            config.api_key,
+            config.api_secret
+        ) if TradingConfig.FILL_DRIVEN_TP or TradingConfig.WALLET_STREAM or TradingConfig.POSITION_STREAM else None
+        self.fills = FillTracker(self.private_stream) if TradingConfig.FILL_DRIVEN_TP else None
+        self.positions = PositionStore(
+            api.client,
+            self.private_stream
+        ) if TradingConfig.POSITION_STREAM else None
+        self.wallet = WalletState(
+            api.client,
+            self.private_stream,
+            config.balance,
+            TradingConfig.WALLET_BALANCE_FIELD,
+            TradingConfig.WALLET_MAX_AGE
+        ) if TradingConfig.WALLET_STREAM else None
+
+        # Плечо следит за потоком position при любом приватном потоке, а не только при POSITION_STREAM
+        if self.private_stream:
+            api.leverage.subscribe(self.private_stream)
+
+    def balance(self) -> float:
+        """Баланс для расчёта маржи: из потока wallet или настроенный"""
+        return self.wallet.value() if self.wallet else self.config.balance
+
+    def leverage(self, leverage: int) -> int:
+        """Плечо с учётом ограничения аккаунта"""
+        return min(leverage, self.config.max_leverage) if self.config.max_leverage else leverage
+
+
+class AccountRegistry:
+    """Аккаунты исполнения; публичные данные (инструменты, цены) общие для всех"""
+
+    def __init__(self, configs: list[AccountConfig], prices: PriceCache | None = None):
+        primary = BybitAPI(prices=prices, api_key=configs[0].api_key, api_secret=configs[0].api_secret,
+                           account=configs[0].name)
+        self.instruments = primary.instruments
+        self.accounts = [Account(configs[0], primary)] + [
+            Account(config, BybitAPI(
+                instruments=self.instruments,
+                prices=prices,
+                api_key=config.api_key,
+                api_secret=config.api_secret,
+                account=config.name
+            ))
+            for config in configs[1:]
+        ]
+
+    @property
+    def primary(self) -> Account:
+        return self.accounts[0]
+
+    def __iter__(self):
+        return iter(self.accounts)
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    def startup_steps(self) -> list:
+        """Блокирующие шаги запуска: общий каталог и данные каждого аккаунта"""
+        steps = [self.instruments.start]
+        for account in self.accounts:
+            steps += [account.api.start, account.api.leverage.load, account.api.orders.start]
+            if account.private_stream:
+                steps.append(account.private_stream.start)
+            if account.wallet:
+                steps.append(account.wallet.start)
+            if account.positions:
+                steps.append(account.positions.load)
+        return steps
+
+    def close(self) -> None:
+        self.instruments.stop()
+        for account in self.accounts:
+            account.api.orders.stop()
+            account.api.stop()
+            if account.wallet:
+                account.wallet.stop()
+            if account.private_stream:
+                account.private_stream.stop()
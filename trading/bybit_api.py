@@ -1,49 +1,110 @@
 # trading/bybit_api.py
 from decimal import Decimal, ROUND_DOWN
+from typing import Any
+from pybit.exceptions import InvalidRequestError
 from pybit.unified_trading import HTTP
+from trading.bybit_rest import BybitRestClient
 from trading.config import TradingConfig
+from trading.hedged_transport import HedgedOrderTransport
+from trading.instrument_catalog import InstrumentCatalog
+from trading.leverage_store import LeverageStore
+from trading.order_transport import RestOrderTransport, WebSocketOrderTransport
+from trading.paper import embedded_url
+from trading.price_cache import PriceCache
+from trading.rate_limiter import RateLimitedClient, RateLimitScheduler
+from trading.sizing import SizingScale
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+LEVERAGE_NOT_MODIFIED = 110043
+
 
 class BybitAPI:
-    def __init__(self):
-        self.client = HTTP(
-            api_key=TradingConfig.BYBIT_API_KEY,
-            api_secret=TradingConfig.BYBIT_API_SECRET,
-            testnet=False,
-            timeout=10_000
-        )
+    def __init__(self, instruments: InstrumentCatalog | None = None, prices: PriceCache | None = None,
+                 api_key: str | None = None, api_secret: str | None = None, account: str = "main"):
+        self.api_key = api_key or TradingConfig.BYBIT_API_KEY
+        self.api_secret = api_secret or TradingConfig.BYBIT_API_SECRET
+        self.account = account
+        self.client = self.rest = self._create_rest_client()
+        if TradingConfig.TRADING_MODE == "paper":
+            self.client.endpoint = TradingConfig.PAPER_URL or embedded_url(
+                TradingConfig.PAPER_INSTRUMENTS_FILE, TradingConfig.PAPER_LATENCY_MS, TradingConfig.PAPER_ERROR_RATE
+            )
+        if TradingConfig.RATE_LIMIT:
+            self.client = RateLimitedClient(self.client, RateLimitScheduler(account))
+        self.instruments = instruments or InstrumentCatalog(self.client, TradingConfig.INSTRUMENTS_TTL)
+        self.leverage = LeverageStore(self.client, TradingConfig.LEVERAGE_TTL)
+        self.prices = prices
+        self.orders = self._create_order_transport()
+
+    def _create_rest_client(self) -> BybitRestClient | HTTP:
+        """HTTP-клиент по настройке REST_CLIENT"""
+        testnet = TradingConfig.TRADING_MODE == "testnet"
+        if TradingConfig.REST_CLIENT == "lean":
+            return BybitRestClient(
+                self.api_key,
+                self.api_secret,
+                testnet=testnet,
+                timeout=10,
+                pool_size=TradingConfig.REST_POOL_SIZE,
+                keepalive_interval=TradingConfig.REST_KEEPALIVE_INTERVAL
+            )
 
-    def check_symbol_trading(self, symbol: str) -> bool:
-        """Проверка доступности символа для торговли"""
-        try:
-            resp = self.client.get_instruments_info(category="linear", symbol=symbol)
+        # Таймаут pybit задаётся в секундах
+        return HTTP(api_key=self.api_key, api_secret=self.api_secret, testnet=testnet, timeout=10)
+
+    def start(self) -> None:
+        """Прогрев пула соединений до первого запроса"""
+        if isinstance(self.rest, BybitRestClient):
+            self.rest.start()
+
+    def stop(self) -> None:
+        if isinstance(self.rest, BybitRestClient):
+            self.rest.stop()
+
+    def _create_order_transport(self) -> RestOrderTransport | WebSocketOrderTransport | HedgedOrderTransport:
+        """Транспорт ордеров по настройкам ORDER_TRANSPORT и ORDER_HEDGE"""
+        transport = rest = RestOrderTransport(self.client)
+
+        if TradingConfig.ORDER_TRANSPORT == "websocket":
+            transport = WebSocketOrderTransport(
+                url=TradingConfig.BYBIT_WS_TRADE_URL,
+                api_key=self.api_key,
+                api_secret=self.api_secret,
+                fallback=rest,
+                ack_timeout=TradingConfig.ORDER_ACK_TIMEOUT
+            )
 
-            if not isinstance(resp, dict) or resp.get("retCode") != 0:
-                logger.error(f"Ошибка проверки символа {symbol}: {resp}")
-                return False
+        if TradingConfig.ORDER_HEDGE:
+            return HedgedOrderTransport(
+                transport,
+                self.client,
+                account=self.account,
+                quantile=TradingConfig.ORDER_HEDGE_QUANTILE,
+                min_delay_ms=TradingConfig.ORDER_HEDGE_MIN_MS,
+                initial_delay_ms=TradingConfig.ORDER_HEDGE_INITIAL_MS
+            )
 
-            instruments = resp.get("result", {}).get("list", [])
-            if not instruments:
-                logger.warning(f"Символ {symbol} не найден")
-                return False
+        return transport
 
-            status = instruments[0].get("status", "Unknown")
+    def check_symbol_trading(self, symbol: str) -> bool:
+        """Проверка доступности символа для торговли"""
+        instrument = self.instruments.get(symbol)
+        if instrument is None:
+            return False
 
-            if status == "Trading":
-                return True
-            else:
-                logger.warning(f"Символ {symbol} недоступен, статус: {status}")
-                return False
+        if instrument.is_trading:
+            return True
 
-        except Exception as e:
-            logger.error(f"Ошибка проверки символа {symbol}: {e}", exc_info=True)
-            return False
+        logger.warning(f"Символ {symbol} недоступен, статус: {instrument.status}")
+        return False
 
     def set_leverage(self, symbol: str, leverage: int) -> bool:
         """Установка плеча для символа"""
+        if self.leverage.get(symbol) == leverage:
+            return True
+
         try:
             resp = self.client.set_leverage(
                 category="linear",
@@ -54,19 +115,33 @@ class BybitAPI:
 
             if not isinstance(resp, dict) or resp.get("retCode") != 0:
                 logger.error(f"Ошибка установки плеча {leverage}x для {symbol}: {resp}")
+                self.leverage.invalidate(symbol)
                 return False
 
+            self.leverage.set(symbol, leverage)
             return True
 
         except Exception as e:
-            error_str = str(e)
-            if "110043" in error_str:
+            # 110043: плечо уже установлено
+            if isinstance(e, InvalidRequestError) and e.status_code == LEVERAGE_NOT_MODIFIED:
+                self.leverage.set(symbol, leverage)
                 return True
             logger.error(f"Ошибка установки плеча для {symbol}: {e}", exc_info=True)
+            self.leverage.invalidate(symbol)
             return False
 
     def get_last_price(self, symbol: str) -> float | None:
         """Получение последней цены символа"""
+        if self.prices:
+            last_price = self.prices.get_last_price(symbol)
+            if last_price:
+                return last_price
+            self.prices.watch(symbol)
+
+        return self._fetch_last_price(symbol)
+
+    def _fetch_last_price(self, symbol: str) -> float | None:
+        """Получение последней цены символа через REST"""
         try:
             resp = self.client.get_tickers(category="linear", symbol=symbol)
 
@@ -88,33 +163,24 @@ class BybitAPI:
 
     def get_symbol_filters(self, symbol: str) -> dict[str, str] | None:
         """Получение фильтров символа"""
-        try:
-            resp = self.client.get_instruments_info(category="linear", symbol=symbol)
-
-            if not isinstance(resp, dict) or resp.get("retCode") != 0:
-                logger.error(f"Ошибка получения фильтров {symbol}: {resp}")
-                return None
-
-            instruments = resp.get("result", {}).get("list", [])
-            if not instruments:
-                logger.error(f"Инструмент {symbol} не найден")
-                return None
-
-            inst = instruments[0]
-            lot = inst.get("lotSizeFilter", {})
-            price = inst.get("priceFilter", {})
+        instrument = self.instruments.get(symbol)
+        if instrument is None:
+            logger.error(f"Инструмент {symbol} не найден")
+            return None
 
-            filters = {
-                "qty_step": lot.get("qtyStep", ""),
-                "min_qty": lot.get("minOrderQty", ""),
-                "max_qty": lot.get("maxOrderQty", ""),
-                "tick_size": price.get("tickSize", "")
-            }
+        return instrument.filters
 
-            return filters
+    def get_sizing_scale(self, symbol: str) -> SizingScale | None:
+        """Получение целочисленных шкал объёма и цены символа"""
+        instrument = self.instruments.get(symbol)
+        if instrument is None:
+            logger.error(f"Инструмент {symbol} не найден")
+            return None
 
+        try:
+            return instrument.scale
         except Exception as e:
-            logger.error(f"Ошибка получения фильтров {symbol}: {e}", exc_info=True)
+            logger.error(f"Некорректные фильтры {symbol}: {instrument.filters} ({e})")
             return None
 
     @staticmethod
@@ -141,7 +207,8 @@ class BybitAPI:
             logger.error(f"Ошибка округления цены {price}: {e}", exc_info=True)
             return 0.0
 
-    def place_market_order(self, symbol: str, side: str, qty: float, stop_loss: float) -> str | None:
+    def place_market_order(self, symbol: str, side: str, qty: str, stop_loss: str,
+                           order_link_id: str = "") -> str | None:
         """Открытие рыночной позиции с Stop Loss"""
         try:
             params = {
@@ -149,14 +216,17 @@ class BybitAPI:
                 "symbol": symbol,
                 "side": side,
                 "orderType": "Market",
-                "qty": str(qty),
-                "stopLoss": str(stop_loss),
+                "qty": qty,
+                "stopLoss": stop_loss,
                 "slTriggerBy": "MarkPrice",
                 "tpslMode": "Full",
                 "slOrderType": "Market"
             }
 
-            resp = self.client.place_order(**params)
+            if order_link_id:
+                params["orderLinkId"] = order_link_id
+
+            resp = self.orders.create_order(params)
 
             if not isinstance(resp, dict) or resp.get("retCode") != 0:
                 logger.error(f"Ошибка открытия позиции {symbol}: {resp}")
@@ -172,7 +242,45 @@ class BybitAPI:
             logger.error(f"Ошибка открытия позиции {symbol}: {e}", exc_info=True)
             return None
 
-    def place_batch_limit_orders(self, symbol: str, side: str, orders: list[dict[str, float]]) -> bool:
+    def close_position(self, symbol: str, side: str, qty: str) -> bool:
+        """Закрытие позиции рыночным reduce-only ордером"""
+        try:
+            resp = self.orders.create_order({
+                "category": "linear",
+                "symbol": symbol,
+                "side": "Sell" if side == "Buy" else "Buy",
+                "orderType": "Market",
+                "qty": qty,
+                "reduceOnly": True
+            })
+
+            if not isinstance(resp, dict) or resp.get("retCode") != 0:
+                logger.error(f"Ошибка закрытия позиции {symbol}: {resp}")
+                return False
+
+            logger.info(f"Позиция по {symbol} закрыта: qty={qty}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Ошибка закрытия позиции {symbol}: {e}", exc_info=True)
+            return False
+
+    def cancel_orders(self, symbol: str) -> bool:
+        """Отмена всех активных ордеров символа"""
+        try:
+            resp = self.client.cancel_all_orders(category="linear", symbol=symbol)
+
+            if not isinstance(resp, dict) or resp.get("retCode") != 0:
+                logger.error(f"Ошибка отмены ордеров {symbol}: {resp}")
+                return False
+
+            return True
+
+        except Exception as e:
+            logger.error(f"Ошибка отмены ордеров {symbol}: {e}", exc_info=True)
+            return False
+
+    def place_batch_limit_orders(self, symbol: str, side: str, orders: list[dict[str, Any]]) -> bool:
         """Выставление батча лимитных reduce-only ордеров для TP"""
         try:
             if not orders:
@@ -186,13 +294,15 @@ class BybitAPI:
                     "symbol": symbol,
                     "side": side,
                     "orderType": "Limit",
-                    "price": str(order["price"]),
-                    "qty": str(order["qty"]),
+                    "price": order["price"],
+                    "qty": order["qty"],
                     "timeInForce": "GTC",
                     "reduceOnly": True
                 })
+                if order.get("link_id"):
+                    request[-1]["orderLinkId"] = order["link_id"]
 
-            resp = self.client.place_batch_order(category="linear", request=request)
+            resp = self.orders.create_batch(request)
 
             if not isinstance(resp, dict) or resp.get("retCode") != 0:
                 logger.error(f"Ошибка батч-выставления TP для {symbol}: {resp}")
@@ -0,0 +1,368 @@
+# trading/bybit_rest.py
+import hashlib
+import hmac
+import http.client
+import json
+import select
+import socket
+import ssl
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.message import Message
+from typing import Any
+from urllib.parse import urlsplit
+from pybit.exceptions import FailedRequestError, InvalidRequestError
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MAINNET_URL = "https://api.bybit.com"
+TESTNET_URL = "https://api-testnet.bybit.com"
+PING_PATH = "/v5/market/time"
+RECV_WINDOW_STEP = 2500
+RATE_LIMIT_CODE = 10006
+RECV_WINDOW_CODE = 10002
+
+
+@dataclass(frozen=True)
+class Route:
+    """Эндпоинт: метод, путь и признак подписи"""
+
+    method: str
+    path: str
+    auth: bool
+
+
+ROUTES = {
+    "get_server_time": Route("GET", PING_PATH, False),
+    "get_instruments_info": Route("GET", "/v5/market/instruments-info", False),
+    "get_tickers": Route("GET", "/v5/market/tickers", False),
+    "get_positions": Route("GET", "/v5/position/list", True),
+    "get_open_orders": Route("GET", "/v5/order/realtime", True),
+    "get_order_history": Route("GET", "/v5/order/history", True),
+    "get_wallet_balance": Route("GET", "/v5/account/wallet-balance", True),
+    "set_leverage": Route("POST", "/v5/position/set-leverage", True),
+    "place_order": Route("POST", "/v5/order/create", True),
+    "place_batch_order": Route("POST", "/v5/order/create-batch", True),
+    "cancel_all_orders": Route("POST", "/v5/order/cancel-all", True),
+}
+
+_encode_json = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%H:%M:%S")
+
+
+class _Connection:
+    """Keep-alive соединение с биржей: запрос пишется в сокет готовыми байтами"""
+
+    def __init__(self, host: str, port: int, tls: ssl.SSLContext | None, timeout: float, generation: int):
+        sock = socket.create_connection((host, port), timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock = tls.wrap_socket(sock, server_hostname=host) if tls else sock
+        self.generation = generation
+        self.used_at = time.monotonic()
+
+    def dropped(self) -> bool:
+        """Сервер закрыл простаивающее соединение: без запроса в сокете есть данные или EOF"""
+        try:
+            readable, _, _ = select.select([self.sock], [], [], 0)
+        except (OSError, ValueError):
+            return True
+        return bool(readable)
+
+    def send(self, data: bytes) -> None:
+        self.sock.sendall(data)
+
+    def receive(self) -> tuple[int, bytes, Message, bool]:
+        response = http.client.HTTPResponse(self.sock)
+        response.begin()
+        body = response.read()
+        return response.status, body, response.headers, response.will_close
+
+    def close(self) -> None:
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class BybitRestClient:
+    """Клиент REST API Bybit v5 только для эндпоинтов бота, совместимый с вызовами pybit HTTP.
+
+    Соединения держатся в пуле keep-alive: пул прогревается в start() и проверяется запросом
+    времени сервера, пока простаивает, поэтому первый ордер после паузы не открывает TLS.
+    Заголовки каждого эндпоинта собраны заранее, ключ HMAC разобран один раз, ответ разбирается
+    из байтов без промежуточных объектов requests. Ошибки те же, что у pybit: InvalidRequestError
+    с retCode и FailedRequestError для HTTP-статусов, поэтому лимитер и дубли ордеров не меняются.
+    """
+
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = False, timeout: float = 10,
+                 recv_window: int = 5000, pool_size: int = 4, keepalive_interval: float = 20,
+                 max_retries: int = 3):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.timeout = timeout
+        self.recv_window = recv_window
+        self.pool_size = pool_size
+        self.keepalive_interval = keepalive_interval
+        self.max_retries = max_retries
+        # Атрибуты pybit HTTP, которые настраивает RateLimitedClient
+        self.return_response_headers = False
+        self.retry_codes = {RECV_WINDOW_CODE, RATE_LIMIT_CODE}
+        self.connections_opened = 0
+        self.stale_retries = 0
+
+        self._signer = hmac.new(api_secret.encode(), digestmod=hashlib.sha256)
+        self._idle: deque[_Connection] = deque()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stop = threading.Event()
+        self._keepalive: threading.Thread | None = None
+        self.endpoint = TESTNET_URL if testnet else MAINNET_URL
+
+    @property
+    def endpoint(self) -> str:
+        return self._endpoint
+
+    @endpoint.setter
+    def endpoint(self, url: str) -> None:
+        """Смена адреса биржи: соединения пула со старым адресом закрываются"""
+        parts = urlsplit(url)
+        self._endpoint = url.rstrip("/")
+        self._host = parts.hostname
+        self._port = parts.port or (443 if parts.scheme == "https" else 80)
+        self._tls = ssl.create_default_context() if parts.scheme == "https" else None
+        host = self._host if parts.port is None else f"{self._host}:{self._port}"
+
+        common = f"Host: {host}\r\nAccept: application/json\r\nConnection: keep-alive\r\n"
+        signed = f"X-BAPI-API-KEY: {self.api_key}\r\nX-BAPI-SIGN-TYPE: 2\r\n"
+        self._heads = {
+            name: (
+                f"{route.method} {route.path}".encode(),
+                (common + (signed if route.auth else "")
+                 + ("Content-Type: application/json\r\n" if route.method == "POST" else "")).encode()
+            )
+            for name, route in ROUTES.items()
+        }
+
+        with self._lock:
+            self._generation += 1
+            idle, self._idle = self._idle, deque()
+        for connection in idle:
+            connection.close()
+
+    def start(self) -> None:
+        """Прогрев пула и запуск проверки простаивающих соединений"""
+        self.warm()
+        if self.keepalive_interval and self._keepalive is None:
+            self._stop.clear()
+            self._keepalive = threading.Thread(target=self._keepalive_loop, name="bybit-keepalive", daemon=True)
+            self._keepalive.start()
+        logger.info(f"Пул соединений {self._host}: {len(self._idle)} из {self.pool_size}")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._keepalive:
+            self._keepalive.join(timeout=self.timeout)
+            self._keepalive = None
+
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for connection in idle:
+            connection.close()
+
+    def warm(self) -> None:
+        """Открытие соединений до размера пула; каждое проверяется запросом времени сервера"""
+        missing = self.pool_size - len(self._idle)
+        if missing <= 0:
+            return
+
+        with ThreadPoolExecutor(max_workers=missing) as pool:
+            for connection in pool.map(lambda _: self._open_checked(), range(missing)):
+                if connection:
+                    self._release(connection, will_close=False)
+
+    def _open_checked(self) -> _Connection | None:
+        try:
+            connection = self._connect()
+            if self._ping(connection):
+                return connection
+        except OSError as e:
+            logger.warning(f"Не удалось открыть соединение с {self._host}: {e}")
+        return None
+
+    def _ping(self, connection: _Connection) -> bool:
+        prefix, head = self._heads["get_server_time"]
+        try:
+            connection.send(prefix + b" HTTP/1.1\r\n" + head + b"\r\n")
+            status, _, _, will_close = connection.receive()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            return False
+
+        if status != 200 or will_close:
+            connection.close()
+            return False
+        return True
+
+    def _keepalive_loop(self) -> None:
+        """Запрос по соединениям без трафика дольше keepalive_interval и восполнение пула"""
+        while not self._stop.wait(self.keepalive_interval / 2):
+            deadline = time.monotonic() - self.keepalive_interval
+            with self._lock:
+                stale = [connection for connection in self._idle if connection.used_at < deadline]
+                for connection in stale:
+                    self._idle.remove(connection)
+
+            for connection in stale:
+                if self._ping(connection):
+                    self._release(connection, will_close=False)
+
+            if len(self._idle) < self.pool_size:
+                self.warm()
+
+    def _connect(self) -> _Connection:
+        connection = _Connection(self._host, self._port, self._tls, self.timeout, self._generation)
+        self.connections_opened += 1
+        return connection
+
+    def _acquire(self) -> tuple[_Connection, bool]:
+        """Последнее использованное соединение пула (самое тёплое) или новое"""
+        with self._lock:
+            while self._idle:
+                connection = self._idle.pop()
+                if not connection.dropped():
+                    return connection, True
+                connection.close()
+        return self._connect(), False
+
+    def _release(self, connection: _Connection, will_close: bool) -> None:
+        connection.used_at = time.monotonic()
+        with self._lock:
+            if not will_close and connection.generation == self._generation and len(self._idle) < self.pool_size:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def _exchange(self, route: Route, data: bytes) -> tuple[int, bytes, Message]:
+        """Запрос через пул; соединение, закрытое сервером до ответа, заменяется новым один раз"""
+        connection, reused = self._acquire()
+        sent = False
+        try:
+            connection.send(data)
+            sent = True
+            status, body, headers, will_close = connection.receive()
+        except (OSError, http.client.HTTPException) as e:
+            connection.close()
+            # Неотправленный запрос повторять безопасно всегда, оборванный ответ — только для GET
+            stale = not sent or (route.method == "GET" and isinstance(e, ConnectionError))
+            if not reused or not stale or isinstance(e, TimeoutError):
+                raise
+
+            self.stale_retries += 1
+            connection = self._connect()
+            try:
+                connection.send(data)
+                status, body, headers, will_close = connection.receive()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                raise
+
+        self._release(connection, will_close)
+        return status, body, headers
+
+    def _build(self, name: str, route: Route, payload: str, recv_window: int) -> bytes:
+        prefix, head = self._heads[name]
+        if route.method == "GET" and payload:
+            prefix += b"?" + payload.encode()
+        request = prefix + b" HTTP/1.1\r\n" + head
+
+        if route.auth:
+            timestamp = int(time.time() * 1000)
+            signer = self._signer.copy()
+            signer.update(f"{timestamp}{self.api_key}{recv_window}{payload}".encode())
+            request += (f"X-BAPI-TIMESTAMP: {timestamp}\r\nX-BAPI-RECV-WINDOW: {recv_window}\r\n"
+                        f"X-BAPI-SIGN: {signer.hexdigest()}\r\n").encode()
+
+        if route.method == "POST":
+            body = payload.encode()
+            return request + b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+        return request + b"\r\n"
+
+    def _request(self, name: str, params: dict[str, Any]) -> Any:
+        route = ROUTES[name]
+        params = {key: value for key, value in params.items() if value is not None}
+        if route.method == "GET":
+            payload = "&".join(f"{key}={value}" for key, value in sorted(params.items()))
+        else:
+            payload = _encode_json(params)
+
+        recv_window = self.recv_window
+        for attempt in range(1, self.max_retries + 1):
+            started = time.perf_counter()
+            status, body, headers = self._exchange(route, self._build(name, route, payload, recv_window))
+            elapsed = timedelta(seconds=time.perf_counter() - started)
+            request = f"{route.method} {self._endpoint}{route.path}: {payload}"
+
+            if status != 200:
+                message = "You have breached the IP rate limit or your IP is from the USA." if status == 403 \
+                    else "HTTP status code is not 200."
+                raise FailedRequestError(request, message, status, _now(), headers)
+
+            try:
+                response = json.loads(body)
+            except ValueError:
+                raise FailedRequestError(request, "Conflict. Could not decode JSON.", 409, _now(), headers)
+
+            code = response.get("retCode")
+            if not code:
+                return (response, elapsed, headers) if self.return_response_headers else response
+
+            if code not in self.retry_codes or attempt == self.max_retries:
+                raise InvalidRequestError(request, response.get("retMsg", ""), code, _now(), headers)
+
+            if code == RECV_WINDOW_CODE:
+                recv_window += RECV_WINDOW_STEP
+            elif code == RATE_LIMIT_CODE:
+                reset_at = int(headers.get("X-Bapi-Limit-Reset-Timestamp", 0)) / 1000
+                time.sleep(min(max(reset_at - time.time(), 0.1), 5))
+            logger.warning(f"{route.path}: {response.get('retMsg')} (ErrCode: {code}), повтор {attempt}")
+
+    def get_server_time(self, **params: Any) -> Any:
+        return self._request("get_server_time", params)
+
+    def get_instruments_info(self, **params: Any) -> Any:
+        return self._request("get_instruments_info", params)
+
+    def get_tickers(self, **params: Any) -> Any:
+        return self._request("get_tickers", params)
+
+    def get_positions(self, **params: Any) -> Any:
+        return self._request("get_positions", params)
+
+    def get_open_orders(self, **params: Any) -> Any:
+        return self._request("get_open_orders", params)
+
+    def get_order_history(self, **params: Any) -> Any:
+        return self._request("get_order_history", params)
+
+    def get_wallet_balance(self, **params: Any) -> Any:
+        return self._request("get_wallet_balance", params)
+
+    def set_leverage(self, **params: Any) -> Any:
+        return self._request("set_leverage", params)
+
+    def place_order(self, **params: Any) -> Any:
+        return self._request("place_order", params)
+
+    def place_batch_order(self, **params: Any) -> Any:
+        return self._request("place_batch_order", params)
+
+    def cancel_all_orders(self, **params: Any) -> Any:
+        return self._request("cancel_all_orders", params)
@@ -9,10 +9,72 @@ load_dotenv()
 
 
 class TradingConfig:
+    TRADING_MODE: str = os.getenv("TRADING_MODE", "live").lower()
+    PAPER_URL: str = os.getenv("PAPER_URL", "")
+    PAPER_INSTRUMENTS_FILE: str = os.getenv("PAPER_INSTRUMENTS_FILE", "")
+    PAPER_LATENCY_MS: float = float(os.getenv("PAPER_LATENCY_MS", "0"))
+    PAPER_ERROR_RATE: float = float(os.getenv("PAPER_ERROR_RATE", "0"))
+    # Симулятор реализует только REST: потоки WebSocket в режиме paper по умолчанию выключены
+    _WS_DEFAULT: str = "false" if TRADING_MODE == "paper" else "true"
+    _WS_HOST: str = "stream-testnet.bybit.com" if TRADING_MODE == "testnet" else "stream.bybit.com"
+
     BYBIT_API_KEY: str = os.getenv("BYBIT_API_KEY", "")
     BYBIT_API_SECRET: str = os.getenv("BYBIT_API_SECRET", "")
+    ACCOUNTS_FILE: str = os.getenv("ACCOUNTS_FILE", "")
     AMOUNT: float = float(os.getenv("AMOUNT", "0"))
     BALANCE: float = float(os.getenv("BALANCE", "0"))
+    EXECUTOR_WORKERS: int = int(os.getenv("EXECUTOR_WORKERS", "8"))
+    INSTRUMENTS_TTL: float = float(os.getenv("INSTRUMENTS_TTL", "600"))
+    # С приватным потоком (FILL_DRIVEN_TP, WALLET_STREAM или POSITION_STREAM) плечо обновляется по топику position
+    # сразу, и TTL лишь страховка от пропуска сообщения. Без потока плечо, изменённое вне бота, замечается только
+    # по истечении TTL или по ошибке set-leverage, поэтому в таком режиме стоит задать TTL порядка минуты
+    LEVERAGE_TTL: float = float(os.getenv("LEVERAGE_TTL", "300"))
+
+    BYBIT_WS_PUBLIC_URL: str = os.getenv("BYBIT_WS_PUBLIC_URL", f"wss://{_WS_HOST}/v5/public/linear")
+    PRICE_STREAM: bool = os.getenv("PRICE_STREAM", _WS_DEFAULT).lower() == "true"
+    PRICE_MAX_AGE: float = float(os.getenv("PRICE_MAX_AGE", "5"))
+    PRICE_STREAM_SYMBOLS: list[str] = [
+        symbol.strip() for symbol in os.getenv("PRICE_STREAM_SYMBOLS", "").split(",") if symbol.strip()
+    ]
+
+    # lean — собственный клиент REST с пулом keep-alive соединений, pybit — HTTP-сессия pybit
+    REST_CLIENT: str = os.getenv("REST_CLIENT", "lean").lower()
+    REST_POOL_SIZE: int = int(os.getenv("REST_POOL_SIZE", "4"))
+    REST_KEEPALIVE_INTERVAL: float = float(os.getenv("REST_KEEPALIVE_INTERVAL", "20"))
+
+    ORDER_TRANSPORT: str = os.getenv("ORDER_TRANSPORT", "rest")
+    BYBIT_WS_TRADE_URL: str = os.getenv("BYBIT_WS_TRADE_URL", f"wss://{_WS_HOST}/v5/trade")
+    ORDER_ACK_TIMEOUT: float = float(os.getenv("ORDER_ACK_TIMEOUT", "5"))
+    # Дубль ордера с тем же orderLinkId, если ответ дольше перцентиля ORDER_HEDGE_QUANTILE.
+    # Выключено по умолчанию: каждый медленный вход уходит на биржу дважды, от исполнения
+    # дважды защищает только проверка orderLinkId на стороне биржи
+    ORDER_HEDGE: bool = os.getenv("ORDER_HEDGE", "false").lower() == "true"
+    ORDER_HEDGE_QUANTILE: float = float(os.getenv("ORDER_HEDGE_QUANTILE", "0.95"))
+    ORDER_HEDGE_MIN_MS: float = float(os.getenv("ORDER_HEDGE_MIN_MS", "20"))
+    ORDER_HEDGE_INITIAL_MS: float = float(os.getenv("ORDER_HEDGE_INITIAL_MS", "500"))
+
+    BYBIT_WS_PRIVATE_URL: str = os.getenv("BYBIT_WS_PRIVATE_URL", f"wss://{_WS_HOST}/v5/private")
+    FILL_DRIVEN_TP: bool = os.getenv("FILL_DRIVEN_TP", _WS_DEFAULT).lower() == "true"
+    FILL_TIMEOUT: float = float(os.getenv("FILL_TIMEOUT", "3"))
+    # Размер позиции от баланса из потока wallet вместо BALANCE; BALANCE остаётся запасным значением
+    WALLET_STREAM: bool = os.getenv("WALLET_STREAM", "false").lower() == "true"
+    WALLET_BALANCE_FIELD: str = os.getenv("WALLET_BALANCE_FIELD", "totalEquity")
+    WALLET_MAX_AGE: float = float(os.getenv("WALLET_MAX_AGE", "60"))
+    POSITION_STREAM: bool = os.getenv("POSITION_STREAM", _WS_DEFAULT).lower() == "true"
+    # Повторный сигнал по символу с открытой позицией: skip, scale (добавить в ту же сторону) или flip (развернуть)
+    DUPLICATE_POLICY: str = os.getenv("DUPLICATE_POLICY", "skip").lower()
+
+    # multiprocess: listener и исполнение в разных процессах, сигналы через кольцо в разделяемой памяти
+    EXECUTION_MODE: str = os.getenv("EXECUTION_MODE", "single").lower()
+    EXECUTOR_PROCESSES: int = int(os.getenv("EXECUTOR_PROCESSES", "1"))
+    IPC_TRANSPORT: str = os.getenv("IPC_TRANSPORT", "shm").lower()
+    IPC_RING_SIZE: int = int(os.getenv("IPC_RING_SIZE", str(1 << 20)))
+    EXECUTOR_HEARTBEAT_TIMEOUT: float = float(os.getenv("EXECUTOR_HEARTBEAT_TIMEOUT", "5"))
+
+    RATE_LIMIT: bool = os.getenv("RATE_LIMIT", "true").lower() == "true"
+    # Ведро с ёмкостью в секунду пополнения за окно 5 с отдаёт до 6 × rate: 100/с укладывается в 600 запросов IP
+    RATE_LIMIT_IP_PER_SECOND: float = float(os.getenv("RATE_LIMIT_IP_PER_SECOND", "100"))
+    RATE_LIMIT_MARKET_RESERVE: float = float(os.getenv("RATE_LIMIT_MARKET_RESERVE", "0.2"))
 
     TP1: float = float(os.getenv("TP1", ""))
     TP2: float = float(os.getenv("TP2", ""))
@@ -31,7 +93,26 @@ class TradingConfig:
     @classmethod
     def validate(cls) -> None:
         """Валидация обязательных параметров"""
-        if not cls.BYBIT_API_KEY or not cls.BYBIT_API_SECRET:
+        if cls.TRADING_MODE not in ("live", "testnet", "paper"):
+            logger.error(f"Неверный TRADING_MODE: {cls.TRADING_MODE}")
+            raise ValueError("TRADING_MODE должен быть 'live', 'testnet' или 'paper'")
+
+        if cls.TRADING_MODE == "paper" and (cls.PRICE_STREAM or cls.FILL_DRIVEN_TP or cls.WALLET_STREAM
+                                            or cls.POSITION_STREAM or cls.ORDER_TRANSPORT != "rest"):
+            logger.error("Симулятор paper поддерживает только REST: PRICE_STREAM, FILL_DRIVEN_TP, WALLET_STREAM, "
+                         "POSITION_STREAM и ORDER_TRANSPORT=websocket недоступны")
+            raise ValueError("В режиме paper нужны PRICE_STREAM=false, FILL_DRIVEN_TP=false, WALLET_STREAM=false, "
+                             "POSITION_STREAM=false, ORDER_TRANSPORT=rest")
+
+        if cls.PAPER_INSTRUMENTS_FILE and not os.path.isfile(cls.PAPER_INSTRUMENTS_FILE):
+            logger.error(f"Файл инструментов симулятора не найден: {cls.PAPER_INSTRUMENTS_FILE}")
+            raise ValueError(f"PAPER_INSTRUMENTS_FILE не найден: {cls.PAPER_INSTRUMENTS_FILE}")
+
+        if cls.ACCOUNTS_FILE and not os.path.isfile(cls.ACCOUNTS_FILE):
+            logger.error(f"Файл аккаунтов не найден: {cls.ACCOUNTS_FILE}")
+            raise ValueError(f"ACCOUNTS_FILE не найден: {cls.ACCOUNTS_FILE}")
+
+        if not cls.ACCOUNTS_FILE and (not cls.BYBIT_API_KEY or not cls.BYBIT_API_SECRET):
             logger.error("Отсутствуют BYBIT_API_KEY или BYBIT_API_SECRET")
             raise ValueError("Отсутствуют обязательные параметры Bybit API в .env")
 
@@ -43,6 +124,94 @@ class TradingConfig:
             logger.error(f"BALANCE должен быть больше 0, получено: {cls.BALANCE}")
             raise ValueError("BALANCE должен быть положительным числом")
 
+        if cls.EXECUTOR_WORKERS <= 0:
+            logger.error(f"EXECUTOR_WORKERS должен быть больше 0, получено: {cls.EXECUTOR_WORKERS}")
+            raise ValueError("EXECUTOR_WORKERS должен быть положительным числом")
+
+        if cls.INSTRUMENTS_TTL <= 0:
+            logger.error(f"INSTRUMENTS_TTL должен быть больше 0, получено: {cls.INSTRUMENTS_TTL}")
+            raise ValueError("INSTRUMENTS_TTL должен быть положительным числом")
+
+        if cls.LEVERAGE_TTL <= 0:
+            logger.error(f"LEVERAGE_TTL должен быть больше 0, получено: {cls.LEVERAGE_TTL}")
+            raise ValueError("LEVERAGE_TTL должен быть положительным числом")
+
+        if cls.PRICE_MAX_AGE <= 0:
+            logger.error(f"PRICE_MAX_AGE должен быть больше 0, получено: {cls.PRICE_MAX_AGE}")
+            raise ValueError("PRICE_MAX_AGE должен быть положительным числом")
+
+        if cls.REST_CLIENT not in ("lean", "pybit"):
+            logger.error(f"Неверный REST_CLIENT: {cls.REST_CLIENT}")
+            raise ValueError("REST_CLIENT должен быть 'lean' или 'pybit'")
+
+        if cls.REST_POOL_SIZE <= 0:
+            logger.error(f"REST_POOL_SIZE должен быть больше 0, получено: {cls.REST_POOL_SIZE}")
+            raise ValueError("REST_POOL_SIZE должен быть положительным числом")
+
+        if cls.REST_KEEPALIVE_INTERVAL < 0:
+            logger.error(f"REST_KEEPALIVE_INTERVAL не может быть отрицательным, получено: "
+                         f"{cls.REST_KEEPALIVE_INTERVAL}")
+            raise ValueError("REST_KEEPALIVE_INTERVAL должен быть неотрицательным числом (0 — без проверки)")
+
+        if cls.ORDER_TRANSPORT not in ("rest", "websocket"):
+            logger.error(f"Неверный ORDER_TRANSPORT: {cls.ORDER_TRANSPORT}")
+            raise ValueError("ORDER_TRANSPORT должен быть 'rest' или 'websocket'")
+
+        if not 0 < cls.ORDER_HEDGE_QUANTILE < 1:
+            logger.error(f"ORDER_HEDGE_QUANTILE должен быть в (0, 1), получено: {cls.ORDER_HEDGE_QUANTILE}")
+            raise ValueError("ORDER_HEDGE_QUANTILE должен быть долей от 0 до 1")
+
+        if cls.ORDER_HEDGE_MIN_MS <= 0 or cls.ORDER_HEDGE_INITIAL_MS <= 0:
+            logger.error(f"ORDER_HEDGE_MIN_MS и ORDER_HEDGE_INITIAL_MS должны быть больше 0, получено: "
+                         f"{cls.ORDER_HEDGE_MIN_MS}, {cls.ORDER_HEDGE_INITIAL_MS}")
+            raise ValueError("ORDER_HEDGE_MIN_MS и ORDER_HEDGE_INITIAL_MS должны быть положительными числами")
+
+        if cls.WALLET_BALANCE_FIELD not in ("totalEquity", "totalAvailableBalance", "totalWalletBalance"):
+            logger.error(f"Неверный WALLET_BALANCE_FIELD: {cls.WALLET_BALANCE_FIELD}")
+            raise ValueError("WALLET_BALANCE_FIELD должен быть totalEquity, totalAvailableBalance или "
+                             "totalWalletBalance")
+
+        if cls.WALLET_MAX_AGE <= 0:
+            logger.error(f"WALLET_MAX_AGE должен быть больше 0, получено: {cls.WALLET_MAX_AGE}")
+            raise ValueError("WALLET_MAX_AGE должен быть положительным числом")
+
+        if cls.DUPLICATE_POLICY not in ("skip", "scale", "flip"):
+            logger.error(f"Неверный DUPLICATE_POLICY: {cls.DUPLICATE_POLICY}")
+            raise ValueError("DUPLICATE_POLICY должен быть 'skip', 'scale' или 'flip'")
+
+        if cls.EXECUTION_MODE not in ("single", "multiprocess"):
+            logger.error(f"Неверный EXECUTION_MODE: {cls.EXECUTION_MODE}")
+            raise ValueError("EXECUTION_MODE должен быть 'single' или 'multiprocess'")
+
+        if cls.EXECUTOR_PROCESSES <= 0:
+            logger.error(f"EXECUTOR_PROCESSES должен быть больше 0, получено: {cls.EXECUTOR_PROCESSES}")
+            raise ValueError("EXECUTOR_PROCESSES должен быть положительным числом")
+
+        if cls.IPC_TRANSPORT not in ("shm", "socket"):
+            logger.error(f"Неверный IPC_TRANSPORT: {cls.IPC_TRANSPORT}")
+            raise ValueError("IPC_TRANSPORT должен быть 'shm' или 'socket'")
+
+        if cls.IPC_RING_SIZE < 4096 or cls.IPC_RING_SIZE & (cls.IPC_RING_SIZE - 1):
+            logger.error(f"IPC_RING_SIZE должен быть степенью двойки не меньше 4096, получено: {cls.IPC_RING_SIZE}")
+            raise ValueError("IPC_RING_SIZE должен быть степенью двойки не меньше 4096")
+
+        if cls.EXECUTOR_HEARTBEAT_TIMEOUT <= 1:
+            logger.error(f"EXECUTOR_HEARTBEAT_TIMEOUT должен быть больше 1 с, получено: "
+                         f"{cls.EXECUTOR_HEARTBEAT_TIMEOUT}")
+            raise ValueError("EXECUTOR_HEARTBEAT_TIMEOUT должен быть больше интервала heartbeat (1 с)")
+
+        if cls.EXECUTION_MODE == "multiprocess" and cls.TRADING_MODE == "paper" and not cls.PAPER_URL:
+            logger.error("В режиме multiprocess процессы исполнения не разделяют встроенный симулятор")
+            raise ValueError("Для EXECUTION_MODE=multiprocess в режиме paper нужен PAPER_URL")
+
+        if cls.RATE_LIMIT_IP_PER_SECOND <= 0:
+            logger.error(f"RATE_LIMIT_IP_PER_SECOND должен быть больше 0, получено: {cls.RATE_LIMIT_IP_PER_SECOND}")
+            raise ValueError("RATE_LIMIT_IP_PER_SECOND должен быть положительным числом")
+
+        if not 0 <= cls.RATE_LIMIT_MARKET_RESERVE < 1:
+            logger.error(f"RATE_LIMIT_MARKET_RESERVE должен быть в [0, 1), получено: {cls.RATE_LIMIT_MARKET_RESERVE}")
+            raise ValueError("RATE_LIMIT_MARKET_RESERVE должен быть долей от 0 до 1")
+
         tp_percentages = cls.get_tp_percentages()
         total_tp = sum(tp_percentages)
 
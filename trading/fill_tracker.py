@@ -0,0 +1,50 @@
+# trading/fill_tracker.py
+import threading
+from typing import Any, Callable
+from trading.private_stream import PrivateStream
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class FillTracker:
+    """Отслеживание исполнения ордеров по приватному потоку execution"""
+
+    def __init__(self, stream: PrivateStream):
+        self.stream = stream
+        self._watched: dict[str, tuple[Callable[[float], None], float]] = {}
+        self._lock = threading.Lock()
+        self.stream.subscribe("execution", self._on_executions)
+
+    @property
+    def is_connected(self) -> bool:
+        return self.stream.is_connected
+
+    def watch(self, order_link_id: str, on_fill: Callable[[float], None]) -> None:
+        """Подписка на исполнения ордера; on_fill получает накопленный объём"""
+        with self._lock:
+            self._watched[order_link_id] = (on_fill, 0.0)
+
+    def unwatch(self, order_link_id: str) -> None:
+        with self._lock:
+            self._watched.pop(order_link_id, None)
+
+    def _on_executions(self, executions: list[dict[str, Any]]) -> None:
+        """Накопление объёма по сделкам отслеживаемых ордеров"""
+        for execution in executions:
+            if execution.get("execType") != "Trade":
+                continue
+
+            order_link_id = execution.get("orderLinkId", "")
+
+            with self._lock:
+                entry = self._watched.get(order_link_id)
+                if entry is None:
+                    continue
+
+                on_fill, filled = entry
+                filled += float(execution.get("execQty", 0))
+                self._watched[order_link_id] = (on_fill, filled)
+
+            logger.info(f"Исполнение {execution.get('symbol')} ({order_link_id}): {filled}")
+            on_fill(filled)
@@ -0,0 +1,216 @@
+# trading/hedged_transport.py
+import time
+import uuid
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable
+from pybit.exceptions import InvalidRequestError
+from signals.parser.models import Signal
+from trading.order_transport import RestOrderTransport, WebSocketOrderTransport
+from utils.logger import get_logger
+from utils.tracing import LatencyHistogram
+
+logger = get_logger(__name__)
+
+DUPLICATE_LINK_ID = 110072
+# Ошибки, после которых неизвестно, принят ли ордер: повтор с тем же orderLinkId безопасен
+RETRYABLE_CODES = {10000, 10016}
+
+
+def _ret_code(outcome: dict[str, Any] | Exception | None) -> int | None:
+    """retCode ответа: pybit поднимает InvalidRequestError, WebSocket-транспорт возвращает словарь"""
+    if isinstance(outcome, InvalidRequestError):
+        return outcome.status_code
+    if isinstance(outcome, dict):
+        return outcome.get("retCode")
+    return None
+
+
+def _retryable(outcome: dict[str, Any] | Exception | None) -> bool:
+    code = _ret_code(outcome)
+    return code in RETRYABLE_CODES or (code is None and isinstance(outcome, Exception))
+
+
+def _unwrap(outcome: dict[str, Any] | Exception) -> dict[str, Any]:
+    if isinstance(outcome, Exception):
+        raise outcome
+    return outcome
+
+
+def order_link_prefix(signal: Signal) -> str:
+    """Префикс orderLinkId ордеров сигнала: из канала и id сообщения или случайный без них.
+
+    Повторное исполнение того же сообщения даёт те же orderLinkId, и биржа отклоняет дубли.
+    """
+    if signal.message_id:
+        return f"pulse-{zlib.crc32(signal.channel.encode()):08x}-{signal.message_id}"
+    return f"pulse-{uuid.uuid4().hex[:20]}"
+
+
+class HedgedOrderTransport:
+    """Отправка ордеров с дублем при долгом ответе: оба запроса несут один orderLinkId.
+
+    Дубль уходит, когда первая попытка дольше перцентиля quantile собственных задержек ответа.
+    Биржа исполняет только первый дошедший запрос, второй получает 110072; тогда ордер
+    находится по orderLinkId среди активных ордеров или в истории. Ошибка сети или таймаут биржи у первой попытки
+    отправляют дубль сразу. Ордера без orderLinkId отправляются один раз.
+    """
+
+    WARMUP = 20
+
+    def __init__(self, inner: RestOrderTransport | WebSocketOrderTransport, client, account: str = "main",
+                 quantile: float = 0.95, min_delay_ms: float = 20, initial_delay_ms: float = 500,
+                 workers: int = 8):
+        self.inner = inner
+        self.client = client
+        self.account = account
+        self.quantile = quantile
+        self.min_delay_ms = min_delay_ms
+        self.initial_delay_ms = initial_delay_ms
+        self.latency = {"create": LatencyHistogram(), "batch": LatencyHistogram()}
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.reconciled = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"hedge-{account}")
+        _transports.append(self)
+
+    def start(self) -> None:
+        self.inner.start()
+
+    def stop(self) -> None:
+        self.inner.stop()
+        self._executor.shutdown(wait=False)
+
+    def hedge_delay(self, kind: str) -> float:
+        """Задержка перед дублем в миллисекундах"""
+        histogram = self.latency[kind]
+        if histogram.count < self.WARMUP:
+            return self.initial_delay_ms
+        return max(self.min_delay_ms, histogram.percentile(self.quantile))
+
+    def create_order(self, params: dict[str, Any]) -> dict[str, Any]:
+        link_id = params.get("orderLinkId")
+        if not link_id:
+            return self.inner.create_order(params)
+
+        try:
+            resp = self._hedged("create", lambda: self.inner.create_order(params), accept_duplicate=False)
+        except InvalidRequestError as e:
+            if e.status_code != DUPLICATE_LINK_ID:
+                raise
+            return self._reconcile(params["symbol"], link_id) or {"retCode": e.status_code, "retMsg": e.message}
+
+        if _ret_code(resp) == DUPLICATE_LINK_ID:
+            return self._reconcile(params["symbol"], link_id) or resp
+        return resp
+
+    def create_batch(self, request: list[dict[str, Any]]) -> dict[str, Any]:
+        if not request or not all(order.get("orderLinkId") for order in request):
+            return self.inner.create_batch(request)
+
+        # Дубли внутри батча приходят в retExtInfo по каждому ордеру: сам батч при этом успешен
+        return self._hedged("batch", lambda: self.inner.create_batch(request), accept_duplicate=True)
+
+    def _attempt(self, kind: str, send: Callable[[], dict[str, Any]]) -> Future:
+        started = time.perf_counter()
+        future = self._executor.submit(send)
+        future.add_done_callback(lambda _: self.latency[kind].record((time.perf_counter() - started) * 1000))
+        return future
+
+    def _hedged(self, kind: str, send: Callable[[], dict[str, Any]], accept_duplicate: bool) -> dict[str, Any]:
+        """Первый успешный ответ из основной попытки и дубля"""
+        delay_ms = self.hedge_delay(kind)
+        pending = {self._attempt(kind, send)}
+        done, pending = wait(pending, timeout=delay_ms / 1000)
+
+        hedge = None
+        if not done:
+            self.hedged += 1
+            hedge = self._attempt(kind, send)
+            pending.add(hedge)
+            logger.warning(f"[{self.account}] Нет ответа на {kind} за {delay_ms:.0f} мс, отправлен дубль")
+
+        last: dict[str, Any] | Exception | None = None
+        while True:
+            for future in done:
+                last = future.exception() or future.result()
+                code = _ret_code(last)
+                if code == 0:
+                    if future is hedge:
+                        self.hedge_wins += 1
+                    return last
+                if code == DUPLICATE_LINK_ID and not accept_duplicate:
+                    # Другая попытка (или прошлое исполнение сообщения) уже создала ордер
+                    return _unwrap(last)
+
+            if not pending and hedge is None and _retryable(last):
+                self.hedged += 1
+                hedge = self._attempt(kind, send)
+                pending.add(hedge)
+                logger.warning(f"[{self.account}] Ошибка {kind} ({last}), повтор с тем же orderLinkId")
+
+            if not pending:
+                return _unwrap(last)
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+    def _reconcile(self, symbol: str, link_id: str) -> dict[str, Any] | None:
+        """Поиск ордера, принятого биржей раньше, по orderLinkId.
+
+        /v5/order/realtime отдаёт только активные ордера; исполненный рыночный вход
+        уже закрыт и находится в истории ордеров.
+        """
+        try:
+            orders = []
+            for method in (self.client.get_open_orders, self.client.get_order_history):
+                resp = method(category="linear", symbol=symbol, orderLinkId=link_id)
+
+                if not isinstance(resp, dict) or resp.get("retCode") != 0:
+                    logger.error(f"[{self.account}] Ошибка поиска ордера {link_id}: {resp}")
+                    return None
+
+                orders = resp.get("result", {}).get("list", [])
+                if orders:
+                    break
+
+            if not orders:
+                logger.error(f"[{self.account}] Ордер {link_id} отклонён как дубль, но не найден")
+                return None
+
+            self.reconciled += 1
+            order_id = orders[0].get("orderId", "")
+            logger.info(f"[{self.account}] Ордер {link_id} уже принят биржей: orderId={order_id}")
+            return {"retCode": 0, "retMsg": "OK", "result": {"orderId": order_id, "orderLinkId": link_id},
+                    "retExtInfo": {}}
+
+        except Exception as e:
+            logger.error(f"[{self.account}] Ошибка поиска ордера {link_id}: {e}", exc_info=True)
+            return None
+
+
+_transports: list[HedgedOrderTransport] = []
+
+
+def export_metrics(namespace: str = "pulse") -> str:
+    """Задержки ответа на ордера и счётчики дублей в формате Prometheus"""
+    ack = f"{namespace}_order_ack_latency_ms"
+    lines = [
+        f"# HELP {ack} Latency of a single order submission attempt in milliseconds",
+        f"# TYPE {ack} summary"
+    ]
+    for transport in _transports:
+        for kind, histogram in transport.latency.items():
+            labels = f'account="{transport.account}",kind="{kind}"'
+            for quantile in (0.5, 0.99, 0.999):
+                lines.append(f'{ack}{{{labels},quantile="{quantile}"}} {histogram.percentile(quantile):.3f}')
+            lines.append(f"{ack}_sum{{{labels}}} {histogram.sum_ms:.3f}")
+            lines.append(f"{ack}_count{{{labels}}} {histogram.count}")
+
+    for metric, help_text, value in (
+        ("order_hedged_total", "Submissions that sent a hedged duplicate", lambda t: t.hedged),
+        ("order_hedge_wins_total", "Submissions answered first by the hedged duplicate", lambda t: t.hedge_wins),
+        ("order_reconciled_total", "Duplicate rejections resolved by orderLinkId lookup", lambda t: t.reconciled),
+    ):
+        lines += [f"# HELP {namespace}_{metric} {help_text}", f"# TYPE {namespace}_{metric} counter"]
+        lines += [f'{namespace}_{metric}{{account="{t.account}"}} {value(t)}' for t in _transports]
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,179 @@
+# trading/instrument_catalog.py
+import threading
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any
+from trading.sizing import SizingScale
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Instrument:
+    symbol: str
+    status: str
+    qty_step: str
+    min_qty: str
+    max_qty: str
+    tick_size: str
+
+    @classmethod
+    def from_response(cls, item: dict[str, Any]) -> "Instrument":
+        """Создание инструмента из ответа instruments-info"""
+        lot = item.get("lotSizeFilter", {})
+        price = item.get("priceFilter", {})
+
+        return cls(
+            symbol=item.get("symbol", ""),
+            status=item.get("status", "Unknown"),
+            qty_step=lot.get("qtyStep", ""),
+            min_qty=lot.get("minOrderQty", ""),
+            max_qty=lot.get("maxOrderQty", ""),
+            tick_size=price.get("tickSize", "")
+        )
+
+    @property
+    def is_trading(self) -> bool:
+        return self.status == "Trading"
+
+    @property
+    def filters(self) -> dict[str, str]:
+        """Фильтры в формате BybitAPI.get_symbol_filters"""
+        return {
+            "qty_step": self.qty_step,
+            "min_qty": self.min_qty,
+            "max_qty": self.max_qty,
+            "tick_size": self.tick_size
+        }
+
+    @cached_property
+    def scale(self) -> SizingScale:
+        """Целочисленные шкалы объёма и цены, считаются при первом обращении"""
+        return SizingScale.from_filters(self.qty_step, self.min_qty, self.tick_size)
+
+
+class InstrumentCatalog:
+    """Кэш линейных инструментов с фоновым обновлением"""
+
+    PAGE_LIMIT = 1000
+    MISS_TTL = 30
+
+    def __init__(self, client, ttl: float = 600):
+        self.client = client
+        self.ttl = ttl
+        self._instruments: dict[str, Instrument] = {}
+        self._misses: dict[str, float] = {}
+        self._fetch_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._refresh_thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Первичная загрузка и запуск фонового обновления"""
+        self.load()
+
+        if self._refresh_thread is None:
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_loop,
+                name="instrument-catalog",
+                daemon=True
+            )
+            self._refresh_thread.start()
+
+    def stop(self) -> None:
+        """Остановка фонового обновления"""
+        self._stop_event.set()
+
+    def load(self) -> None:
+        """Полная загрузка всех линейных инструментов постранично"""
+        instruments: dict[str, Instrument] = {}
+        cursor = ""
+
+        while True:
+            params = {"category": "linear", "limit": self.PAGE_LIMIT}
+            if cursor:
+                params["cursor"] = cursor
+
+            resp = self.client.get_instruments_info(**params)
+
+            if not isinstance(resp, dict) or resp.get("retCode") != 0:
+                raise RuntimeError(f"Ошибка загрузки инструментов: {resp}")
+
+            result = resp.get("result", {})
+            for item in result.get("list", []):
+                instrument = Instrument.from_response(item)
+                instruments[instrument.symbol] = instrument
+
+            cursor = result.get("nextPageCursor", "")
+            if not cursor:
+                break
+
+        with self._lock:
+            self._instruments = instruments
+
+        logger.info(f"Загружено инструментов: {len(instruments)}")
+
+    def get(self, symbol: str) -> Instrument | None:
+        """Получение инструмента, с запросом к бирже для неизвестного символа"""
+        instrument = self._instruments.get(symbol)
+        if instrument is not None:
+            return instrument
+
+        # Параллельные запросы одного символа ждут единственную загрузку, а не уходят на биржу каждый
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(symbol, threading.Lock())
+
+        with fetch_lock:
+            instrument = self._instruments.get(symbol)
+            if instrument is not None:
+                return instrument
+
+            if time.monotonic() < self._misses.get(symbol, 0):
+                return None
+
+            return self._fetch(symbol)
+
+    def symbols(self, trading_only: bool = True) -> list[str]:
+        """Список известных символов"""
+        return [
+            symbol for symbol, instrument in self._instruments.items()
+            if instrument.is_trading or not trading_only
+        ]
+
+    def _fetch(self, symbol: str) -> Instrument | None:
+        """Загрузка одного инструмента, отсутствующего в кэше"""
+        try:
+            resp = self.client.get_instruments_info(category="linear", symbol=symbol)
+
+            if not isinstance(resp, dict) or resp.get("retCode") != 0:
+                logger.error(f"Ошибка получения инструмента {symbol}: {resp}")
+                return None
+
+            instruments = resp.get("result", {}).get("list", [])
+            if not instruments:
+                logger.warning(f"Символ {symbol} не найден, повторный запрос через {self.MISS_TTL} с")
+                self._misses[symbol] = time.monotonic() + self.MISS_TTL
+                return None
+
+            instrument = Instrument.from_response(instruments[0])
+
+            with self._lock:
+                self._instruments[instrument.symbol] = instrument
+                self._misses.pop(symbol, None)
+
+            logger.info(f"Инструмент {symbol} добавлен в кэш")
+            return instrument
+
+        except Exception as e:
+            logger.error(f"Ошибка получения инструмента {symbol}: {e}", exc_info=True)
+            return None
+
+    def _refresh_loop(self) -> None:
+        """Периодическое обновление кэша"""
+        while not self._stop_event.wait(self.ttl):
+            try:
+                self.load()
+            except Exception as e:
+                logger.error(f"Ошибка обновления инструментов: {e}", exc_info=True)
@@ -0,0 +1,182 @@
+# trading/ipc/channel.py
+import json
+import os
+import socket
+import struct
+import threading
+from datetime import datetime
+from typing import Any
+from signals.parser.models import Signal
+from trading.ipc.ring import SharedRing
+from trading.sizing import SizingProfile
+from utils.tracing import Trace
+
+FRAME = struct.Struct("<I")
+
+
+def encode(message: dict[str, Any]) -> bytes:
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def decode(payload: bytes) -> dict[str, Any]:
+    return json.loads(payload)
+
+
+def signal_message(seq: int, signal: Signal, trace: Trace, sizing: SizingProfile | None) -> dict[str, Any]:
+    """Запись сигнала для процесса исполнения; текст сообщения не передаётся, он остаётся в журнале"""
+    return {
+        "type": "signal",
+        "seq": seq,
+        "signal": {
+            "ticker": signal.ticker,
+            "direction": signal.direction,
+            "leverage": signal.leverage,
+            "take_profits": signal.take_profits,
+            "stop_loss": signal.stop_loss,
+            "timestamp": signal.timestamp.isoformat(),
+            "channel": signal.channel,
+            "message_id": signal.message_id,
+        },
+        # perf_counter на Linux — CLOCK_MONOTONIC, общий для процессов: отметки e2e считаются от приёма сообщения
+        "trace": {"name": trace.name, "started_at": trace.started_at, "spans": trace.spans},
+        "sizing": None if sizing is None else {
+            "amount": sizing.amount,
+            "max_leverage": sizing.max_leverage,
+            "tp_percentages": sizing.tp_percentages,
+        },
+    }
+
+
+def parse_signal_message(message: dict[str, Any]) -> tuple[Signal, Trace, SizingProfile | None]:
+    data = message["signal"]
+    signal = Signal(
+        ticker=data["ticker"],
+        direction=data["direction"],
+        leverage=data["leverage"],
+        take_profits=data["take_profits"],
+        stop_loss=data["stop_loss"],
+        timestamp=datetime.fromisoformat(data["timestamp"]),
+        raw_message="",
+        channel=data["channel"],
+        message_id=data["message_id"],
+    )
+
+    trace = Trace(name=message["trace"]["name"])
+    trace.started_at = message["trace"]["started_at"]
+    trace.spans.update(message["trace"]["spans"])
+
+    sizing = message["sizing"]
+    if sizing is not None:
+        tp_percentages = sizing["tp_percentages"]
+        sizing = SizingProfile(sizing["amount"], sizing["max_leverage"],
+                               tuple(tp_percentages) if tp_percentages else None)
+
+    return signal, trace, sizing
+
+
+class RingChannel:
+    """Двунаправленный канал из двух колец SharedRing: по одному писателю и читателю на каждое"""
+
+    def __init__(self, tx: SharedRing, rx: SharedRing):
+        self.tx = tx
+        self.rx = rx
+
+    @classmethod
+    def create(cls, capacity: int) -> "RingChannel":
+        return cls(SharedRing(capacity=capacity, create=True), SharedRing(capacity=capacity, create=True))
+
+    @property
+    def spec(self) -> dict[str, Any]:
+        """Параметры подключения для процесса на другом конце: кольца меняются местами"""
+        return {"transport": "shm", "tx": self.rx.name, "rx": self.tx.name}
+
+    def send(self, message: dict[str, Any], timeout: float = 0) -> bool:
+        """Запись в кольцо; вызывается из цикла событий, поэтому при заполненном кольце сразу False"""
+        return self.tx.write(encode(message), timeout)
+
+    def recv(self, timeout: float) -> dict[str, Any] | None:
+        payload = self.rx.read(timeout)
+        return None if payload is None else decode(payload)
+
+    def close(self) -> None:
+        self.tx.close()
+        self.rx.close()
+
+
+class SocketChannel:
+    """Канал через Unix-сокет с кадрами длины: запасной вариант без разделяемой памяти"""
+
+    def __init__(self, sock: socket.socket, path: str = "", listener: socket.socket | None = None):
+        self.path = path
+        self._sock = sock
+        self._listener = listener
+        self._owner = listener is not None
+        self._send_lock = threading.Lock()
+        self._buffer = b""
+
+    @classmethod
+    def listen(cls, path: str) -> "SocketChannel":
+        """Серверная сторона; соединение принимается в accept()"""
+        if os.path.exists(path):
+            os.unlink(path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        listener.listen(1)
+        return cls(None, path, listener)
+
+    def accept(self, timeout: float) -> None:
+        self._listener.settimeout(timeout)
+        self._sock, _ = self._listener.accept()
+        self._listener.close()
+        self._listener = None
+
+    @classmethod
+    def connect(cls, path: str) -> "SocketChannel":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(path)
+        return cls(sock, path)
+
+    @property
+    def spec(self) -> dict[str, Any]:
+        return {"transport": "socket", "path": self.path}
+
+    def send(self, message: dict[str, Any], timeout: float = 0) -> bool:
+        payload = encode(message)
+        try:
+            with self._send_lock:
+                self._sock.sendall(FRAME.pack(len(payload)) + payload)
+            return True
+        except OSError:
+            return False
+
+    def recv(self, timeout: float) -> dict[str, Any] | None:
+        self._sock.settimeout(timeout)
+        try:
+            while True:
+                if len(self._buffer) >= FRAME.size:
+                    length = FRAME.unpack_from(self._buffer)[0]
+                    if len(self._buffer) >= FRAME.size + length:
+                        payload = self._buffer[FRAME.size:FRAME.size + length]
+                        self._buffer = self._buffer[FRAME.size + length:]
+                        return decode(payload)
+
+                chunk = self._sock.recv(65536)
+                if not chunk:
+                    raise ConnectionError("Канал закрыт другой стороной")
+                self._buffer += chunk
+        except socket.timeout:
+            return None
+
+    def close(self) -> None:
+        for sock in (self._sock, self._listener):
+            if sock:
+                sock.close()
+        if self._owner and os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def connect(spec: dict[str, Any]) -> RingChannel | SocketChannel:
+    """Подключение к каналу по параметрам, полученным от создателя"""
+    if spec["transport"] == "shm":
+        return RingChannel(SharedRing(spec["tx"]), SharedRing(spec["rx"]))
+    return SocketChannel.connect(spec["path"])
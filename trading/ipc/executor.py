@@ -0,0 +1,114 @@
+# trading/ipc/executor.py
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any
+from trading.accounts import load_accounts
+from trading.config import TradingConfig
+from trading.ipc.channel import RingChannel, SocketChannel, connect, parse_signal_message
+from trading.rate_limiter import ip_bucket
+from trading.signal_dispatcher import SignalDispatcher
+from trading.trade_engine import TradeEngine
+from utils.logger import get_logger, shutdown_logging
+
+logger = get_logger(__name__)
+
+HEARTBEAT_INTERVAL = 1.0
+RECV_TIMEOUT = 0.5
+
+
+def run_executor(name: str, spec: dict[str, Any], accounts: list[str], processes: int,
+                 log_level: int | None = None) -> None:
+    """Точка входа процесса исполнения, запускаемого Supervisor"""
+    if log_level is not None:
+        logging.disable(log_level)
+
+    try:
+        asyncio.run(ExecutorProcess(name, connect(spec), accounts, processes).serve())
+    finally:
+        shutdown_logging()
+
+
+class ExecutorProcess:
+    """Исполнение сигналов из канала listener-процесса со своим TradeEngine и прогретыми соединениями"""
+
+    def __init__(self, name: str, channel: RingChannel | SocketChannel, accounts: list[str], processes: int):
+        self.name = name
+        self.channel = channel
+        self.account_names = accounts
+        self.processes = processes
+        self._stopped = threading.Event()
+        self._parent = os.getppid()
+
+    async def serve(self) -> None:
+        loop = asyncio.get_running_loop()
+        messages: asyncio.Queue = asyncio.Queue()
+
+        # Лимит IP биржи общий для машины: процессы делят его поровну
+        ip_bucket.rate = ip_bucket.capacity = ip_bucket.tokens = TradingConfig.RATE_LIMIT_IP_PER_SECOND / self.processes
+
+        configs = [config for config in load_accounts(TradingConfig.ACCOUNTS_FILE)
+                   if config.name in self.account_names]
+        engine = TradeEngine(accounts=configs)
+        dispatcher = SignalDispatcher(engine, finish_traces=False)
+        reader = threading.Thread(target=self._read_loop, args=(loop, messages), name=f"{self.name}-ipc",
+                                  daemon=True)
+        heartbeat: asyncio.Task | None = None
+
+        try:
+            await engine.start()
+            self.channel.send({"type": "ready", "pid": os.getpid()})
+            logger.info(f"Процесс исполнения {self.name} готов (pid {os.getpid()})")
+
+            reader.start()
+            heartbeat = asyncio.create_task(self._heartbeat(messages))
+
+            while True:
+                message = await messages.get()
+                if message is None or message["type"] == "stop":
+                    break
+
+                signal, trace, sizing = parse_signal_message(message)
+                trace.add_span("ipc.transfer", (time.perf_counter() - message["sent_at"]) * 1000)
+                task = dispatcher.submit(signal, trace, sizing)
+                task.add_done_callback(lambda done, seq=message["seq"], trace=trace: self._report(seq, trace, done))
+
+        finally:
+            if heartbeat:
+                heartbeat.cancel()
+            await dispatcher.close()
+            self._stopped.set()
+            if reader.is_alive():
+                await loop.run_in_executor(None, reader.join)
+            engine.close()
+            self.channel.close()
+            logger.info(f"Процесс исполнения {self.name} остановлен")
+
+    def _read_loop(self, loop: asyncio.AbstractEventLoop, messages: asyncio.Queue) -> None:
+        """Чтение канала в отдельном потоке: ожидание записи не занимает цикл событий"""
+        try:
+            while not self._stopped.is_set():
+                message = self.channel.recv(RECV_TIMEOUT)
+                if message is not None:
+                    loop.call_soon_threadsafe(messages.put_nowait, message)
+        except Exception as e:
+            logger.error(f"Процесс исполнения {self.name}: канал закрыт ({e})")
+            loop.call_soon_threadsafe(messages.put_nowait, None)
+
+    async def _heartbeat(self, messages: asyncio.Queue) -> None:
+        """Heartbeat для Supervisor; без родителя процесс завершается сам — кольцо не сообщает о закрытии"""
+        while True:
+            if os.getppid() != self._parent:
+                logger.error(f"Процесс исполнения {self.name}: listener-процесс завершился")
+                messages.put_nowait(None)
+                return
+
+            self.channel.send({"type": "heartbeat", "at": time.time()})
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+    def _report(self, seq: int, trace, task: asyncio.Task) -> None:
+        success = not task.cancelled() and task.exception() is None and bool(task.result())
+        if not self.channel.send({"type": "outcome", "seq": seq, "success": success, "spans": trace.spans}):
+            logger.warning(f"Процесс исполнения {self.name}: результат сигнала {seq} не передан, канал заполнен")
@@ -0,0 +1,137 @@
+# trading/ipc/ring.py
+import platform
+import struct
+import time
+from multiprocessing import shared_memory
+
+HEADER_SIZE = 128
+# Позиции записи и чтения в разных кэш-линиях, чтобы процессы не делили одну линию
+TAIL_OFFSET = 0
+HEAD_OFFSET = 64
+CAPACITY_OFFSET = 120
+LENGTH = struct.Struct("<I")
+POSITION = struct.Struct("<Q")
+WRAP = 0xFFFFFFFF
+ALIGN = 8
+# Публикация tail без барьера памяти корректна только при порядке сохранения x86-64 (TSO)
+ORDERED_STORES = platform.machine().lower() in ("x86_64", "amd64")
+
+
+def _aligned(size: int) -> int:
+    return (size + ALIGN - 1) & ~(ALIGN - 1)
+
+
+class SharedRing:
+    """Кольцевой буфер записей переменной длины в разделяемой памяти: один писатель, один читатель.
+
+    Блокировок нет: писатель двигает только tail, читатель только head. Обе позиции
+    растут монотонно (u64), индекс в буфере — позиция по модулю capacity. Запись сначала
+    копирует данные, затем публикует tail; выровненные 8-байтные записи позиций на x86-64
+    и arm64 не рвутся, а порядок сохранения на x86-64 гарантирует видимость данных раньше tail.
+    На остальных архитектурах (ORDERED_STORES=False) Supervisor использует сокет вместо кольца.
+    """
+
+    def __init__(self, name: str | None = None, capacity: int = 1 << 20, create: bool = False):
+        if create and capacity & (capacity - 1):
+            raise ValueError(f"Ёмкость кольца должна быть степенью двойки: {capacity}")
+
+        self._shm = shared_memory.SharedMemory(name=name, create=create, size=HEADER_SIZE + capacity)
+        self.name = self._shm.name
+        self._owner = create
+        self._buf = self._shm.buf
+        if create:
+            POSITION.pack_into(self._buf, TAIL_OFFSET, 0)
+            POSITION.pack_into(self._buf, HEAD_OFFSET, 0)
+            POSITION.pack_into(self._buf, CAPACITY_OFFSET, capacity)
+
+        self.capacity = POSITION.unpack_from(self._buf, CAPACITY_OFFSET)[0]
+        self._data = self._buf[HEADER_SIZE:HEADER_SIZE + self.capacity]
+        self._mask = self.capacity - 1
+
+    def _tail(self) -> int:
+        return POSITION.unpack_from(self._buf, TAIL_OFFSET)[0]
+
+    def _head(self) -> int:
+        return POSITION.unpack_from(self._buf, HEAD_OFFSET)[0]
+
+    def __len__(self) -> int:
+        """Занятые байты"""
+        return self._tail() - self._head()
+
+    def try_write(self, payload: bytes) -> bool:
+        """Запись без ожидания; False, если места нет"""
+        size = _aligned(LENGTH.size + len(payload))
+        if size > self.capacity // 2:
+            raise ValueError(f"Запись {len(payload)} байт больше половины кольца {self.capacity}")
+
+        tail = self._tail()
+        offset = tail & self._mask
+        # Запись не разрывается на конце буфера: остаток помечается переходом в начало
+        skip = self.capacity - offset if offset + size > self.capacity else 0
+        if tail + skip + size - self._head() > self.capacity:
+            return False
+
+        if skip:
+            LENGTH.pack_into(self._data, offset, WRAP)
+            tail += skip
+            offset = 0
+
+        LENGTH.pack_into(self._data, offset, len(payload))
+        self._data[offset + LENGTH.size:offset + LENGTH.size + len(payload)] = payload
+        POSITION.pack_into(self._buf, TAIL_OFFSET, tail + size)
+        return True
+
+    def write(self, payload: bytes, timeout: float | None = None) -> bool:
+        """Запись с ожиданием места у медленного читателя"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.try_write(payload):
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.0001)
+        return True
+
+    def try_read(self) -> bytes | None:
+        """Чтение следующей записи без ожидания"""
+        head = self._head()
+        if head == self._tail():
+            return None
+
+        offset = head & self._mask
+        length = LENGTH.unpack_from(self._data, offset)[0]
+        if length == WRAP:
+            head += self.capacity - offset
+            offset = 0
+            length = LENGTH.unpack_from(self._data, offset)[0]
+
+        payload = bytes(self._data[offset + LENGTH.size:offset + LENGTH.size + length])
+        POSITION.pack_into(self._buf, HEAD_OFFSET, head + _aligned(LENGTH.size + length))
+        return payload
+
+    def read(self, timeout: float, spin: float = 0.0002) -> bytes | None:
+        """Чтение с ожиданием: короткий активный опрос, затем сон с ростом до 1 мс"""
+        payload = self.try_read()
+        if payload is not None:
+            return payload
+
+        started = time.perf_counter()
+        deadline = started + timeout
+        pause = 0.00005
+        while True:
+            payload = self.try_read()
+            if payload is not None:
+                return payload
+
+            now = time.perf_counter()
+            if now > deadline:
+                return None
+            if now - started > spin:
+                time.sleep(pause)
+                pause = min(pause * 2, 0.001)
+
+    def close(self) -> None:
+        """Отключение от памяти; создатель кольца также удаляет сегмент"""
+        self._data.release()
+        self._buf = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
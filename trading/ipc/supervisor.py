@@ -0,0 +1,345 @@
+# trading/ipc/supervisor.py
+import asyncio
+import itertools
+import multiprocessing
+import os
+import platform
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+from signals.parser.models import Signal
+from trading.accounts import load_accounts
+from trading.config import TradingConfig
+from trading.ipc.channel import RingChannel, SocketChannel, signal_message
+from trading.ipc.executor import run_executor
+from trading.ipc.ring import ORDERED_STORES
+from trading.sizing import SizingProfile
+from utils.logger import get_logger
+from utils.tracing import Trace, tracer
+
+logger = get_logger(__name__)
+
+READY_TIMEOUT = 60
+RECV_TIMEOUT = 0.5
+MONITOR_INTERVAL = 0.5
+
+
+@dataclass
+class PendingSignal:
+    """Сигнал, отправленный процессам исполнения и ожидающий их результатов"""
+
+    signal: Signal
+    trace: Trace
+    sizing: SizingProfile | None
+    future: asyncio.Future
+    executors: set[str]
+    delivered: set[str] = field(default_factory=set)
+    success: bool = False
+
+
+@dataclass
+class ExecutorHandle:
+    """Процесс исполнения, его канал и отметка последнего ответа"""
+
+    name: str
+    accounts: list[str]
+    process: Any = None
+    channel: RingChannel | SocketChannel | None = None
+    last_seen: float = 0.0
+    restarts: int = 0
+    stopping: bool = False
+    reader: threading.Thread | None = None
+    ready: threading.Event = field(default_factory=threading.Event)
+
+
+class Supervisor:
+    """Запуск процессов исполнения, контроль heartbeat и перезапуск упавших или зависших"""
+
+    def __init__(self, processes: int = 1, transport: str = "shm", ring_capacity: int = 1 << 20,
+                 heartbeat_timeout: float = 5, log_level: int | None = None):
+        if transport == "shm" and not ORDERED_STORES:
+            logger.warning(f"Транспорт shm рассчитан на x86-64, на {platform.machine()} используется socket")
+            transport = "socket"
+
+        self.transport = transport
+        self.ring_capacity = ring_capacity
+        self.heartbeat_timeout = heartbeat_timeout
+        self.log_level = log_level
+        self._context = multiprocessing.get_context("spawn")
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._monitor: asyncio.Task | None = None
+
+        names = [config.name for config in load_accounts(TradingConfig.ACCOUNTS_FILE)]
+        processes = max(1, min(processes, len(names)))
+        # Аккаунты делятся между процессами по кругу: у каждого свои ключи и прогретые соединения
+        self.handles = [
+            ExecutorHandle(name=f"executor-{index + 1}", accounts=names[index::processes])
+            for index in range(processes)
+        ]
+        self.dispatcher = RemoteDispatcher(self)
+
+    @classmethod
+    def from_config(cls, log_level: int | None = None) -> "Supervisor":
+        return cls(
+            processes=TradingConfig.EXECUTOR_PROCESSES,
+            transport=TradingConfig.IPC_TRANSPORT,
+            ring_capacity=TradingConfig.IPC_RING_SIZE,
+            heartbeat_timeout=TradingConfig.EXECUTOR_HEARTBEAT_TIMEOUT,
+            log_level=log_level
+        )
+
+    async def start(self) -> None:
+        """Запуск всех процессов исполнения и ожидание их готовности"""
+        self._loop = asyncio.get_running_loop()
+        await asyncio.gather(*(self._spawn(handle) for handle in self.handles))
+        self._monitor = asyncio.create_task(self._watch())
+        logger.info(f"Процессов исполнения: {len(self.handles)}, транспорт {self.transport} "
+                    f"({', '.join(f'{h.name}: {len(h.accounts)} акк.' for h in self.handles)})")
+
+    async def _spawn(self, handle: ExecutorHandle) -> None:
+        """Создание канала и процесса; процесс готов после загрузки справочников и прогрева соединений"""
+        if self.transport == "shm":
+            channel = RingChannel.create(self.ring_capacity)
+            spec = channel.spec
+        else:
+            path = os.path.join(tempfile.gettempdir(), f"pulse-{os.getpid()}-{handle.name}.sock")
+            channel = SocketChannel.listen(path)
+            spec = channel.spec
+
+        handle.ready.clear()
+        handle.process = self._context.Process(
+            target=run_executor,
+            args=(handle.name, spec, handle.accounts, len(self.handles), self.log_level),
+            name=handle.name,
+            daemon=True
+        )
+        handle.process.start()
+
+        try:
+            if isinstance(channel, SocketChannel):
+                await self._loop.run_in_executor(None, channel.accept, READY_TIMEOUT)
+        except Exception:
+            channel.close()
+            await self._terminate(handle)
+            raise
+
+        # Канал закрывает _terminate после остановки потока чтения: send работает в том же цикле событий
+        handle.channel = channel
+        handle.last_seen = time.monotonic()
+        handle.reader = threading.Thread(target=self._read_loop, args=(handle, channel),
+                                         name=f"{handle.name}-ipc", daemon=True)
+        handle.reader.start()
+
+        ready = await self._loop.run_in_executor(None, handle.ready.wait, READY_TIMEOUT)
+        if not ready:
+            await self._terminate(handle)
+            raise TimeoutError(f"{handle.name} не готов за {READY_TIMEOUT} с")
+
+        handle.stopping = False
+
+        logger.info(f"Процесс {handle.name} запущен (pid {handle.process.pid}), аккаунты: {', '.join(handle.accounts)}")
+
+    def _read_loop(self, handle: ExecutorHandle, channel: RingChannel | SocketChannel) -> None:
+        """Чтение ответов процесса в отдельном потоке до смены канала; сам канал поток не закрывает"""
+        try:
+            while handle.channel is channel:
+                message = channel.recv(RECV_TIMEOUT)
+                if message is None:
+                    continue
+
+                handle.last_seen = time.monotonic()
+                if message["type"] == "ready":
+                    handle.ready.set()
+                elif message["type"] == "outcome":
+                    self._loop.call_soon_threadsafe(self.dispatcher.on_outcome, handle.name, message)
+        except Exception as e:
+            if handle.channel is channel and not handle.stopping:
+                logger.error(f"Канал {handle.name} закрыт: {e}")
+
+    async def _watch(self) -> None:
+        """Перезапуск процессов, которые завершились или перестали присылать heartbeat"""
+        while True:
+            await asyncio.sleep(MONITOR_INTERVAL)
+
+            for handle in self.handles:
+                if handle.stopping:
+                    continue
+
+                if not handle.process.is_alive():
+                    reason = f"процесс завершился с кодом {handle.process.exitcode}"
+                elif time.monotonic() - handle.last_seen > self.heartbeat_timeout:
+                    reason = f"нет heartbeat {self.heartbeat_timeout} с"
+                else:
+                    continue
+
+                logger.error(f"Процесс {handle.name}: {reason}, перезапуск")
+                await self._restart(handle)
+
+    async def _restart(self, handle: ExecutorHandle) -> None:
+        handle.stopping = True
+        await self._terminate(handle)
+        handle.restarts += 1
+
+        try:
+            await self._spawn(handle)
+        except Exception as e:
+            logger.error(f"Не удалось перезапустить {handle.name}: {e}")
+            handle.stopping = False
+            self.dispatcher.fail_executor(handle.name)
+            return
+
+        self.dispatcher.replay(handle)
+
+    async def _terminate(self, handle: ExecutorHandle) -> None:
+        """Остановка процесса и потока чтения, затем закрытие канала.
+
+        После handle.channel = None send() в него уже не пишет, а поток чтения выходит
+        за RECV_TIMEOUT. Закрытие идёт после join потока в цикле событий, где работает и send(),
+        поэтому память кольца не освобождается под читателем или писателем.
+        """
+        channel, handle.channel = handle.channel, None
+        if handle.process:
+            await self._loop.run_in_executor(None, _kill, handle.process)
+
+        if handle.reader:
+            await self._loop.run_in_executor(None, handle.reader.join)
+            handle.reader = None
+        if channel:
+            channel.close()
+
+    def send(self, handle: ExecutorHandle, message: dict[str, Any]) -> bool:
+        """Запись в текущий канал процесса; только из цикла событий, как и закрытие в _terminate"""
+        channel = handle.channel
+        return channel is not None and channel.send(message)
+
+    async def stop(self, timeout: float = 30) -> None:
+        """Остановка процессов после завершения сигналов, уже отправленных на биржу"""
+        if self._monitor:
+            self._monitor.cancel()
+
+        await self.dispatcher.close(timeout)
+
+        for handle in self.handles:
+            handle.stopping = True
+            self.send(handle, {"type": "stop"})
+
+        for handle in self.handles:
+            if handle.process:
+                await self._loop.run_in_executor(None, handle.process.join, 10)
+            await self._terminate(handle)
+
+        logger.info("Процессы исполнения остановлены")
+
+
+def _kill(process: Any) -> None:
+    if process.is_alive():
+        process.terminate()
+        process.join(timeout=5)
+    if process.is_alive():
+        process.kill()
+        process.join()
+
+
+class RemoteDispatcher:
+    """Диспетчер listener-процесса: сигналы уходят во все процессы исполнения, результат — по их ответам"""
+
+    # Исполнение вне процесса: у ChannelListener нет своего TradeEngine
+    trade_engine = None
+
+    def __init__(self, supervisor: Supervisor):
+        self.supervisor = supervisor
+        self._seq = itertools.count(1)
+        self._pending: dict[int, PendingSignal] = {}
+
+    def submit(self, signal: Signal, trace: Trace | None = None,
+               sizing: SizingProfile | None = None) -> asyncio.Future:
+        """Отправка сигнала без ожидания результата; Future завершается ответами всех процессов"""
+        trace = trace or Trace(name=f"{signal.ticker} {signal.direction}")
+        future = asyncio.get_running_loop().create_future()
+        seq = next(self._seq)
+        pending = PendingSignal(signal, trace, sizing, future, {handle.name for handle in self.supervisor.handles})
+        self._pending[seq] = pending
+
+        message = signal_message(seq, signal, trace, sizing)
+        for handle in self.supervisor.handles:
+            self._send(handle, seq, message)
+
+        return future
+
+    def _send(self, handle: ExecutorHandle, seq: int, message: dict[str, Any]) -> None:
+        message["sent_at"] = time.perf_counter()
+        if self.supervisor.send(handle, message):
+            self._pending[seq].delivered.add(handle.name)
+        elif handle.stopping:
+            logger.warning(f"Сигнал {seq} ждёт перезапуска {handle.name}")
+        else:
+            logger.error(f"Сигнал {seq} не передан в {handle.name}: канал недоступен")
+            self._complete(seq, handle.name, success=False, spans={})
+
+    def on_outcome(self, executor: str, message: dict[str, Any]) -> None:
+        self._complete(message["seq"], executor, message["success"], message["spans"])
+
+    def _complete(self, seq: int, executor: str, success: bool, spans: dict[str, float]) -> None:
+        pending = self._pending.get(seq)
+        if pending is None or executor not in pending.executors:
+            return
+
+        pending.executors.discard(executor)
+        pending.success |= success
+        prefix = f"{executor}." if len(self.supervisor.handles) > 1 else ""
+        for name, duration_ms in spans.items():
+            if name not in pending.trace.spans:
+                pending.trace.spans[f"{prefix}{name}"] = duration_ms
+
+        if pending.executors:
+            return
+
+        del self._pending[seq]
+        tracer.finish(pending.trace)
+        if not pending.future.done():
+            pending.future.set_result(pending.success)
+
+    def replay(self, handle: ExecutorHandle) -> None:
+        """Повтор сигналов без ответа от перезапущенного процесса.
+
+        Не доставленные до перезапуска сигналы отправляются всегда. Доставленные повторяются
+        только с message_id: их orderLinkId детерминированы, и биржа отклонит уже принятые
+        ордера как дубли. Остальные считаются неисполненными.
+        """
+        for seq, pending in list(self._pending.items()):
+            if handle.name not in pending.executors:
+                continue
+
+            if handle.name not in pending.delivered:
+                self._send(handle, seq, signal_message(seq, pending.signal, pending.trace, pending.sizing))
+            elif pending.signal.message_id:
+                logger.warning(f"Повтор сигнала {pending.trace.name} в {handle.name}")
+                self._send(handle, seq, signal_message(seq, pending.signal, pending.trace, pending.sizing))
+            else:
+                self._complete(seq, handle.name, success=False, spans={})
+
+    def fail_executor(self, executor: str) -> None:
+        for seq in list(self._pending):
+            self._complete(seq, executor, success=False, spans={})
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def close(self, timeout: float = 30) -> None:
+        """Ожидание ответов по уже отправленным сигналам"""
+        if not self._pending:
+            return
+
+        logger.info(f"Ожидание завершения {len(self._pending)} сигналов в процессах исполнения")
+        futures = [pending.future for pending in self._pending.values()]
+        _, pending = await asyncio.wait(futures, timeout=timeout)
+
+        if pending:
+            logger.warning(f"Не дождались завершения {len(pending)} сигналов")
+            for handle in self.supervisor.handles:
+                self.fail_executor(handle.name)
+
+        await asyncio.sleep(0)
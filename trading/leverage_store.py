@@ -0,0 +1,100 @@
+# trading/leverage_store.py
+import threading
+import time
+from typing import Any
+from trading.private_stream import PrivateStream
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LeverageStore:
+    """Известное плечо по символам, чтобы не вызывать set-leverage повторно"""
+
+    PAGE_LIMIT = 200
+
+    def __init__(self, client, ttl: float = 300):
+        self.client = client
+        self.ttl = ttl
+        self._leverage: dict[str, tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """Заполнение из списка позиций"""
+        try:
+            cursor = ""
+            loaded = 0
+
+            while True:
+                params = {"category": "linear", "settleCoin": "USDT", "limit": self.PAGE_LIMIT}
+                if cursor:
+                    params["cursor"] = cursor
+
+                resp = self.client.get_positions(**params)
+
+                if not isinstance(resp, dict) or resp.get("retCode") != 0:
+                    logger.error(f"Ошибка загрузки плеча из позиций: {resp}")
+                    return
+
+                result = resp.get("result", {})
+                for item in result.get("list", []):
+                    if self.update_from_position(item):
+                        loaded += 1
+
+                cursor = result.get("nextPageCursor", "")
+                if not cursor:
+                    break
+
+            logger.info(f"Загружено плечо по {loaded} символам")
+
+        except Exception as e:
+            logger.error(f"Ошибка загрузки плеча из позиций: {e}", exc_info=True)
+
+    def subscribe(self, stream: PrivateStream) -> None:
+        """Обновление по потоку position: плечо, изменённое вне бота, приходит в сообщении позиции"""
+        stream.subscribe("position", self._on_positions)
+
+    def get(self, symbol: str) -> int | None:
+        """Известное плечо символа, если запись не устарела"""
+        entry = self._leverage.get(symbol)
+        if entry is None:
+            return None
+
+        leverage, updated_at = entry
+        if time.monotonic() - updated_at > self.ttl:
+            return None
+
+        return leverage
+
+    def set(self, symbol: str, leverage: int) -> None:
+        """Запись подтверждённого биржей плеча"""
+        with self._lock:
+            self._leverage[symbol] = (leverage, time.monotonic())
+
+    def invalidate(self, symbol: str | None = None) -> None:
+        """Сброс записи символа или всего хранилища"""
+        with self._lock:
+            if symbol is None:
+                self._leverage.clear()
+            else:
+                self._leverage.pop(symbol, None)
+
+    def update_from_position(self, item: dict[str, Any]) -> bool:
+        """Обновление по данным позиции из REST или приватного потока"""
+        symbol = item.get("symbol")
+        leverage = item.get("leverage")
+
+        if not symbol or not leverage:
+            return False
+
+        try:
+            self.set(symbol, int(float(leverage)))
+            return True
+        except ValueError:
+            return False
+
+    def _on_positions(self, items: list[dict[str, Any]]) -> None:
+        """Плечо из сообщения позиции; без поля leverage запись сбрасывается"""
+        for item in items:
+            if not self.update_from_position(item) and item.get("symbol"):
+                self.invalidate(item["symbol"])
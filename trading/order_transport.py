@@ -0,0 +1,111 @@
+# trading/order_transport.py
+import time
+import uuid
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any
+from trading.ws_client import WebSocketClient
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RestOrderTransport:
+    """Выставление ордеров через REST API"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def create_order(self, params: dict[str, Any]) -> dict[str, Any]:
+        return self.client.place_order(**params)
+
+    def create_batch(self, request: list[dict[str, Any]]) -> dict[str, Any]:
+        return self.client.place_batch_order(category="linear", request=request)
+
+
+class WebSocketOrderTransport:
+    """Выставление ордеров через приватный WebSocket /v5/trade с откатом на REST"""
+
+    RECV_WINDOW = "5000"
+
+    def __init__(self, url: str, api_key: str, api_secret: str, fallback: RestOrderTransport,
+                 ack_timeout: float = 5):
+        self.fallback = fallback
+        self.ack_timeout = ack_timeout
+        self._pending: dict[str, Future] = {}
+        self._ws = WebSocketClient(url, "trade", self._on_message, api_key=api_key, api_secret=api_secret)
+
+    @property
+    def is_connected(self) -> bool:
+        return self._ws.is_connected
+
+    def start(self) -> None:
+        """Открытие соединения и ожидание авторизации"""
+        self._ws.start()
+        if not self._ws.wait_ready(self.ack_timeout):
+            logger.warning("WebSocket для ордеров не готов, ордера пойдут через REST до подключения")
+
+    def stop(self) -> None:
+        self._ws.stop()
+
+    def create_order(self, params: dict[str, Any]) -> dict[str, Any]:
+        if not self.is_connected:
+            logger.warning("WebSocket для ордеров недоступен, выставление через REST")
+            return self.fallback.create_order(params)
+
+        return self._request("order.create", params, lambda: self.fallback.create_order(params))
+
+    def create_batch(self, request: list[dict[str, Any]]) -> dict[str, Any]:
+        if not self.is_connected:
+            logger.warning("WebSocket для ордеров недоступен, выставление батча через REST")
+            return self.fallback.create_batch(request)
+
+        args = {"category": "linear", "request": request}
+        return self._request("order.create-batch", args, lambda: self.fallback.create_batch(request))
+
+    def _request(self, operation: str, args: dict[str, Any], fallback) -> dict[str, Any]:
+        """Отправка операции и ожидание ответа с тем же reqId"""
+        req_id = uuid.uuid4().hex
+        future: Future = Future()
+        self._pending[req_id] = future
+
+        try:
+            try:
+                self._ws.send({
+                    "reqId": req_id,
+                    "header": {
+                        "X-BAPI-TIMESTAMP": str(int(time.time() * 1000)),
+                        "X-BAPI-RECV-WINDOW": self.RECV_WINDOW
+                    },
+                    "op": operation,
+                    "args": [args]
+                })
+            except Exception as e:
+                logger.warning(f"Не удалось отправить {operation} через WebSocket ({e}), выставление через REST")
+                return fallback()
+
+            try:
+                message = future.result(timeout=self.ack_timeout)
+            except FutureTimeoutError:
+                raise TimeoutError(f"Нет ответа на {operation} (reqId={req_id}) за {self.ack_timeout} с")
+
+        finally:
+            self._pending.pop(req_id, None)
+
+        return {
+            "retCode": message.get("retCode"),
+            "retMsg": message.get("retMsg", ""),
+            "result": message.get("data") or {},
+            "retExtInfo": message.get("retExtInfo") or {}
+        }
+
+    def _on_message(self, message: dict[str, Any]) -> None:
+        """Сопоставление ответа с ожидающим запросом"""
+        future = self._pending.get(message.get("reqId", ""))
+        if future and not future.done():
+            future.set_result(message)
@@ -0,0 +1,52 @@
+# trading/paper/__init__.py
+import json
+import threading
+from trading.paper.exchange import PaperExchange, SimInstrument
+from trading.paper.server import PaperExchangeServer
+
+DEFAULT_INSTRUMENTS = [
+    SimInstrument("BTCUSDT", 65000.0, qty_step="0.001", min_qty="0.001", tick_size="0.10"),
+    SimInstrument("ETHUSDT", 3200.0, qty_step="0.01", min_qty="0.01", tick_size="0.01"),
+    SimInstrument("SOLUSDT", 150.0, qty_step="0.1", min_qty="0.1", tick_size="0.010"),
+    SimInstrument("XRPUSDT", 0.6, qty_step="1", min_qty="1", tick_size="0.0001", max_leverage=75),
+    SimInstrument("DOGEUSDT", 0.15, qty_step="1", min_qty="1", tick_size="0.00001", max_leverage=75),
+    SimInstrument("1000PEPEUSDT", 0.012, qty_step="100", min_qty="100", tick_size="0.0000001", max_leverage=50),
+]
+
+_embedded: PaperExchangeServer | None = None
+_embedded_lock = threading.Lock()
+
+
+def load_instruments(instruments_file: str = "") -> list[SimInstrument]:
+    """Инструменты симулятора из JSON-файла или набор по умолчанию"""
+    if not instruments_file:
+        return [SimInstrument(**vars(instrument)) for instrument in DEFAULT_INSTRUMENTS]
+
+    with open(instruments_file, encoding="utf-8") as f:
+        return [
+            SimInstrument(
+                symbol=item["symbol"],
+                price=float(item["price"]),
+                qty_step=item.get("qtyStep", "0.001"),
+                min_qty=item.get("minOrderQty", item.get("qtyStep", "0.001")),
+                max_qty=item.get("maxOrderQty", "1000000"),
+                tick_size=item.get("tickSize", "0.01"),
+                max_leverage=int(item.get("maxLeverage", 100))
+            )
+            for item in json.load(f)
+        ]
+
+
+def embedded_url(instruments_file: str = "", latency_ms: float = 0.0, error_rate: float = 0.0) -> str:
+    """URL симулятора в потоке текущего процесса, общий для всех аккаунтов; запускается при первом вызове"""
+    global _embedded
+
+    with _embedded_lock:
+        if _embedded is None:
+            _embedded = PaperExchangeServer(
+                PaperExchange(load_instruments(instruments_file)),
+                latency_ms=latency_ms,
+                error_rate=error_rate
+            )
+            _embedded.start_in_thread()
+        return _embedded.url
@@ -0,0 +1,27 @@
+# trading/paper/__main__.py
+import argparse
+import asyncio
+from trading.paper import PaperExchange, PaperExchangeServer, load_instruments
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Локальный симулятор REST API Bybit v5")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--instruments", default="", help="JSON-файл инструментов")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Доля ответов retCode 10016")
+    parser.add_argument("--volatility", type=float, default=0.0005, help="Волатильность цены в секунду")
+    parser.add_argument("--balance", type=float, default=10_000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    exchange = PaperExchange(load_instruments(args.instruments), args.volatility, args.balance, args.seed)
+    server = PaperExchangeServer(exchange, args.host, args.port, args.latency_ms, args.jitter_ms,
+                                 args.error_rate, seed=args.seed)
+    asyncio.run(server.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+# trading/paper/exchange.py
+import math
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any
+
+PARAMS_ERROR = 10001
+SERVICE_ERROR = 10016
+DUPLICATE_LINK_ID = 110072
+LEVERAGE_NOT_MODIFIED = 110043
+REDUCE_ONLY_ZERO = 110017
+INSUFFICIENT_BALANCE = 110007
+OPEN_STATUSES = {"New", "PartiallyFilled"}
+
+
+class ExchangeError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+@dataclass
+class SimInstrument:
+    symbol: str
+    price: float
+    qty_step: str = "0.001"
+    min_qty: str = "0.001"
+    max_qty: str = "1000000"
+    tick_size: str = "0.01"
+    max_leverage: int = 100
+
+    def to_response(self) -> dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "contractType": "LinearPerpetual",
+            "status": "Trading",
+            "baseCoin": self.symbol.removesuffix("USDT"),
+            "quoteCoin": "USDT",
+            "settleCoin": "USDT",
+            "lotSizeFilter": {"qtyStep": self.qty_step, "minOrderQty": self.min_qty, "maxOrderQty": self.max_qty},
+            "priceFilter": {"tickSize": self.tick_size},
+            "leverageFilter": {"minLeverage": "1", "maxLeverage": str(self.max_leverage), "leverageStep": "0.01"}
+        }
+
+
+@dataclass
+class Position:
+    symbol: str
+    size: float = 0.0
+    side: str = ""
+    avg_price: float = 0.0
+    stop_loss: float = 0.0
+
+    def to_response(self, leverage: int) -> dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "side": self.side if self.size else "",
+            "size": f"{self.size:g}",
+            "avgPrice": f"{self.avg_price:g}",
+            "leverage": str(leverage),
+            "stopLoss": f"{self.stop_loss:g}" if self.stop_loss else "",
+            "positionIdx": 0
+        }
+
+
+@dataclass
+class Order:
+    order_id: str
+    order_link_id: str
+    symbol: str
+    side: str
+    price: float
+    qty: float
+    reduce_only: bool
+    created_at: float
+
+
+@dataclass
+class Account:
+    """Счёт одного API-ключа: плечо, позиции, лимитные ордера и реализованный PnL"""
+
+    balance: float
+    leverage: dict[str, int] = field(default_factory=dict)
+    positions: dict[str, Position] = field(default_factory=dict)
+    orders: dict[str, dict[str, Order]] = field(default_factory=dict)
+    link_ids: dict[str, dict[str, Any]] = field(default_factory=dict)
+    realized_pnl: float = 0.0
+    fills: int = 0
+
+    def available(self) -> float:
+        """Свободная маржа: баланс с реализованным PnL за вычетом маржи позиций"""
+        used = sum(position.size * position.avg_price / self.leverage.get(symbol, 10)
+                   for symbol, position in self.positions.items() if position.size)
+        return self.balance + self.realized_pnl - used
+
+
+def _on_step(value: str, step: str) -> bool:
+    return (Decimal(value) % Decimal(step)) == 0
+
+
+class PaperExchange:
+    """Состояние биржи в памяти: цены случайного блуждания, позиции one-way и сведение ордеров.
+
+    Рыночные ордера исполняются по последней цене, лимитные reduce-only ордера и SL
+    проверяются при каждом движении цены символа.
+    """
+
+    def __init__(self, instruments: list[SimInstrument], volatility: float = 0.0005, balance: float = 10_000,
+                 seed: int | None = None):
+        self.instruments = {instrument.symbol: instrument for instrument in instruments}
+        self.volatility = volatility
+        self.initial_balance = balance
+        self.accounts: dict[str, Account] = {}
+        self._rng = random.Random(seed)
+        self._price_updated = {symbol: time.monotonic() for symbol in self.instruments}
+
+    def account(self, api_key: str) -> Account:
+        account = self.accounts.get(api_key)
+        if account is None:
+            account = self.accounts[api_key] = Account(self.initial_balance)
+        return account
+
+    def instrument(self, symbol: str) -> SimInstrument:
+        instrument = self.instruments.get(symbol)
+        if instrument is None:
+            raise ExchangeError(PARAMS_ERROR, f"symbol invalid: {symbol}")
+        return instrument
+
+    def last_price(self, symbol: str) -> float:
+        """Цена с геометрическим случайным блужданием за время с прошлого обращения"""
+        instrument = self.instrument(symbol)
+        now = time.monotonic()
+        elapsed = now - self._price_updated[symbol]
+
+        if self.volatility and elapsed > 0:
+            self._price_updated[symbol] = now
+            instrument.price *= math.exp(self._rng.gauss(0, self.volatility * math.sqrt(elapsed)))
+            self._match(symbol, instrument.price)
+
+        return instrument.price
+
+    def set_price(self, symbol: str, price: float) -> None:
+        """Ручная установка цены с проверкой лимитных ордеров и стопов"""
+        self.instrument(symbol).price = price
+        self._price_updated[symbol] = time.monotonic()
+        self._match(symbol, price)
+
+    def instruments_info(self, symbol: str = "") -> dict[str, Any]:
+        instruments = [self.instrument(symbol)] if symbol else self.instruments.values()
+        return {"category": "linear", "list": [instrument.to_response() for instrument in instruments],
+                "nextPageCursor": ""}
+
+    def tickers(self, symbol: str = "") -> dict[str, Any]:
+        symbols = [symbol] if symbol else list(self.instruments)
+        items = []
+        for name in symbols:
+            price = f"{self.last_price(name):.10g}"
+            items.append({"symbol": name, "lastPrice": price, "markPrice": price})
+        return {"category": "linear", "list": items}
+
+    def set_leverage(self, api_key: str, symbol: str, buy_leverage: str, sell_leverage: str) -> dict[str, Any]:
+        instrument = self.instrument(symbol)
+        account = self.account(api_key)
+        leverage = int(float(buy_leverage))
+
+        if buy_leverage != sell_leverage or not 1 <= leverage <= instrument.max_leverage:
+            raise ExchangeError(PARAMS_ERROR, f"leverage invalid: {buy_leverage}/{sell_leverage}")
+        if account.leverage.get(symbol) == leverage:
+            raise ExchangeError(LEVERAGE_NOT_MODIFIED, "leverage not modified")
+
+        account.leverage[symbol] = leverage
+        return {}
+
+    def positions(self, api_key: str, symbol: str = "") -> dict[str, Any]:
+        account = self.account(api_key)
+        symbols = [symbol] if symbol else sorted(set(account.leverage) | set(account.positions))
+        items = [
+            account.positions.get(name, Position(name)).to_response(account.leverage.get(name, 10))
+            for name in symbols
+        ]
+        return {"category": "linear", "list": items, "nextPageCursor": ""}
+
+    def create_order(self, api_key: str, params: dict[str, Any]) -> dict[str, Any]:
+        """Рыночный вход с SL или лимитный ордер"""
+        account = self.account(api_key)
+        symbol = params.get("symbol", "")
+        instrument = self.instrument(symbol)
+        side = params.get("side")
+        qty_text = str(params.get("qty", ""))
+        order_type = params.get("orderType")
+        link_id = params.get("orderLinkId", "")
+
+        if side not in ("Buy", "Sell") or order_type not in ("Market", "Limit"):
+            raise ExchangeError(PARAMS_ERROR, f"side/orderType invalid: {side}/{order_type}")
+        if not qty_text or not _on_step(qty_text, instrument.qty_step) \
+                or not Decimal(instrument.min_qty) <= Decimal(qty_text) <= Decimal(instrument.max_qty):
+            raise ExchangeError(PARAMS_ERROR, f"Qty invalid: {qty_text}")
+        if link_id and link_id in account.link_ids:
+            raise ExchangeError(DUPLICATE_LINK_ID, "OrderLinkedID is duplicate")
+
+        qty = float(qty_text)
+        price = self.last_price(symbol)
+        position = account.positions.setdefault(symbol, Position(symbol))
+        reduce_only = bool(params.get("reduceOnly"))
+
+        if reduce_only and (not position.size or position.side == side):
+            raise ExchangeError(REDUCE_ONLY_ZERO, "current position is zero, cannot fix reduce-only order qty")
+
+        stop_loss = params.get("stopLoss")
+        if stop_loss:
+            stop_loss = float(stop_loss)
+            if (side == "Buy" and stop_loss >= price) or (side == "Sell" and stop_loss <= price):
+                raise ExchangeError(PARAMS_ERROR, f"StopLoss:{stop_loss} set for {side} position should be "
+                                                  f"{'lower' if side == 'Buy' else 'higher'} than base_price:{price}")
+
+        if order_type == "Market":
+            leverage = account.leverage.get(symbol, 10)
+            if (not position.size or position.side == side) and qty * price / leverage > account.available():
+                raise ExchangeError(INSUFFICIENT_BALANCE, "ab not enough for new order")
+
+        if order_type == "Limit":
+            limit_price = float(params.get("price", 0))
+            if limit_price <= 0 or not _on_step(str(params.get("price")), instrument.tick_size):
+                raise ExchangeError(PARAMS_ERROR, f"price invalid: {params.get('price')}")
+
+        order_id = str(uuid.uuid4())
+        if link_id:
+            account.link_ids[link_id] = {
+                "orderId": order_id, "orderLinkId": link_id, "symbol": symbol, "side": side, "qty": qty_text,
+                "orderType": order_type, "orderStatus": "Filled" if order_type == "Market" else "New",
+                "createdTime": str(int(time.time() * 1000))
+            }
+
+        if order_type == "Market":
+            self._fill(account, position, side, qty, price)
+            if stop_loss:
+                position.stop_loss = stop_loss
+        else:
+            account.orders.setdefault(symbol, {})[order_id] = Order(
+                order_id, link_id, symbol, side, limit_price, qty, reduce_only, time.time()
+            )
+            self._match(symbol, price)
+
+        return {"orderId": order_id, "orderLinkId": link_id}
+
+    def orders(self, api_key: str, symbol: str = "", order_link_id: str = "") -> dict[str, Any]:
+        """Активные ордера, как /v5/order/realtime: исполненные и отменённые есть только в order_history"""
+        account = self.account(api_key)
+        if order_link_id:
+            order = account.link_ids.get(order_link_id)
+            items = [order] if order and order["orderStatus"] in OPEN_STATUSES else []
+        else:
+            items = [
+                {"orderId": order.order_id, "orderLinkId": order.order_link_id, "symbol": order.symbol,
+                 "side": order.side, "price": f"{order.price:g}", "qty": f"{order.qty:g}", "orderType": "Limit",
+                 "orderStatus": "New", "reduceOnly": order.reduce_only}
+                for name, orders in account.orders.items() if not symbol or name == symbol
+                for order in orders.values()
+            ]
+        return {"category": "linear", "list": items, "nextPageCursor": ""}
+
+    def order_history(self, api_key: str, symbol: str = "", order_link_id: str = "") -> dict[str, Any]:
+        """Закрытые ордера с orderLinkId, как /v5/order/history"""
+        account = self.account(api_key)
+        items = [
+            order for link_id, order in account.link_ids.items()
+            if order["orderStatus"] not in OPEN_STATUSES
+            and (not order_link_id or link_id == order_link_id) and (not symbol or order["symbol"] == symbol)
+        ]
+        return {"category": "linear", "list": items, "nextPageCursor": ""}
+
+    def create_batch(self, api_key: str, request: list[dict[str, Any]]) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Пакет ордеров: ошибки по каждому ордеру в retExtInfo, как у биржи"""
+        results, codes = [], []
+        for params in request[:20]:
+            try:
+                result = self.create_order(api_key, params)
+                codes.append({"code": 0, "msg": "OK"})
+            except ExchangeError as e:
+                result = {"orderId": "", "orderLinkId": params.get("orderLinkId", "")}
+                codes.append({"code": e.code, "msg": str(e)})
+            results.append({"category": "linear", "symbol": params.get("symbol", ""), **result})
+        return {"list": results}, {"list": codes}
+
+    def _fill(self, account: Account, position: Position, side: str, qty: float, price: float) -> None:
+        """Исполнение объёма по позиции one-way: наращивание, сокращение или разворот"""
+        account.fills += 1
+
+        if not position.size or position.side == side:
+            total = position.size + qty
+            position.avg_price = (position.avg_price * position.size + price * qty) / total
+            position.size, position.side = total, side
+            return
+
+        closed = min(qty, position.size)
+        direction = 1 if position.side == "Buy" else -1
+        account.realized_pnl += direction * (price - position.avg_price) * closed
+        position.size -= closed
+
+        if position.size <= 1e-12:
+            position.size, position.avg_price, position.stop_loss, position.side = 0.0, 0.0, 0.0, ""
+            orders = account.orders.get(position.symbol, {})
+            for order_id in [order_id for order_id, order in orders.items() if order.reduce_only]:
+                self._close(account, orders.pop(order_id), "Cancelled")
+
+        if qty > closed:
+            self._fill(account, position, side, qty - closed, price)
+
+    @staticmethod
+    def _close(account: Account, order: Order, status: str) -> None:
+        record = account.link_ids.get(order.order_link_id)
+        if record:
+            record["orderStatus"] = status
+
+    def _match(self, symbol: str, price: float) -> None:
+        """Исполнение лимитных ордеров и стопов, достигнутых ценой"""
+        for account in self.accounts.values():
+            position = account.positions.get(symbol)
+
+            if position and position.size and position.stop_loss:
+                long = position.side == "Buy"
+                if (long and price <= position.stop_loss) or (not long and price >= position.stop_loss):
+                    self._fill(account, position, "Sell" if long else "Buy", position.size, price)
+
+            orders = account.orders.get(symbol)
+            if not orders:
+                continue
+
+            # Словарь хранит ордера в порядке выставления; исполнение может снять reduce-only ордера
+            for order in list(orders.values()):
+                if order.order_id not in orders:
+                    continue
+                if (order.side == "Sell" and price >= order.price) or (order.side == "Buy" and price <= order.price):
+                    self._close(account, orders.pop(order.order_id), "Filled")
+                    position = account.positions.setdefault(symbol, Position(symbol))
+                    qty = min(order.qty, position.size) if order.reduce_only else order.qty
+                    if qty > 0:
+                        self._fill(account, position, order.side, qty, order.price)
@@ -0,0 +1,171 @@
+# trading/paper/server.py
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+from trading.paper.exchange import SERVICE_ERROR, ExchangeError, PaperExchange
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PaperExchangeServer:
+    """REST API Bybit v5 поверх PaperExchange: HTTP/1.1 keep-alive на asyncio.
+
+    Задержка ответа не блокирует цикл событий, поэтому сервер держит тысячи запросов
+    в секунду от многих соединений. error_rate (общая или по пути) отвечает retCode 10016.
+    Доля slow_rate запросов задерживается на slow_ms до или после исполнения: хвост задержек
+    и потерянный ответ на уже принятый ордер.
+    """
+
+    def __init__(self, exchange: PaperExchange, host: str = "127.0.0.1", port: int = 0,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 errors: dict[str, float] | None = None, seed: int | None = None,
+                 slow_rate: float = 0.0, slow_ms: float = 0.0):
+        self.exchange = exchange
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.errors = errors or {}
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.requests = 0
+        self.injected_errors = 0
+        self._rng = random.Random(seed)
+        self._server: asyncio.AbstractServer | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+        self._routes = {
+            ("GET", "/v5/market/instruments-info"): lambda key, p: exchange.instruments_info(p.get("symbol", "")),
+            ("GET", "/v5/market/tickers"): lambda key, p: exchange.tickers(p.get("symbol", "")),
+            ("GET", "/v5/market/time"): lambda key, p: {"timeSecond": str(int(time.time())),
+                                                        "timeNano": str(time.time_ns())},
+            ("GET", "/v5/position/list"): lambda key, p: exchange.positions(key, p.get("symbol", "")),
+            ("POST", "/v5/position/set-leverage"): lambda key, p: exchange.set_leverage(
+                key, p.get("symbol", ""), str(p.get("buyLeverage")), str(p.get("sellLeverage"))
+            ),
+            ("GET", "/v5/order/realtime"): lambda key, p: exchange.orders(
+                key, p.get("symbol", ""), p.get("orderLinkId", "")
+            ),
+            ("GET", "/v5/order/history"): lambda key, p: exchange.order_history(
+                key, p.get("symbol", ""), p.get("orderLinkId", "")
+            ),
+            ("POST", "/v5/order/create"): lambda key, p: exchange.create_order(key, p),
+            ("POST", "/v5/order/create-batch"): lambda key, p: exchange.create_batch(key, p.get("request", [])),
+        }
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Симулятор Bybit v5 слушает {self.url}")
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self) -> str:
+        """Запуск в отдельном потоке со своим циклом событий; возвращает URL"""
+        ready = threading.Event()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="paper-exchange", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self.url
+
+    def stop(self) -> None:
+        """Остановка сервера, запущенного start_in_thread"""
+        if self._loop and self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=5)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+    async def _shutdown(self) -> None:
+        self._server.close()
+        connections = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in connections:
+            task.cancel()
+        await asyncio.gather(*connections, return_exceptions=True)
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self._respond(method, target, headers, body)
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method: str, target: str, headers: dict[str, str], body: bytes) -> tuple[str, bytes]:
+        self.requests += 1
+        url = urlsplit(target)
+        route = self._routes.get((method, url.path))
+        if route is None:
+            return "404 Not Found", b"{}"
+
+        delay = self.latency_ms + (self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        slow_before = slow_after = 0.0
+        if self.slow_rate and self._rng.random() < self.slow_rate:
+            if self._rng.random() < 0.5:
+                slow_before = self.slow_ms
+            else:
+                slow_after = self.slow_ms
+        if delay + slow_before:
+            await asyncio.sleep((delay + slow_before) / 1000)
+
+        params: dict[str, Any] = dict(parse_qsl(url.query)) if method == "GET" else json.loads(body or b"{}")
+        response = {"retCode": 0, "retMsg": "OK", "result": {}, "retExtInfo": {}, "time": int(time.time() * 1000)}
+
+        if self._rng.random() < self.errors.get(url.path, self.error_rate):
+            self.injected_errors += 1
+            response.update(retCode=SERVICE_ERROR, retMsg="Server Timeout")
+        else:
+            try:
+                result = route(headers.get("x-bapi-api-key", ""), params)
+                if isinstance(result, tuple):
+                    response["result"], response["retExtInfo"] = result
+                else:
+                    response["result"] = result
+            except ExchangeError as e:
+                response.update(retCode=e.code, retMsg=str(e))
+
+        if slow_after:
+            await asyncio.sleep(slow_after / 1000)
+        return "200 OK", json.dumps(response).encode()
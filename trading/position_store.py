@@ -0,0 +1,190 @@
+# trading/position_store.py
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+from trading.private_stream import PrivateStream
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+OPEN_STATUSES = {"New", "PartiallyFilled", "Untriggered"}
+
+
+@dataclass(frozen=True)
+class PositionInfo:
+    symbol: str
+    side: str
+    size: str
+    avg_price: float
+
+    @property
+    def direction(self) -> str:
+        return "Long" if self.side == "Buy" else "Short"
+
+
+@dataclass(frozen=True)
+class OpenOrder:
+    order_id: str
+    order_link_id: str
+    symbol: str
+    side: str
+    price: str
+    qty: str
+    reduce_only: bool
+
+    @classmethod
+    def from_response(cls, item: dict[str, Any]) -> "OpenOrder":
+        return cls(
+            order_id=item.get("orderId", ""),
+            order_link_id=item.get("orderLinkId", ""),
+            symbol=item.get("symbol", ""),
+            side=item.get("side", ""),
+            price=item.get("price", ""),
+            qty=item.get("leavesQty") or item.get("qty", ""),
+            reduce_only=bool(item.get("reduceOnly"))
+        )
+
+
+class PositionStore:
+    """Открытые позиции и лимитные ордера аккаунта: снапшот REST и приватные потоки position/order"""
+
+    POSITIONS_PAGE_LIMIT = 200
+    ORDERS_PAGE_LIMIT = 50
+
+    def __init__(self, client, stream: PrivateStream):
+        self.client = client
+        self.stream = stream
+        self._positions: dict[str, PositionInfo] = {}
+        self._orders: dict[str, dict[str, OpenOrder]] = {}
+        self._updated_at: dict[str, float] = {}
+        self._orders_touched: set[str] | None = None
+        self._lock = threading.Lock()
+        self.stream.subscribe("position", self._on_positions)
+        self.stream.subscribe("order", self._on_orders)
+
+    @property
+    def is_connected(self) -> bool:
+        return self.stream.is_connected
+
+    def load(self) -> None:
+        """Снапшот открытых позиций и ордеров по всем линейным USDT-символам"""
+        # Поток запускается параллельно со снапшотом: позиции и ордера, обновлённые потоком после начала
+        # загрузки, снапшот не трогает, иначе устаревший ответ REST затрёт более свежее сообщение
+        started = time.monotonic()
+        with self._lock:
+            self._orders_touched = set()
+
+        try:
+            positions = self._fetch_pages(self.client.get_positions, self.POSITIONS_PAGE_LIMIT)
+            orders = self._fetch_pages(self.client.get_open_orders, self.ORDERS_PAGE_LIMIT)
+        except Exception as e:
+            logger.error(f"Ошибка загрузки позиций и ордеров: {e}", exc_info=True)
+            with self._lock:
+                self._orders_touched = None
+            return
+
+        self._on_positions(positions, since=started)
+        self._on_orders(orders, snapshot=True)
+        logger.info(f"Загружено открытых позиций: {len(self._positions)}, "
+                    f"ордеров: {sum(len(orders) for orders in self._orders.values())}")
+
+    def _fetch_pages(self, method, limit: int) -> list[dict[str, Any]]:
+        items = []
+        cursor = ""
+
+        while True:
+            params = {"category": "linear", "settleCoin": "USDT", "limit": limit}
+            if cursor:
+                params["cursor"] = cursor
+
+            resp = method(**params)
+
+            if not isinstance(resp, dict) or resp.get("retCode") != 0:
+                raise RuntimeError(f"{method.__name__}: {resp}")
+
+            result = resp.get("result", {})
+            items.extend(result.get("list", []))
+
+            cursor = result.get("nextPageCursor", "")
+            if not cursor:
+                return items
+
+    def position(self, symbol: str) -> PositionInfo | None:
+        """Открытая позиция по символу"""
+        return self._positions.get(symbol)
+
+    def take_profits(self, symbol: str) -> list[OpenOrder]:
+        """Активные reduce-only лимитные ордера символа"""
+        return [order for order in self._orders.get(symbol, {}).values() if order.reduce_only]
+
+    def record_fill(self, symbol: str, side: str, qty: str, price: float, since: float) -> None:
+        """Учёт собственного исполнения до сообщения потока, если поток не обновил символ после since"""
+        with self._lock:
+            if self._updated_at.get(symbol, 0.0) > since:
+                return
+
+            current = self._positions.get(symbol)
+            size = float(qty)
+
+            if current and current.side != side:
+                size = float(current.size) - size
+                side = current.side if size > 0 else side
+                size = abs(size)
+            elif current:
+                price = (current.avg_price * float(current.size) + price * size) / (float(current.size) + size)
+                size += float(current.size)
+
+            if size > 0:
+                self._positions[symbol] = PositionInfo(symbol, side, f"{size:g}", price)
+            else:
+                self._positions.pop(symbol, None)
+
+    def _on_positions(self, items: list[dict[str, Any]], since: float | None = None) -> None:
+        """Обновление позиций по данным REST или потока position; since пропускает символы, обновлённые позже"""
+        now = time.monotonic()
+
+        with self._lock:
+            for item in items:
+                symbol = item.get("symbol")
+                if not symbol or since is not None and self._updated_at.get(symbol, 0.0) > since:
+                    continue
+
+                self._updated_at[symbol] = now
+                size = item.get("size", "0")
+
+                if not item.get("side") or not float(size or 0):
+                    self._positions.pop(symbol, None)
+                    continue
+
+                self._positions[symbol] = PositionInfo(
+                    symbol=symbol,
+                    side=item["side"],
+                    size=size,
+                    avg_price=float(item.get("avgPrice") or item.get("entryPrice") or 0)
+                )
+
+    def _on_orders(self, items: list[dict[str, Any]], snapshot: bool = False) -> None:
+        """Обновление лимитных ордеров по данным REST или потока order"""
+        with self._lock:
+            skip = (self._orders_touched or set()) if snapshot else set()
+            if snapshot:
+                self._orders_touched = None
+
+            for item in items:
+                # Условные ордера (SL позиции) хранятся биржей отдельно и здесь не нужны
+                if item.get("orderType") != "Limit" or item.get("stopOrderType"):
+                    continue
+
+                order = OpenOrder.from_response(item)
+                if order.order_id in skip:
+                    continue
+                if self._orders_touched is not None:
+                    self._orders_touched.add(order.order_id)
+
+                orders = self._orders.setdefault(order.symbol, {})
+
+                if item.get("orderStatus") in OPEN_STATUSES:
+                    orders[order.order_id] = order
+                else:
+                    orders.pop(order.order_id, None)
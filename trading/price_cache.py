@@ -0,0 +1,79 @@
+# trading/price_cache.py
+import time
+from typing import Any
+from trading.ws_client import WebSocketClient
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PriceCache:
+    """Таблица последних цен из публичного потока tickers"""
+
+    def __init__(self, url: str, max_age: float = 5, ping_interval: float = 20):
+        self.max_age = max_age
+        self._prices: dict[str, tuple[float, float, float]] = {}
+        self._ws = WebSocketClient(url, "tickers", self._on_message, ping_interval=ping_interval)
+
+    @property
+    def is_connected(self) -> bool:
+        return self._ws.is_connected
+
+    def start(self, symbols: list[str]) -> None:
+        """Подписка на тикеры и запуск потока"""
+        self._ws.subscribe([f"tickers.{symbol}" for symbol in symbols])
+        self._ws.start()
+        logger.info(f"Поток цен запущен для {len(symbols)} символов")
+
+    def stop(self) -> None:
+        self._ws.stop()
+
+    def watch(self, symbol: str) -> None:
+        """Добавление символа в подписку"""
+        self._ws.subscribe([f"tickers.{symbol}"])
+
+    def get_last_price(self, symbol: str) -> float | None:
+        """Последняя цена, если она не старше max_age"""
+        entry = self._prices.get(symbol)
+        if entry is None:
+            return None
+
+        last_price, _, updated_at = entry
+        if not last_price or time.monotonic() - updated_at > self.max_age:
+            return None
+
+        return last_price
+
+    def get_mark_price(self, symbol: str) -> float | None:
+        """Последняя маркировочная цена, если она не старше max_age"""
+        entry = self._prices.get(symbol)
+        if entry is None:
+            return None
+
+        _, mark_price, updated_at = entry
+        if not mark_price or time.monotonic() - updated_at > self.max_age:
+            return None
+
+        return mark_price
+
+    def age(self, symbol: str) -> float | None:
+        """Возраст цены символа в секундах"""
+        entry = self._prices.get(symbol)
+        if entry is None:
+            return None
+        return time.monotonic() - entry[2]
+
+    def _on_message(self, message: dict[str, Any]) -> None:
+        """Обработка снапшота или дельты тикера"""
+        topic = message.get("topic", "")
+        if not topic.startswith("tickers."):
+            return
+
+        data = message.get("data", {})
+        symbol = data.get("symbol") or topic[len("tickers."):]
+
+        previous = self._prices.get(symbol, (0.0, 0.0, 0.0))
+        last_price = float(data["lastPrice"]) if data.get("lastPrice") else previous[0]
+        mark_price = float(data["markPrice"]) if data.get("markPrice") else previous[1]
+
+        self._prices[symbol] = (last_price, mark_price, time.monotonic())
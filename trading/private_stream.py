@@ -0,0 +1,43 @@
+# trading/private_stream.py
+from typing import Any, Callable
+from trading.ws_client import WebSocketClient
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PrivateStream:
+    """Общее приватное WebSocket-соединение аккаунта с разбором по топикам"""
+
+    def __init__(self, url: str, api_key: str, api_secret: str, ready_timeout: float = 5):
+        self.ready_timeout = ready_timeout
+        self._handlers: dict[str, list[Callable[[list[dict[str, Any]]], None]]] = {}
+        self._ws = WebSocketClient(url, "private", self._on_message, api_key=api_key, api_secret=api_secret)
+
+    @property
+    def is_connected(self) -> bool:
+        return self._ws.is_connected
+
+    def subscribe(self, topic: str, handler: Callable[[list[dict[str, Any]]], None]) -> None:
+        """Регистрация обработчика данных топика"""
+        self._handlers.setdefault(topic, []).append(handler)
+        self._ws.subscribe([topic])
+
+    def start(self) -> None:
+        """Подключение и ожидание авторизации"""
+        self._ws.start()
+        if not self._ws.wait_ready(self.ready_timeout):
+            logger.warning("Приватный поток не подключился, работаем без него до подключения")
+
+    def stop(self) -> None:
+        self._ws.stop()
+
+    def _on_message(self, message: dict[str, Any]) -> None:
+        """Передача данных обработчикам топика"""
+        topic = message.get("topic", "")
+        data = message.get("data", [])
+        if isinstance(data, dict):
+            data = [data]
+
+        for handler in self._handlers.get(topic, []):
+            handler(data)
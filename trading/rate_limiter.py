@@ -0,0 +1,277 @@
+# trading/rate_limiter.py
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable
+from pybit.exceptions import InvalidRequestError
+from trading.config import TradingConfig
+from utils.logger import get_logger
+from utils.tracing import LatencyHistogram
+
+logger = get_logger(__name__)
+
+RATE_LIMIT_CODE = 10006
+EXHAUSTED_BACKOFF = 1.0
+ORDER_WAIT_WARNING_MS = 50
+
+LANE_ORDER = 0
+LANE_ACCOUNT = 1
+LANE_MARKET = 2
+LANE_NAMES = {LANE_ORDER: "order", LANE_ACCOUNT: "account", LANE_MARKET: "market"}
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """Эндпоинт Bybit: полоса приоритета и лимит UID в секунду (0 — только общий лимит IP)"""
+
+    path: str
+    lane: int
+    per_second: float = 0
+
+
+ENDPOINTS = {
+    "place_order": Endpoint("/v5/order/create", LANE_ORDER, 10),
+    "place_batch_order": Endpoint("/v5/order/create-batch", LANE_ORDER, 10),
+    "cancel_all_orders": Endpoint("/v5/order/cancel-all", LANE_ORDER, 10),
+    "set_leverage": Endpoint("/v5/position/set-leverage", LANE_ACCOUNT, 10),
+    "get_positions": Endpoint("/v5/position/list", LANE_ACCOUNT, 50),
+    "get_open_orders": Endpoint("/v5/order/realtime", LANE_ACCOUNT, 50),
+    "get_order_history": Endpoint("/v5/order/history", LANE_ACCOUNT, 50),
+    "get_wallet_balance": Endpoint("/v5/account/wallet-balance", LANE_ACCOUNT, 50),
+    "get_tickers": Endpoint("/v5/market/tickers", LANE_MARKET),
+    "get_instruments_info": Endpoint("/v5/market/instruments-info", LANE_MARKET),
+}
+
+
+class TokenBucket:
+    """Ведро токенов с очередью ожидающих по приоритету полосы"""
+
+    def __init__(self, name: str, rate: float, capacity: float | None = None):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.throttled = 0
+        self.exhausted = 0
+        self._updated = time.monotonic()
+        self._waiting: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def acquire(self, priority: int, reserve: float = 0) -> bool:
+        """Ожидание токена в порядке приоритета; reserve — токены, которые вызову брать нельзя.
+
+        Возвращает True, если вызову пришлось ждать.
+        """
+        ticket = (priority, next(self._seq))
+        need = 1 + min(reserve, self.capacity - 1)
+        waited = False
+
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    is_head = self._waiting[0] == ticket
+
+                    if is_head and self.tokens >= need:
+                        self.tokens -= 1
+                        break
+
+                    waited = True
+                    self._cond.wait(self._until_available(need, now) if is_head else None)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+            if waited:
+                self.throttled += 1
+
+        return waited
+
+    def sync(self, limit: int, remaining: int, reset_at: float) -> None:
+        """Синхронизация с заголовками X-Bapi-Limit*; reset_at — время сброса по time.time()"""
+        with self._cond:
+            now = time.monotonic()
+            if limit and limit != self.capacity:
+                self.capacity = self.rate = float(limit)
+
+            self._refill(now)
+            self.tokens = min(self.tokens, remaining)
+
+            if remaining <= 0:
+                self.exhausted += 1
+                self.block(max(reset_at - time.time(), 0), now)
+
+            self._cond.notify_all()
+
+    def block(self, seconds: float, now: float | None = None) -> None:
+        """Пустое ведро без пополнения на seconds секунд"""
+        with self._cond:
+            now = now or time.monotonic()
+            self.tokens = 0
+            self._updated = max(self._updated, now + seconds)
+            self._cond.notify_all()
+
+    def _refill(self, now: float) -> None:
+        # _updated в будущем означает блокировку до сброса окна биржи
+        if now > self._updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def _until_available(self, need: float, now: float) -> float:
+        blocked = max(self._updated - now, 0)
+        return max(blocked + max(need - self.tokens, 0) / self.rate, 0.001)
+
+
+class RateLimitScheduler:
+    """Очередь вызовов Bybit одного аккаунта: лимиты эндпоинтов UID и общий лимит IP"""
+
+    def __init__(self, account: str = "main", ip: TokenBucket | None = None,
+                 market_reserve: float = TradingConfig.RATE_LIMIT_MARKET_RESERVE):
+        self.account = account
+        self.ip = ip or ip_bucket
+        self.market_reserve = market_reserve
+        self.buckets: dict[str, TokenBucket] = {}
+        self.waits = {lane: LatencyHistogram() for lane in LANE_NAMES}
+        self.requeued = 0
+        self._lock = threading.Lock()
+        _schedulers.append(self)
+
+    def bucket(self, endpoint: Endpoint) -> TokenBucket | None:
+        """Ведро лимита эндпоинта для аккаунта"""
+        if not endpoint.per_second:
+            return None
+
+        bucket = self.buckets.get(endpoint.path)
+        if bucket is None:
+            with self._lock:
+                bucket = self.buckets.setdefault(endpoint.path, TokenBucket(endpoint.path, endpoint.per_second))
+        return bucket
+
+    def acquire(self, endpoint: Endpoint) -> None:
+        """Ожидание токенов эндпоинта и IP; рыночные запросы не трогают резерв ордеров"""
+        started = time.perf_counter()
+
+        bucket = self.bucket(endpoint)
+        if bucket:
+            bucket.acquire(endpoint.lane)
+
+        reserve = self.ip.capacity * self.market_reserve if endpoint.lane == LANE_MARKET else 0
+        self.ip.acquire(endpoint.lane, reserve)
+
+        wait_ms = (time.perf_counter() - started) * 1000
+        self.waits[endpoint.lane].record(wait_ms)
+
+        if endpoint.lane == LANE_ORDER and wait_ms > ORDER_WAIT_WARNING_MS:
+            logger.warning(f"[{self.account}] {endpoint.path} ждал лимита {wait_ms:.0f} мс")
+
+    def call(self, endpoint: Endpoint, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Вызов через очередь; ответ 10006 возвращает вызов в очередь до сброса окна"""
+        while True:
+            self.acquire(endpoint)
+
+            try:
+                result = func(*args, **kwargs)
+            except InvalidRequestError as e:
+                if e.status_code != RATE_LIMIT_CODE:
+                    raise
+
+                self.requeued += 1
+                bucket = self.bucket(endpoint) or self.ip
+                if not self._sync(bucket, e.resp_headers):
+                    bucket.block(EXHAUSTED_BACKOFF)
+                logger.warning(f"[{self.account}] Лимит {endpoint.path} исчерпан, вызов возвращён в очередь")
+                continue
+
+            if isinstance(result, tuple):
+                result, _, headers = result
+                bucket = self.bucket(endpoint)
+                if bucket:
+                    self._sync(bucket, headers)
+
+            return result
+
+    @staticmethod
+    def _sync(bucket: TokenBucket, headers: Any) -> bool:
+        """Обновление ведра по заголовкам ответа; False, если заголовков лимита нет"""
+        if not headers or "X-Bapi-Limit-Status" not in headers:
+            return False
+
+        try:
+            bucket.sync(
+                int(headers.get("X-Bapi-Limit", 0)),
+                int(headers["X-Bapi-Limit-Status"]),
+                int(headers.get("X-Bapi-Limit-Reset-Timestamp", 0)) / 1000
+            )
+            return True
+        except ValueError:
+            return False
+
+
+class RateLimitedClient:
+    """Прокси HTTP-клиента (pybit или BybitRestClient): каждый вызов API проходит через планировщик лимитов"""
+
+    def __init__(self, client, scheduler: RateLimitScheduler):
+        client.return_response_headers = True
+        client.retry_codes = set(client.retry_codes) - {RATE_LIMIT_CODE}
+        object.__setattr__(self, "_client", client)
+        object.__setattr__(self, "scheduler", scheduler)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        endpoint = ENDPOINTS.get(name) or Endpoint(name, LANE_MARKET)
+        return partial(self.scheduler.call, endpoint, attr)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._client, name, value)
+
+
+_schedulers: list[RateLimitScheduler] = []
+
+# Лимит IP общий для всех аккаунтов процесса
+ip_bucket = TokenBucket("ip", TradingConfig.RATE_LIMIT_IP_PER_SECOND)
+
+
+def export_metrics(namespace: str = "pulse") -> str:
+    """Метрики очереди лимитов в формате Prometheus"""
+    wait = f"{namespace}_rate_limit_wait_ms"
+    lines = [
+        f"# HELP {wait} Time Bybit calls spent queued for rate limit tokens in milliseconds",
+        f"# TYPE {wait} summary"
+    ]
+    for scheduler in _schedulers:
+        for lane, histogram in scheduler.waits.items():
+            labels = f'account="{scheduler.account}",lane="{LANE_NAMES[lane]}"'
+            for quantile in (0.5, 0.99):
+                lines.append(f'{wait}{{{labels},quantile="{quantile}"}} {histogram.percentile(quantile):.3f}')
+            lines.append(f"{wait}_sum{{{labels}}} {histogram.sum_ms:.3f}")
+            lines.append(f"{wait}_count{{{labels}}} {histogram.count}")
+
+    buckets = [("all", ip_bucket)] + [
+        (scheduler.account, bucket) for scheduler in _schedulers for bucket in scheduler.buckets.values()
+    ]
+    for metric, kind, help_text, value in (
+        ("rate_limit_throttled_total", "counter", "Calls that had to wait for a token",
+         lambda bucket: bucket.throttled),
+        ("rate_limit_exhausted_total", "counter", "Responses reporting an exhausted limit window",
+         lambda bucket: bucket.exhausted),
+        ("rate_limit_tokens", "gauge", "Tokens left in the bucket", lambda bucket: f"{bucket.tokens:.2f}"),
+    ):
+        lines += [f"# HELP {namespace}_{metric} {help_text}", f"# TYPE {namespace}_{metric} {kind}"]
+        lines += [f'{namespace}_{metric}{{account="{account}",bucket="{bucket.name}"}} {value(bucket)}'
+                  for account, bucket in buckets]
+
+    requeued = f"{namespace}_rate_limit_requeued_total"
+    lines += [f"# HELP {requeued} Calls rejected with retCode 10006 and queued again", f"# TYPE {requeued} counter"]
+    lines += [f'{requeued}{{account="{scheduler.account}"}} {scheduler.requeued}' for scheduler in _schedulers]
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,64 @@
+# trading/signal_dispatcher.py
+import asyncio
+from signals.parser.models import Signal
+from trading.sizing import SizingProfile
+from trading.trade_engine import TradeEngine
+from utils.logger import get_logger
+from utils.tracing import Trace, tracer
+
+logger = get_logger(__name__)
+
+
+class SignalDispatcher:
+    """Параллельное исполнение сигналов с сохранением порядка внутри символа"""
+
+    def __init__(self, trade_engine: TradeEngine, finish_traces: bool = True):
+        self.trade_engine = trade_engine
+        self.finish_traces = finish_traces
+        self._symbol_locks: dict[str, asyncio.Lock] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(self, signal: Signal, trace: Trace | None = None,
+               sizing: SizingProfile | None = None) -> asyncio.Task:
+        """Постановка сигнала в исполнение без ожидания результата"""
+        symbol = signal.ticker.replace("/", "")
+        lock = self._symbol_locks.setdefault(symbol, asyncio.Lock())
+
+        trace = trace or Trace(name=f"{signal.ticker} {signal.direction}")
+        task = asyncio.create_task(self._run(signal, lock, trace, sizing), name=f"signal-{symbol}")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, signal: Signal, lock: asyncio.Lock, trace: Trace, sizing: SizingProfile | None) -> bool:
+        """Исполнение сигнала под блокировкой символа"""
+        async with lock:
+            trace.mark("execution_start")
+            try:
+                return await self.trade_engine.execute_signal(signal, trace, sizing)
+            finally:
+                if self.finish_traces:
+                    tracer.finish(trace)
+
+    @property
+    def in_flight(self) -> int:
+        """Количество сигналов в исполнении или ожидании"""
+        return len(self._tasks)
+
+    async def close(self, timeout: float = 30) -> None:
+        """Ожидание завершения сигналов, уже отправленных на биржу"""
+        if not self._tasks:
+            return
+
+        logger.info(f"Ожидание завершения {len(self._tasks)} сигналов")
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+
+        for task in pending:
+            task.cancel()
+
+        if pending:
+            logger.warning(f"Не дождались завершения {len(pending)} сигналов")
+            await asyncio.wait(pending)
+
+        # Даём отработать done-callback'ам завершённых задач (запись результатов в журнал)
+        await asyncio.sleep(0)
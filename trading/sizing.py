@@ -0,0 +1,99 @@
+# trading/sizing.py
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_CEILING
+
+# Запас на погрешность float при переводе в шаги: значение, лежащее на границе
+# шага в десятичной записи, не должно округлиться на шаг вниз
+EPSILON_FACTOR = 1 + 1e-12
+BASIS_POINTS = 10000
+
+
+def _decimals(value: Decimal) -> int:
+    exponent = value.as_tuple().exponent
+    return -exponent if exponent < 0 else 0
+
+
+def _format_units(units: int, decimals: int) -> str:
+    """Целое число единиц 10^-decimals в десятичную строку"""
+    if not decimals:
+        return str(units)
+
+    digits = str(units).rjust(decimals + 1, "0")
+    return f"{digits[:-decimals]}.{digits[-decimals:]}"
+
+
+@dataclass(frozen=True)
+class SizingProfile:
+    """Размер позиции для источника сигналов; None — значение из TradingConfig"""
+
+    amount: float | None = None
+    max_leverage: int | None = None
+    tp_percentages: tuple[float, ...] | None = None
+
+    def leverage(self, signal_leverage: int) -> int:
+        return min(signal_leverage, self.max_leverage) if self.max_leverage else signal_leverage
+
+
+def to_basis_points(percentages: list[float] | tuple[float, ...]) -> list[int]:
+    """Проценты уровней в целые базисные пункты"""
+    return [round(percent * 100) for percent in percentages]
+
+
+@dataclass(frozen=True)
+class SizingScale:
+    """Целочисленные шаги объёма и цены инструмента, вычисляемые один раз"""
+
+    qty_step_units: int
+    qty_decimals: int
+    min_qty_steps: int
+    tick_units: int
+    price_decimals: int
+    qty_multiplier: float
+    price_multiplier: float
+
+    @classmethod
+    def from_filters(cls, qty_step: str, min_qty: str, tick_size: str) -> "SizingScale":
+        """Разбор строковых фильтров биржи в целочисленные шкалы"""
+        step = Decimal(qty_step)
+        tick = Decimal(tick_size)
+        qty_decimals = _decimals(step)
+        price_decimals = _decimals(tick)
+        qty_step_units = int(step.scaleb(qty_decimals))
+        tick_units = int(tick.scaleb(price_decimals))
+
+        return cls(
+            qty_step_units=qty_step_units,
+            qty_decimals=qty_decimals,
+            min_qty_steps=int((Decimal(min_qty or "0") / step).to_integral_value(rounding=ROUND_CEILING)),
+            tick_units=tick_units,
+            price_decimals=price_decimals,
+            qty_multiplier=10 ** qty_decimals / qty_step_units,
+            price_multiplier=10 ** price_decimals / tick_units
+        )
+
+    def qty_steps(self, qty: float) -> int:
+        """Количество целых шагов объёма в qty (округление вниз)"""
+        return max(0, int(qty * self.qty_multiplier * EPSILON_FACTOR))
+
+    def price_ticks(self, price: float) -> int:
+        """Количество целых тиков в цене (округление вниз)"""
+        return max(0, int(price * self.price_multiplier * EPSILON_FACTOR))
+
+    def format_qty(self, steps: int) -> str:
+        return _format_units(steps * self.qty_step_units, self.qty_decimals)
+
+    def format_price(self, ticks: int) -> str:
+        return _format_units(ticks * self.tick_units, self.price_decimals)
+
+    def qty_value(self, steps: int) -> float:
+        return steps / self.qty_multiplier
+
+    def allocate(self, total_steps: int, basis_points: list[int], remainder_to_last: bool = False) -> list[int]:
+        """Разбиение объёма по уровням в шагах; остаток округления достаётся последнему уровню"""
+        levels = [total_steps * points // BASIS_POINTS for points in basis_points]
+
+        if remainder_to_last and levels:
+            allocated = total_steps * sum(basis_points) // BASIS_POINTS
+            levels[-1] += allocated - sum(levels)
+
+        return levels
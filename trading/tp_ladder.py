@@ -0,0 +1,97 @@
+# trading/tp_ladder.py
+import asyncio
+from typing import Any
+from signals.parser.models import Signal
+from trading.config import TradingConfig
+from trading.sizing import SizingScale, to_basis_points
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TakeProfitLadder:
+    """Лестница TP, доставляемая по мере исполнения входа"""
+
+    def __init__(self, symbol: str, side: str, levels: list[tuple[int, str, int]],
+                 total_steps: int, scale: SizingScale, link_prefix: str = ""):
+        self.symbol = symbol
+        self.side = side
+        self.levels = levels
+        self.total_steps = total_steps
+        self.scale = scale
+        self.basis_points = [points for _, _, points in levels]
+        self.placed_steps = [0] * len(levels)
+        self.link_prefix = link_prefix
+        self.batches = [0] * len(levels)
+        self.filled_steps = 0
+        self.lock = asyncio.Lock()
+        self.complete = asyncio.Event()
+
+    @classmethod
+    def build(cls, signal: Signal, symbol: str, total_steps: int, scale: SizingScale,
+              tp_percentages: list[float] | tuple[float, ...] | None = None,
+              link_prefix: str = "") -> "TakeProfitLadder":
+        """Уровни TP сигнала с процентами из профиля или конфигурации"""
+        tp_percentages = tp_percentages or TradingConfig.get_tp_percentages()
+        levels = [
+            (i, scale.format_price(scale.price_ticks(tp_price)), points)
+            for i, (tp_price, points) in enumerate(zip(signal.take_profits, to_basis_points(tp_percentages)), start=1)
+            if points > 0
+        ]
+
+        return cls(
+            symbol=symbol,
+            side="Sell" if signal.direction == "Long" else "Buy",
+            levels=levels,
+            total_steps=total_steps,
+            scale=scale,
+            link_prefix=link_prefix
+        )
+
+    @property
+    def total_qty(self) -> float:
+        return self.scale.qty_value(self.total_steps)
+
+    @property
+    def filled_qty(self) -> float:
+        return self.scale.qty_value(self.filled_steps)
+
+    def top_up(self, filled_qty: float, final: bool = False) -> list[dict[str, Any]]:
+        """Ордера, доводящие каждый уровень до доли от исполненного объёма"""
+        self.filled_steps = max(self.filled_steps, min(self.scale.qty_steps(filled_qty), self.total_steps))
+        if self.filled_steps >= self.total_steps:
+            self.complete.set()
+            final = True
+
+        # Остаток округления отдаётся последнему уровню только в финальном расчёте:
+        # промежуточные цели монотонны, и уже выставленный объём не превышает итоговый
+        targets = self.scale.allocate(self.filled_steps, self.basis_points, remainder_to_last=final)
+        orders = []
+
+        for index, (number, price, _) in enumerate(self.levels):
+            delta_steps = targets[index] - self.placed_steps[index]
+
+            if delta_steps < max(self.scale.min_qty_steps, 1):
+                if final and self.placed_steps[index] == 0:
+                    logger.warning(f"TP{number}: объём {self.scale.format_qty(max(delta_steps, 0))} "
+                                   f"меньше минимального, пропускаем")
+                continue
+
+            self.placed_steps[index] += delta_steps
+            self.batches[index] += 1
+            orders.append({"level": index, "price": price, "qty": self.scale.format_qty(delta_steps),
+                           "steps": delta_steps, "link_id": self._link_id(number, self.batches[index])})
+
+        return orders
+
+    def _link_id(self, number: int, batch: int) -> str:
+        """orderLinkId уровня: повтор после отката получает тот же id, и биржа не примет его дважды"""
+        if not self.link_prefix:
+            return ""
+        return f"{self.link_prefix}-t{number}" + (f"-{batch}" if batch > 1 else "")
+
+    def rollback(self, orders: list[dict[str, Any]]) -> None:
+        """Возврат объёма ордеров, которые не удалось выставить"""
+        for order in orders:
+            self.placed_steps[order["level"]] -= order["steps"]
+            self.batches[order["level"]] -= 1
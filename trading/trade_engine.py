@@ -1,93 +1,350 @@
 # trading/trade_engine.py
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+import logging
+import threading
+import time
+from typing import Any, Callable
 from signals.parser.models import Signal
+from trading.accounts import Account, AccountConfig, AccountRegistry, load_accounts
 from trading.bybit_api import BybitAPI
 from trading.config import TradingConfig
+from trading.hedged_transport import order_link_prefix
+from trading.price_cache import PriceCache
+from trading.sizing import SizingProfile, SizingScale
+from trading.tp_ladder import TakeProfitLadder
 from utils.logger import get_logger
+from utils.tracing import Trace
 
 logger = get_logger(__name__)
 
 
+class PreTradeError(Exception):
+    def __init__(self, message: str, level: int = logging.ERROR):
+        super().__init__(message)
+        self.level = level
+
+
+@dataclass
+class ExecutionResult:
+    """Итог исполнения сигнала на одном аккаунте"""
+
+    account: str
+    success: bool
+    qty: str = ""
+    filled_at: float | None = None
+
+
 class TradeEngine:
-    def __init__(self):
-        self.api = BybitAPI()
+    def __init__(self, executor: ThreadPoolExecutor | None = None, accounts: list[AccountConfig] | None = None):
+        self.prices = PriceCache(TradingConfig.BYBIT_WS_PUBLIC_URL, TradingConfig.PRICE_MAX_AGE) \
+            if TradingConfig.PRICE_STREAM else None
+        self.accounts = AccountRegistry(accounts or load_accounts(TradingConfig.ACCOUNTS_FILE), self.prices)
+        self.api = self.accounts.primary.api
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=max(TradingConfig.EXECUTOR_WORKERS, 4 * len(self.accounts)),
+            thread_name_prefix="bybit"
+        )
+
+    async def start(self) -> None:
+        """Загрузка справочных данных биржи перед приёмом сигналов"""
+        await asyncio.gather(*(self._call(func) for func in self.accounts.startup_steps()))
 
-    def execute_signal(self, signal: Signal) -> None:
-        """Исполнение торгового сигнала"""
+        if self.prices:
+            symbols = TradingConfig.PRICE_STREAM_SYMBOLS or self.accounts.instruments.symbols()
+            self.prices.start(symbols)
+
+        logger.info(f"Режим {TradingConfig.TRADING_MODE} ({self.api.client.endpoint}), аккаунтов исполнения: "
+                    f"{len(self.accounts)} ({', '.join(account.name for account in self.accounts)})")
+
+    async def _call(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Выполнение блокирующего вызова API в пуле потоков"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def _traced_call(self, trace: Trace, func: Callable[..., Any], *args: Any) -> Any:
+        """Вызов API с записью длительности в трассу"""
+        started = time.perf_counter()
         try:
-            symbol = signal.ticker.replace("/", "")
+            return await self._call(func, *args)
+        finally:
+            trace.add_span(f"bybit.{func.__name__}", (time.perf_counter() - started) * 1000)
+
+    async def _checked_step(self, trace: Trace, error: PreTradeError, func: Callable[..., Any], *args: Any) -> Any:
+        """Шаг подготовки: пустой результат считается ошибкой"""
+        result = await self._traced_call(trace, func, *args)
+        if not result:
+            raise error
+        return result
 
-            if not self.api.check_symbol_trading(symbol):
-                logger.warning(f"Символ {symbol} недоступен для торговли, пропускаем сигнал")
-                return
+    async def _pre_trade(self, api: BybitAPI, symbol: str, leverage: int, trace: Trace) -> tuple[float, SizingScale]:
+        """Параллельная подготовка: символ, плечо, цена и шкалы объёма/цены"""
+        started = time.perf_counter()
 
-            if not self.api.set_leverage(symbol, signal.leverage):
-                logger.error(f"Не удалось установить плечо для {symbol}, пропускаем сигнал")
-                return
+        steps = {
+            "check_symbol": (
+                PreTradeError(f"Символ {symbol} недоступен для торговли", logging.WARNING),
+                api.check_symbol_trading, symbol
+            ),
+            "set_leverage": (
+                PreTradeError(f"Не удалось установить плечо для {symbol}"),
+                api.set_leverage, symbol, leverage
+            ),
+            "last_price": (
+                PreTradeError(f"Не удалось получить цену для {symbol}"),
+                api.get_last_price, symbol
+            ),
+            "scale": (
+                PreTradeError(f"Не удалось получить фильтры для {symbol}"),
+                api.get_sizing_scale, symbol
+            ),
+        }
 
-            last_price = self.api.get_last_price(symbol)
-            if not last_price:
-                logger.error(f"Не удалось получить цену для {symbol}, пропускаем сигнал")
-                return
+        tasks = {
+            name: asyncio.create_task(self._checked_step(trace, error, func, *args))
+            for name, (error, func, *args) in steps.items()
+        }
 
-            filters = self.api.get_symbol_filters(symbol)
-            if not filters:
-                logger.error(f"Не удалось получить фильтры для {symbol}, пропускаем сигнал")
-                return
+        try:
+            done, _ = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception():
+                    raise task.exception()
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+        total = (time.perf_counter() - started) * 1000
+        trace.add_span("pre_trade", total)
+        steps_info = ", ".join(
+            f"{name}={trace.spans[f'bybit.{func.__name__}']:.1f}" for name, (_, func, *_) in steps.items()
+        )
+        logger.info(f"Подготовка {symbol}: {total:.1f} мс ({steps_info})")
+
+        return tasks["last_price"].result(), tasks["scale"].result()
+
+    async def execute_signal(self, signal: Signal, trace: Trace | None = None,
+                             sizing: SizingProfile | None = None) -> bool:
+        """Исполнение торгового сигнала параллельно на всех аккаунтах"""
+        trace = trace or Trace(name=f"{signal.ticker} {signal.direction}")
+        sizing = sizing or SizingProfile()
+
+        if len(self.accounts) == 1:
+            result = await self._execute_on_account(self.accounts.primary, signal, trace, sizing)
+            return result.success
+
+        branches = [(account, trace.child()) for account in self.accounts]
+        results = await asyncio.gather(*(
+            self._execute_on_account(account, signal, branch, sizing) for account, branch in branches
+        ))
 
-            margin = TradingConfig.BALANCE * TradingConfig.AMOUNT / 100
-            notional = margin * signal.leverage
-            qty = notional / last_price
-            qty_rounded = self.api.round_quantity(qty, filters["qty_step"])
+        for account, branch in branches:
+            trace.merge(branch, prefix=f"{account.name}.")
 
-            if qty_rounded < float(filters["min_qty"]):
-                logger.error(f"Объём {qty_rounded} меньше минимального {filters['min_qty']}, пропускаем сигнал")
-                return
+        self._report(signal, results, trace)
+        return any(result.success for result in results)
 
+    def _report(self, signal: Signal, results: list[ExecutionResult], trace: Trace) -> None:
+        """Сводка по аккаунтам и разброс времени исполнения между первым и последним"""
+        filled = sorted(result.filled_at for result in results if result.filled_at is not None)
+        spread = ""
+        if len(filled) > 1:
+            spread_ms = (filled[-1] - filled[0]) * 1000
+            trace.add_span("fanout.fill_spread", spread_ms)
+            spread = f", разброс исполнения {spread_ms:.1f} мс"
+
+        summary = ", ".join(
+            f"{result.account}={'ok ' + result.qty if result.success else 'ошибка'}" for result in results
+        )
+        succeeded = sum(result.success for result in results)
+        logger.info(f"Сигнал {signal.ticker} {signal.direction}: {succeeded}/{len(results)} аккаунтов "
+                    f"({summary}){spread}")
+
+    async def _execute_on_account(self, account: Account, signal: Signal, trace: Trace,
+                                  sizing: SizingProfile) -> ExecutionResult:
+        """Исполнение сигнала на одном аккаунте"""
+        api = account.api
+        failed = ExecutionResult(account.name, False)
+
+        try:
+            symbol = signal.ticker.replace("/", "")
             side = "Buy" if signal.direction == "Long" else "Sell"
-            sl_rounded = self.api.round_price(signal.stop_loss, filters["tick_size"])
 
-            order_id = self.api.place_market_order(symbol, side, qty_rounded, sl_rounded)
+            if not await self._resolve_existing(account, symbol, side, trace):
+                return failed
+
+            try:
+                leverage = account.leverage(sizing.leverage(signal.leverage))
+                last_price, scale = await self._pre_trade(api, symbol, leverage, trace)
+            except PreTradeError as e:
+                logger.log(e.level, f"[{account.name}] {e}, пропускаем сигнал")
+                return failed
+
+            margin = account.balance() * (sizing.amount or account.config.amount) / 100
+            notional = margin * leverage
+            qty_steps = scale.qty_steps(notional / last_price)
+            qty = scale.format_qty(qty_steps)
+
+            if qty_steps < scale.min_qty_steps or qty_steps <= 0:
+                logger.error(f"[{account.name}] Объём {qty} меньше минимального "
+                             f"{scale.format_qty(scale.min_qty_steps)}, пропускаем сигнал")
+                return failed
+
+            stop_loss = scale.format_price(scale.price_ticks(signal.stop_loss))
+            link_prefix = order_link_prefix(signal)
+            ladder = TakeProfitLadder.build(signal, symbol, qty_steps, scale, sizing.tp_percentages, link_prefix)
+
+            if account.fills and account.fills.is_connected:
+                return await self._execute_fill_driven(account, signal, ladder, stop_loss, last_price, trace)
+
+            sent_at = time.monotonic()
+            order_id = await self._traced_call(
+                trace, api.place_market_order, symbol, side, qty, stop_loss, f"{link_prefix}-e"
+            )
             if not order_id:
-                logger.error(f"Не удалось открыть позицию для {symbol}, пропускаем сигнал")
-                return
+                logger.error(f"[{account.name}] Не удалось открыть позицию для {symbol}, пропускаем сигнал")
+                return failed
+            trace.mark("order_ack")
+            filled_at = time.perf_counter()
+            if account.positions:
+                account.positions.record_fill(symbol, side, qty, last_price, sent_at)
 
-            self._place_take_profits(signal, symbol, qty_rounded, filters)
+            await self._place_take_profits(api, ladder, ladder.total_qty, trace, final=True)
 
-            logger.info(f"Сигнал {symbol} {signal.direction} успешно обработан")
+            logger.info(f"[{account.name}] Сигнал {symbol} {signal.direction} успешно обработан")
+            return ExecutionResult(account.name, True, qty, filled_at)
 
         except Exception as e:
-            logger.error(f"Ошибка исполнения сигнала {signal.ticker}: {e}", exc_info=True)
+            logger.error(f"[{account.name}] Ошибка исполнения сигнала {signal.ticker}: {e}", exc_info=True)
+            return failed
 
-    def _place_take_profits(self, signal: Signal, symbol: str, total_qty: float, filters: dict) -> None:
-        """Выставление Take Profit ордеров батчем"""
-        try:
-            tp_percentages = TradingConfig.get_tp_percentages()
-            tp_side = "Sell" if signal.direction == "Long" else "Buy"
+    async def _resolve_existing(self, account: Account, symbol: str, side: str, trace: Trace) -> bool:
+        """Политика DUPLICATE_POLICY для символа с открытой позицией; False — сигнал пропускается"""
+        store = account.positions
+        if store is None:
+            return True
+
+        if not store.is_connected:
+            logger.warning(f"[{account.name}] Поток позиций не подключён, открытые позиции по {symbol} не проверены")
+            return True
+
+        existing = store.position(symbol)
+        if existing is None:
+            return True
+
+        policy = TradingConfig.DUPLICATE_POLICY
+        take_profits = store.take_profits(symbol)
+        position_info = (f"{existing.direction} {existing.size} по {existing.avg_price:g}, "
+                         f"активных TP: {len(take_profits)}")
+
+        if policy == "scale" and existing.side == side:
+            logger.info(f"[{account.name}] Добавляем к позиции {symbol} ({position_info})")
+            return True
 
-            batch_orders = []
+        if policy != "flip" or existing.side == side:
+            logger.warning(f"[{account.name}] Уже есть позиция {symbol} ({position_info}), "
+                           f"политика {policy}: пропускаем сигнал")
+            return False
 
-            for i, (tp_price, tp_percent) in enumerate(zip(signal.take_profits, tp_percentages), start=1):
-                if tp_percent <= 0:
-                    continue
+        logger.info(f"[{account.name}] Разворот позиции {symbol} ({position_info})")
+        sent_at = time.monotonic()
+        steps = [self._traced_call(trace, account.api.close_position, symbol, existing.side, existing.size)]
+        if take_profits:
+            steps.append(self._traced_call(trace, account.api.cancel_orders, symbol))
 
-                tp_qty = total_qty * tp_percent / 100
-                tp_qty_rounded = self.api.round_quantity(tp_qty, filters["qty_step"])
+        closed, *_ = await asyncio.gather(*steps)
+        if not closed:
+            logger.error(f"[{account.name}] Не удалось закрыть позицию {symbol} для разворота, пропускаем сигнал")
+            return False
 
-                if tp_qty_rounded < float(filters["min_qty"]):
-                    logger.warning(f"TP{i}: объём {tp_qty_rounded} меньше минимального, пропускаем")
-                    continue
+        store.record_fill(symbol, side, existing.size, existing.avg_price, sent_at)
+        return True
 
-                tp_price_rounded = self.api.round_price(tp_price, filters["tick_size"])
+    async def _execute_fill_driven(self, account: Account, signal: Signal, ladder: TakeProfitLadder,
+                                   stop_loss: str, last_price: float, trace: Trace) -> ExecutionResult:
+        """Вход с выставлением TP по событиям исполнения"""
+        api = account.api
+        symbol = ladder.symbol
+        side = "Buy" if signal.direction == "Long" else "Sell"
+        order_link_id = f"{ladder.link_prefix}-e"
+        loop = asyncio.get_running_loop()
+        # FillTracker вызывает on_fill из потока WebSocket вне своей блокировки, в том числе после unwatch:
+        # задача регистрируется сразу в этом потоке, а после закрытия набора новые не создаются
+        top_ups: list[Future] = []
+        top_ups_lock = threading.Lock()
+        closed = False
+        qty = ladder.scale.format_qty(ladder.total_steps)
 
-                batch_orders.append({
-                    "price": tp_price_rounded,
-                    "qty": tp_qty_rounded
-                })
+        def on_fill(filled_qty: float) -> None:
+            with top_ups_lock:
+                if closed:
+                    return
+                top_ups.append(asyncio.run_coroutine_threadsafe(
+                    self._place_take_profits(api, ladder, filled_qty, trace), loop
+                ))
 
-            if batch_orders:
-                self.api.place_batch_limit_orders(symbol, tp_side, batch_orders)
-            else:
-                logger.warning(f"Нет валидных TP для выставления по {symbol}")
+        account.fills.watch(order_link_id, on_fill)
+        sent_at = time.monotonic()
+
+        try:
+            order_id = await self._traced_call(
+                trace, api.place_market_order, symbol, side, qty, stop_loss, order_link_id
+            )
+            if not order_id:
+                logger.error(f"[{account.name}] Не удалось открыть позицию для {symbol}, пропускаем сигнал")
+                return ExecutionResult(account.name, False)
+            trace.mark("order_ack")
+            if account.positions:
+                account.positions.record_fill(symbol, side, qty, last_price, sent_at)
+
+            try:
+                await asyncio.wait_for(ladder.complete.wait(), TradingConfig.FILL_TIMEOUT)
+                filled_at = time.perf_counter()
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"[{account.name}] Нет полного исполнения {symbol} за {TradingConfig.FILL_TIMEOUT} с "
+                    f"(получено {ladder.filled_qty}), TP по запрошенному объёму"
+                )
+                filled_at = None
+                await self._place_take_profits(api, ladder, ladder.total_qty, trace)
+
+        finally:
+            account.fills.unwatch(order_link_id)
+            with top_ups_lock:
+                closed = True
+            if top_ups:
+                await asyncio.gather(*(asyncio.wrap_future(future) for future in top_ups))
+
+        logger.info(f"[{account.name}] Сигнал {symbol} {signal.direction} успешно обработан")
+        return ExecutionResult(account.name, True, qty, filled_at)
+
+    async def _place_take_profits(self, api: BybitAPI, ladder: TakeProfitLadder, filled_qty: float,
+                                  trace: Trace, final: bool = False) -> None:
+        """Выставление Take Profit ордеров батчем на исполненный объём"""
+        try:
+            async with ladder.lock:
+                batch_orders = ladder.top_up(filled_qty, final=final)
+
+                if not batch_orders:
+                    if final:
+                        logger.warning(f"Нет валидных TP для выставления по {ladder.symbol}")
+                    return
+
+                placed = await self._traced_call(
+                    trace, api.place_batch_limit_orders, ladder.symbol, ladder.side, batch_orders
+                )
+                if not placed:
+                    ladder.rollback(batch_orders)
+                elif "e2e.tp_ack" not in trace.spans:
+                    trace.mark("tp_ack")
 
         except Exception as e:
-            logger.error(f"Ошибка выставления TP для {symbol}: {e}", exc_info=True)
\ No newline at end of file
+            logger.error(f"Ошибка выставления TP для {ladder.symbol}: {e}", exc_info=True)
+
+    def close(self) -> None:
+        """Остановка потоков аккаунтов и освобождение пула потоков"""
+        self.accounts.close()
+        if self.prices:
+            self.prices.stop()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,104 @@
+# trading/wallet_state.py
+import threading
+import time
+from typing import Any
+from trading.private_stream import PrivateStream
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class WalletState:
+    """Баланс единого торгового аккаунта: снапшот REST при запуске и обновления из потока wallet.
+
+    Поток присылает данные только при изменении баланса, поэтому снапшот периодически
+    сверяется через REST в фоне. Если поток отключён или значение старше max_age,
+    value() возвращает настроенный fallback.
+    """
+
+    ACCOUNT_TYPE = "UNIFIED"
+
+    def __init__(self, client, stream: PrivateStream, fallback: float, field: str = "totalEquity",
+                 max_age: float = 60):
+        self.client = client
+        self.stream = stream
+        self.fallback = fallback
+        self.field = field
+        self.max_age = max_age
+        self._balance: float | None = None
+        self._updated_at: float = 0.0
+        self._using_fallback = True
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._refresh_thread: threading.Thread | None = None
+        self.stream.subscribe("wallet", self._on_wallet)
+
+    def start(self) -> None:
+        """Первичная загрузка и запуск фоновой сверки"""
+        self.load()
+
+        if self._refresh_thread is None:
+            self._refresh_thread = threading.Thread(target=self._refresh_loop, name="wallet-state", daemon=True)
+            self._refresh_thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def load(self) -> None:
+        """Снапшот баланса через REST"""
+        try:
+            resp = self.client.get_wallet_balance(accountType=self.ACCOUNT_TYPE)
+
+            if not isinstance(resp, dict) or resp.get("retCode") != 0:
+                logger.error(f"Ошибка загрузки баланса: {resp}")
+                return
+
+            self._update(resp.get("result", {}).get("list", []))
+        except Exception as e:
+            logger.error(f"Ошибка загрузки баланса: {e}", exc_info=True)
+
+    def age(self) -> float | None:
+        """Возраст значения баланса в секундах"""
+        if self._balance is None:
+            return None
+        return time.monotonic() - self._updated_at
+
+    def value(self) -> float:
+        """Актуальный баланс или fallback, если поток не подключён или данные устарели"""
+        balance = self._balance
+        age = self.age()
+        fresh = balance is not None and balance > 0 and self.stream.is_connected and age <= self.max_age
+
+        if fresh == self._using_fallback:
+            self._using_fallback = not fresh
+            if fresh:
+                logger.info(f"Размер позиции считается от баланса аккаунта: {balance:.2f}")
+            else:
+                logger.warning(f"Баланс аккаунта недоступен или устарел, используется BALANCE={self.fallback}")
+
+        return balance if fresh else self.fallback
+
+    def _refresh_loop(self) -> None:
+        """Сверка через REST на половине max_age без обновлений из потока"""
+        while not self._stop_event.wait(self.max_age / 4):
+            age = self.age()
+            if age is None or age > self.max_age / 2:
+                self.load()
+
+    def _on_wallet(self, accounts: list[dict[str, Any]]) -> None:
+        self._update(accounts)
+
+    def _update(self, accounts: list[dict[str, Any]]) -> None:
+        """Обновление по данным аккаунта из REST или приватного потока"""
+        for account in accounts:
+            if account.get("accountType", self.ACCOUNT_TYPE) != self.ACCOUNT_TYPE or not account.get(self.field):
+                continue
+
+            try:
+                balance = float(account[self.field])
+            except ValueError:
+                continue
+
+            with self._lock:
+                self._balance = balance
+                self._updated_at = time.monotonic()
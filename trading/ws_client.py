@@ -0,0 +1,209 @@
+# trading/ws_client.py
+import hashlib
+import hmac
+import json
+import socket
+import threading
+import time
+from typing import Any, Callable
+import websocket
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class WebSocketClient:
+    """Постоянное WebSocket-соединение Bybit v5 с переподключением"""
+
+    SUBSCRIBE_CHUNK = 10
+    AUTH_EXPIRES_MS = 10_000
+    # Сколько интервалов пинга соединение может молчать, прежде чем считается полуоткрытым
+    SILENCE_PINGS = 2
+
+    def __init__(self, url: str, name: str, on_message: Callable[[dict[str, Any]], None],
+                 api_key: str = "", api_secret: str = "", ping_interval: float = 20,
+                 reconnect_delay: float = 1, on_ready: Callable[[], None] | None = None):
+        self.url = url
+        self.name = name
+        self.on_message = on_message
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.ping_interval = ping_interval
+        self.reconnect_delay = reconnect_delay
+        self.on_ready = on_ready
+
+        self.ready = threading.Event()
+        self.last_message_at: float = 0.0
+
+        self._ws: websocket.WebSocketApp | None = None
+        self._topics: list[str] = []
+        self._topics_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def is_connected(self) -> bool:
+        return self.ready.is_set()
+
+    def start(self) -> None:
+        """Запуск соединения в фоновом потоке"""
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self._run, name=f"ws-{self.name}", daemon=True)
+        self._thread.start()
+
+        threading.Thread(target=self._ping_loop, name=f"ws-{self.name}-ping", daemon=True).start()
+
+    def stop(self) -> None:
+        """Закрытие соединения без переподключения"""
+        self._stop_event.set()
+        self.ready.clear()
+        if self._ws:
+            self._ws.close()
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Ожидание готовности соединения"""
+        return self.ready.wait(timeout)
+
+    def send(self, payload: dict[str, Any]) -> None:
+        """Отправка JSON-сообщения"""
+        if not self._ws:
+            raise ConnectionError(f"WebSocket {self.name} не подключён")
+
+        with self._send_lock:
+            self._ws.send(json.dumps(payload))
+
+    def subscribe(self, topics: list[str]) -> None:
+        """Подписка на топики с восстановлением после переподключения"""
+        with self._topics_lock:
+            new_topics = [topic for topic in topics if topic not in self._topics]
+            self._topics.extend(new_topics)
+
+        if new_topics and self.is_connected:
+            self._send_subscriptions(new_topics)
+
+    def _run(self) -> None:
+        """Цикл подключения с повтором при обрыве"""
+        while not self._stop_event.is_set():
+            self._ws = websocket.WebSocketApp(
+                self.url,
+                on_open=self._on_open,
+                on_message=self._on_raw_message,
+                on_error=self._on_error,
+                on_close=self._on_close
+            )
+
+            try:
+                self._ws.run_forever(skip_utf8_validation=True)
+            except Exception as e:
+                logger.error(f"WebSocket {self.name}: ошибка соединения: {e}", exc_info=True)
+
+            self.ready.clear()
+
+            if not self._stop_event.is_set():
+                logger.warning(f"WebSocket {self.name}: переподключение через {self.reconnect_delay} с")
+                self._stop_event.wait(self.reconnect_delay)
+
+    def _ping_loop(self) -> None:
+        """Отправка пингов и закрытие соединения, которое перестало отвечать даже на них"""
+        while not self._stop_event.wait(self.ping_interval):
+            if not self.is_connected:
+                continue
+
+            silence = time.monotonic() - self.last_message_at
+            if silence > self.SILENCE_PINGS * self.ping_interval:
+                logger.warning(f"WebSocket {self.name}: нет сообщений {silence:.1f} с, переподключение")
+                self.ready.clear()
+                self._abort()
+                continue
+
+            try:
+                self.send({"op": "ping"})
+            except Exception as e:
+                logger.warning(f"WebSocket {self.name}: не удалось отправить ping: {e}")
+
+    def _abort(self) -> None:
+        """Обрыв TCP-сокета: поток run_forever получает EOF и возвращается в цикл переподключения"""
+        # close() ждал бы ответного закрывающего кадра, а молчащая сторона его не пришлёт
+        connection = self._ws.sock if self._ws else None
+        sock = getattr(connection, "sock", None)
+        if sock is None:
+            return
+
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def _on_open(self, _ws) -> None:
+        self.last_message_at = time.monotonic()
+        logger.info(f"WebSocket {self.name}: соединение открыто")
+
+        if self.api_key:
+            expires = int(time.time() * 1000) + self.AUTH_EXPIRES_MS
+            signature = hmac.new(
+                self.api_secret.encode(),
+                f"GET/realtime{expires}".encode(),
+                hashlib.sha256
+            ).hexdigest()
+            self.send({"op": "auth", "args": [self.api_key, expires, signature]})
+        else:
+            self._set_ready()
+
+    def _set_ready(self) -> None:
+        """Соединение готово: восстановление подписок"""
+        self.ready.set()
+
+        with self._topics_lock:
+            topics = list(self._topics)
+
+        if topics:
+            self._send_subscriptions(topics)
+
+        if self.on_ready:
+            self.on_ready()
+
+    def _send_subscriptions(self, topics: list[str]) -> None:
+        for i in range(0, len(topics), self.SUBSCRIBE_CHUNK):
+            self.send({"op": "subscribe", "args": topics[i:i + self.SUBSCRIBE_CHUNK]})
+
+    def _on_raw_message(self, _ws, raw_message: str) -> None:
+        self.last_message_at = time.monotonic()
+
+        try:
+            message = json.loads(raw_message)
+        except ValueError:
+            logger.warning(f"WebSocket {self.name}: некорректное сообщение: {raw_message[:200]}")
+            return
+
+        op = message.get("op")
+
+        if op == "auth":
+            if message.get("success") is True or message.get("retCode") == 0:
+                logger.info(f"WebSocket {self.name}: авторизация успешна")
+                self._set_ready()
+            else:
+                logger.error(f"WebSocket {self.name}: ошибка авторизации: {message}")
+            return
+
+        if op in ("pong", "ping") or message.get("ret_msg") == "pong":
+            return
+
+        if op == "subscribe":
+            if message.get("success") is False:
+                logger.error(f"WebSocket {self.name}: ошибка подписки: {message}")
+            return
+
+        try:
+            self.on_message(message)
+        except Exception as e:
+            logger.error(f"WebSocket {self.name}: ошибка обработки сообщения: {e}", exc_info=True)
+
+    def _on_error(self, _ws, error: Exception) -> None:
+        logger.error(f"WebSocket {self.name}: {error}")
+
+    def _on_close(self, _ws, status_code: int | None, reason: str | None) -> None:
+        self.ready.clear()
+        logger.warning(f"WebSocket {self.name}: соединение закрыто ({status_code} {reason})")
@@ -1,8 +1,22 @@
 # utils/logger.py
+import atexit
+import json
 import logging
-import sys
+import logging.handlers
 import os
+import queue
+import sys
+import threading
 from datetime import datetime
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class LoggingConfig:
+    LOG_DIR: str = os.getenv("LOG_DIR", "logs")
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_JSON: bool = os.getenv("LOG_JSON", "false").lower() in ("1", "true", "yes")
 
 
 class MillisecondFormatter(logging.Formatter):
@@ -18,9 +32,132 @@ class MillisecondFormatter(logging.Formatter):
         return s
 
 
+class JsonLinesFormatter(logging.Formatter):
+    """Запись лога одной JSON-строкой"""
+
+    def format(self, record):
+        return json.dumps({
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage()
+        }, ensure_ascii=False)
+
+
+class DailyFileHandler(logging.FileHandler):
+    """Файл logs/YYYY-MM-DD<suffix>, переключаемый по дате записи"""
+
+    def __init__(self, directory: str, suffix: str = ".log"):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.suffix = suffix
+        self.current_date = datetime.now().strftime('%Y-%m-%d')
+        super().__init__(self._path(self.current_date), mode='a', encoding='utf-8', delay=True)
+
+    def _path(self, date: str) -> str:
+        return os.path.join(self.directory, f"{date}{self.suffix}")
+
+    def emit(self, record):
+        date = datetime.fromtimestamp(record.created).strftime('%Y-%m-%d')
+        if date != self.current_date:
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+            self.current_date = date
+            self.baseFilename = os.path.abspath(self._path(date))
+
+        super().emit(record)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Неблокирующая постановка записи в очередь со счётчиком потерь"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class BlockingStopQueueListener(logging.handlers.QueueListener):
+    """QueueListener, дожидающийся места в очереди для сигнала остановки"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class LogBackend:
+    """Очередь логов с единственным потоком записи в консоль и файлы"""
+
+    def __init__(self, level: int = logging.INFO):
+        formatter = MillisecondFormatter(
+            fmt='%(asctime)s | %(levelname)-8s | %(name)-37s | %(message)s',
+            datefmt='%d-%m-%y %H:%M:%S'
+        )
+
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(formatter)
+
+        file_handler = DailyFileHandler(LoggingConfig.LOG_DIR)
+        file_handler.setFormatter(formatter)
+
+        self.handlers: list[logging.Handler] = [console_handler, file_handler]
+
+        if LoggingConfig.LOG_JSON:
+            json_handler = DailyFileHandler(LoggingConfig.LOG_DIR, suffix=".jsonl")
+            json_handler.setFormatter(JsonLinesFormatter())
+            self.handlers.append(json_handler)
+
+        for handler in self.handlers:
+            handler.setLevel(level)
+
+        self.queue: queue.Queue = queue.Queue(maxsize=LoggingConfig.LOG_QUEUE_SIZE)
+        self.queue_handler = DroppingQueueHandler(self.queue)
+        self.listener = BlockingStopQueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self) -> None:
+        """Запись оставшихся сообщений и остановка потока"""
+        self.listener.stop()
+
+        if self.queue_handler.dropped:
+            record = logging.makeLogRecord({
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Потеряно записей лога при переполнении очереди: {self.queue_handler.dropped}"
+            })
+            for handler in self.handlers:
+                handler.handle(record)
+
+        for handler in self.handlers:
+            handler.close()
+
+
+_backend: LogBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def _get_backend(level: int) -> LogBackend:
+    global _backend
+
+    with _backend_lock:
+        if _backend is None:
+            _backend = LogBackend(level)
+            atexit.register(shutdown_logging)
+        return _backend
+
+
 def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     """
-    Создает логгер с консольным и файловым выводом
+    Создает логгер, пишущий через общую очередь в консоль и файл
 
     Args:
         name: Имя логгера
@@ -35,32 +172,38 @@ def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
         return logger
 
     logger.setLevel(level)
+    logger.addHandler(_get_backend(level).queue_handler)
+    logger.propagate = False
 
-    formatter = MillisecondFormatter(
-        fmt='%(asctime)s | %(levelname)-8s | %(name)-37s | %(message)s',
-        datefmt='%d-%m-%y %H:%M:%S'
-    )
+    return logger
 
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(level)
-    console_handler.setFormatter(formatter)
 
-    logs_dir = "logs"
-    if not os.path.exists(logs_dir):
-        os.makedirs(logs_dir)
+def shutdown_logging() -> None:
+    """Остановка потока записи логов с дописыванием очереди"""
+    global _backend
 
-    current_date = datetime.now().strftime('%Y-%m-%d')
-    log_file_path = os.path.join(logs_dir, f"{current_date}.log")
+    with _backend_lock:
+        backend, _backend = _backend, None
 
-    file_handler = logging.FileHandler(log_file_path, mode='a', encoding='utf-8')
-    file_handler.setLevel(level)
-    file_handler.setFormatter(formatter)
+    if backend:
+        backend.stop()
 
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    logger.propagate = False
 
-    return logger
+def dropped_records() -> int:
+    return _backend.queue_handler.dropped if _backend else 0
+
+
+def export_metrics(namespace: str = "pulse") -> str:
+    """Метрики очереди логов в формате Prometheus"""
+    depth = _backend.queue.qsize() if _backend else 0
+    return "\n".join([
+        f"# HELP {namespace}_log_records_dropped_total Log records dropped because the queue was full",
+        f"# TYPE {namespace}_log_records_dropped_total counter",
+        f"{namespace}_log_records_dropped_total {dropped_records()}",
+        f"# HELP {namespace}_log_queue_depth Log records waiting for the writer thread",
+        f"# TYPE {namespace}_log_queue_depth gauge",
+        f"{namespace}_log_queue_depth {depth}"
+    ]) + "\n"
 
 
 def set_log_level(level: int) -> None:
@@ -74,4 +217,8 @@ def set_log_level(level: int) -> None:
     root_logger.setLevel(level)
 
     for handler in root_logger.handlers:
-        handler.setLevel(level)
\ No newline at end of file
+        handler.setLevel(level)
+
+    if _backend:
+        for handler in _backend.handlers:
+            handler.setLevel(level)
@@ -0,0 +1,204 @@
+# utils/tracing.py
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterator
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LatencyHistogram:
+    """Гистограмма задержек в стиле HDR: логарифмические группы с линейными подкорзинами"""
+
+    SUB_BUCKET_BITS = 7
+
+    def __init__(self):
+        self._counts: dict[int, int] = {}
+        self._count = 0
+        self._sum_us = 0
+        self._max_us = 0
+        self._lock = threading.Lock()
+
+    def record(self, value_ms: float) -> None:
+        """Запись значения в миллисекундах с разрешением 1 мкс"""
+        value_us = max(0, int(value_ms * 1000))
+        index = self._index(value_us)
+
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self._count += 1
+            self._sum_us += value_us
+            self._max_us = max(self._max_us, value_us)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum_ms(self) -> float:
+        return self._sum_us / 1000
+
+    @property
+    def max_ms(self) -> float:
+        return self._max_us / 1000
+
+    def percentile(self, quantile: float) -> float:
+        """Значение перцентиля в миллисекундах (верхняя граница корзины)"""
+        with self._lock:
+            if not self._count:
+                return 0.0
+
+            target = max(1, math.ceil(self._count * quantile))
+            seen = 0
+            for index in sorted(self._counts):
+                seen += self._counts[index]
+                if seen >= target:
+                    return min(self._upper_bound(index), self._max_us) / 1000
+
+        return self._max_us / 1000
+
+    @classmethod
+    def _index(cls, value_us: int) -> int:
+        shift = max(0, value_us.bit_length() - cls.SUB_BUCKET_BITS)
+        return (shift << cls.SUB_BUCKET_BITS) + (value_us >> shift)
+
+    @classmethod
+    def _upper_bound(cls, index: int) -> int:
+        shift = index >> cls.SUB_BUCKET_BITS
+        sub_bucket = index & ((1 << cls.SUB_BUCKET_BITS) - 1)
+        return ((sub_bucket + 1) << shift) - 1
+
+
+class Trace:
+    """Замеры этапов обработки одного сигнала"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, message_date: datetime | None = None, name: str = ""):
+        self.trace_id = next(self._ids)
+        self.name = name
+        self.started_at = time.perf_counter()
+        self.spans: dict[str, float] = {}
+
+        if message_date:
+            now = datetime.now(message_date.tzinfo)
+            self.spans["telegram.delivery"] = max(0.0, (now - message_date).total_seconds() * 1000)
+
+    def add_span(self, name: str, duration_ms: float) -> None:
+        self.spans[name] = duration_ms
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Замер длительности блока"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans[name] = (time.perf_counter() - started) * 1000
+
+    def child(self) -> "Trace":
+        """Трасса ветви исполнения с общим началом отсчёта"""
+        child = Trace(name=self.name)
+        child.started_at = self.started_at
+        return child
+
+    def merge(self, child: "Trace", prefix: str = "") -> None:
+        """Перенос замеров ветви с префиксом"""
+        for name, duration_ms in child.spans.items():
+            self.spans[f"{prefix}{name}"] = duration_ms
+
+    def mark(self, stage: str) -> None:
+        """Отметка времени от получения сообщения до этапа"""
+        self.spans[f"e2e.{stage}"] = (time.perf_counter() - self.started_at) * 1000
+
+    def summary(self) -> str:
+        spans = " ".join(f"{name}={ms:.1f}" for name, ms in self.spans.items())
+        return f"trace={self.trace_id} {self.name} {spans}".replace("  ", " ")
+
+
+class Tracer:
+    """Сбор гистограмм по этапам и экспорт в формате Prometheus"""
+
+    def __init__(self, namespace: str = "pulse"):
+        self.namespace = namespace
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._collectors: list[Callable[[], str]] = []
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def record(self, name: str, duration_ms: float) -> None:
+        self.histogram(name).record(duration_ms)
+
+    def finish(self, trace: Trace) -> None:
+        """Запись этапов трассы в гистограммы и итоговая строка в лог"""
+        for name, duration_ms in trace.spans.items():
+            self.record(name, duration_ms)
+
+        logger.info(f"Трасса сигнала: {trace.summary()}")
+
+    def add_collector(self, collector: Callable[[], str]) -> None:
+        """Дополнительные метрики в формате Prometheus"""
+        self._collectors.append(collector)
+
+    def export_prometheus(self) -> str:
+        """Метрики в текстовом формате Prometheus"""
+        metric = f"{self.namespace}_stage_latency_ms"
+        lines = [
+            f"# HELP {metric} Latency of signal processing stages in milliseconds",
+            f"# TYPE {metric} summary"
+        ]
+
+        for name, histogram in sorted(self._histograms.items()):
+            for quantile in (0.5, 0.9, 0.99, 0.999):
+                lines.append(f'{metric}{{stage="{name}",quantile="{quantile}"}} {histogram.percentile(quantile):.3f}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {histogram.sum_ms:.3f}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {histogram.count}')
+
+        for collector in self._collectors:
+            lines.append(collector().rstrip("\n"))
+
+        return "\n".join(lines) + "\n"
+
+    def start_server(self, port: int, host: str = "127.0.0.1") -> None:
+        """HTTP-эндпоинт /metrics в фоновом потоке"""
+        tracer = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+
+                body = tracer.export_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True).start()
+        logger.info(f"Метрики доступны на http://{host}:{port}/metrics")
+
+    def stop_server(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server = None
+
+
+tracer = Tracer()